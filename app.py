@@ -21,9 +21,15 @@ These rules should be maintained across all future development.
 
 from flask import Flask, render_template, request, jsonify, redirect, url_for, flash
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import DDL, event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session, validates
+from sqlalchemy.sql import operators as sql_operators
 from flask_cors import CORS
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import matplotlib.pyplot as plt
 import seaborn as sns
 import plotly.graph_objects as go
@@ -32,16 +38,32 @@ from plotly.utils import PlotlyJSONEncoder
 import json
 import yfinance as yf
 from datetime import datetime, timedelta
+import hashlib
+import copy
 import os
+import re
+import threading
+import time
 from werkzeug.utils import secure_filename
 import io
 import base64
-from sklearn.linear_model import LinearRegression
+import csv
+from dateutil import parser as date_parser
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LinearRegression, LogisticRegression
+from sklearn.pipeline import make_pipeline
+import joblib
 from sklearn.preprocessing import PolynomialFeatures
 from statsmodels.tsa.seasonal import seasonal_decompose
 # from prophet import Prophet  # Optional - install separately if needed
+try:
+    import duckdb  # Optional - reporting endpoints fall back to the ORM without it
+except ImportError:
+    duckdb = None
 import warnings
 import math
+from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
 warnings.filterwarnings('ignore')
 
 app = Flask(__name__)
@@ -53,15 +75,116 @@ app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+app.config['IMPORT_CHUNK_SIZE'] = 500  # Rows per bulk INSERT when importing statements
+app.config['STATEMENT_MAX_SKIPPED_ROWS'] = 100  # Skipped rows listed (with the reason) in an import response
+app.config['FIXED_EXPENSES_PER_PAGE'] = 25
+app.config['FIXED_EXPENSE_MAX_RANGE_MONTHS'] = 36  # Longest month range allocated or rolled forward in one request
+app.config['LEDGER_CACHE_MAX_AGE'] = 300  # Seconds before the in-memory ledger reloads in full
+app.config['ANALYTICS_BACKEND'] = os.environ.get('ANALYTICS_BACKEND', 'duckdb' if duckdb else 'orm')  # 'duckdb' or 'orm' for reports
+app.config['ANALYTICS_PARQUET_DIR'] = os.environ.get('ANALYTICS_PARQUET_DIR')  # Report from a Parquet snapshot instead
+app.config['CATEGORIZER_MODEL_DIR'] = os.path.join(app.instance_path, 'models')  # Saved import categorizer models
+app.config['CATEGORIZER_MIN_TRAINING_ROWS'] = 20  # Categorized transactions needed before imports are auto-categorized
+app.config['CATEGORIZER_MAX_TRAINING_ROWS'] = 50000  # Most recent categorized transactions used for training
+app.config['CATEGORIZER_MIN_PROBABILITY'] = 0.6  # Below this a predicted category is not applied
+
+# Statement import header mapping: field -> accepted column headers (case-insensitive)
+# Can be overridden per upload by posting a JSON 'header_map' with the same shape
+app.config['STATEMENT_HEADER_MAP'] = {
+    'date': ['date', 'transaction date', 'posted date', 'booking date', 'value date'],
+    'type': ['type', 'transaction type'],
+    'category': ['category'],
+    'description': ['description', 'details', 'narrative', 'merchant', 'payee', 'memo'],
+    'amount': ['amount', 'amount (eur)', 'value'],
+    'debit': ['debit', 'money out', 'paid out'],
+    'credit': ['credit', 'money in', 'paid in'],
+}
+
+# Databases the app runs on - the INSERT construct each uses for ON CONFLICT upserts (dialect_insert)
+SUPPORTED_DATABASES = {'sqlite': sqlite.insert, 'postgresql': postgresql.insert}
+if app.config['SQLALCHEMY_DATABASE_URI']:
+    database_backend = make_url(app.config['SQLALCHEMY_DATABASE_URI']).get_backend_name()
+    if database_backend not in SUPPORTED_DATABASES:
+        raise RuntimeError(f'DATABASE_URL points to a {database_backend} database - '
+                           f'only {" and ".join(SUPPORTED_DATABASES)} are supported')
 
 # Initialize database
 db = SQLAlchemy(app)
 
+# Account types
+ACCOUNT_TYPES = ('checking', 'savings', 'credit', 'loan', 'investment', 'other')
+DEBT_ACCOUNT_TYPES = ('credit', 'loan')
+DEFAULT_ANNUAL_RATES = {'credit': 0.15, 'loan': 0.07}  # Used until an account has DebtTerms
+ACCOUNT_TYPE_ALIASES = {
+    'credit card': 'credit',
+    'creditcard': 'credit',
+    'card': 'credit',
+    'current': 'checking',
+    'current account': 'checking',
+    'checking account': 'checking',
+    'savings account': 'savings',
+    'saving': 'savings',
+    'loan account': 'loan',
+    'mortgage': 'loan',
+}
+
+def normalize_account_type(value):
+    """Map free-form account type strings ('Credit Card', 'Loan', ...) onto ACCOUNT_TYPES"""
+    value = (value or '').strip().lower()
+    value = ACCOUNT_TYPE_ALIASES.get(value, value)
+    return value if value in ACCOUNT_TYPES else 'other'
+
+# Money columns - amounts are stored as integer cents so sums and comparisons are exact
+def to_cents(amount):
+    """Euro amount (float, str or Decimal) to whole cents, rounding half up"""
+    return int((Decimal(str(amount)) * 100).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+
+def from_cents(cents):
+    """Cents back to a euro float (fractional cents from SQL scaling are rounded off)"""
+    return int(round(cents)) / 100
+
+MONEY_ARITHMETIC = (sql_operators.add, sql_operators.sub)
+MONEY_SCALING = (sql_operators.mul, sql_operators.truediv)
+
+class Money(db.TypeDecorator):
+    """Euro amount stored as BIGINT cents; Python code keeps reading and writing euros
+    
+    SUM/COALESCE/CASE over Money columns stay Money, as do amount +/- amount and
+    amount * or / a plain number, so database aggregates come back in euros and are
+    exact. Use cents(column) to select the raw integers instead.
+    """
+    impl = db.BigInteger
+    cache_ok = True
+    
+    class comparator_factory(db.TypeDecorator.Comparator, db.BigInteger.Comparator):
+        def _adapt_expression(self, op, other_comparator):
+            other_is_money = isinstance(other_comparator.type, Money)
+            if (op in MONEY_ARITHMETIC and other_is_money) or (op in MONEY_SCALING and not other_is_money):
+                return op, self.type
+            return super()._adapt_expression(op, other_comparator)
+    
+    def coerce_compared_value(self, op, value):
+        # The n in amount * n or amount / n is a factor, not an amount in euros
+        if op in MONEY_SCALING:
+            return db.Float() if isinstance(value, float) else db.Integer()
+        return self
+    
+    def process_bind_param(self, value, dialect):
+        return None if value is None else to_cents(value)
+    
+    def process_result_value(self, value, dialect):
+        return None if value is None else from_cents(value)
+
+def cents(column):
+    """A Money column (or expression) as raw integer cents, e.g. for int64 analytics"""
+    return db.type_coerce(column, db.BigInteger)
+
 # Database Models
 class BankAccount(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
-    account_type = db.Column(db.String(50), nullable=False)  # savings, checking, credit, investment
+    account_type = db.Column(db.Enum(*ACCOUNT_TYPES, name='account_type', native_enum=False, length=50),
+                             nullable=False)  # See ACCOUNT_TYPES
+    is_debt = db.Column(db.Boolean, nullable=False, default=False, index=True)  # credit cards and loans
     bank_name = db.Column(db.String(100), nullable=False)
     account_number = db.Column(db.String(50), nullable=True)  # Optional, last 4 digits
     created_date = db.Column(db.DateTime, default=datetime.utcnow)
@@ -70,18 +193,30 @@ class BankAccount(db.Model):
     # Relationship with monthly balances
     monthly_balances = db.relationship('MonthlyBalance', backref='account', lazy=True, cascade='all, delete-orphan')
     
+    @validates('account_type')
+    def validate_account_type(self, key, value):
+        """Store the normalized type and keep is_debt in step with it"""
+        value = normalize_account_type(value)
+        self.is_debt = value in DEBT_ACCOUNT_TYPES
+        return value
+    
     def __repr__(self):
         return f'<BankAccount {self.name} - {self.bank_name}>'
 
 class MonthlyBalance(db.Model):
+    __table_args__ = (
+        db.UniqueConstraint('account_id', 'month', 'year', name='uq_monthly_balance_account_month'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     account_id = db.Column(db.Integer, db.ForeignKey('bank_account.id'), nullable=False)
     month = db.Column(db.Integer, nullable=False)  # 1-12
     year = db.Column(db.Integer, nullable=False)
-    opening_balance = db.Column(db.Float, nullable=False, default=0.0)
-    closing_balance = db.Column(db.Float, nullable=True)
-    income = db.Column(db.Float, nullable=False, default=0.0)
-    expenses = db.Column(db.Float, nullable=False, default=0.0)
+    period = db.Column(db.Integer, db.Computed('year * 12 + month - 1', persisted=True), index=True)  # See to_period
+    opening_balance = db.Column(Money, nullable=False, default=0.0)
+    closing_balance = db.Column(Money, nullable=True)
+    income = db.Column(Money, nullable=False, default=0.0)
+    expenses = db.Column(Money, nullable=False, default=0.0)
     notes = db.Column(db.Text, nullable=True)
     created_date = db.Column(db.DateTime, default=datetime.utcnow)
     updated_date = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -89,6 +224,33 @@ class MonthlyBalance(db.Model):
     def __repr__(self):
         return f'<MonthlyBalance {self.year}-{self.month} Account:{self.account_id}>'
 
+# Newest-first per account, so "latest balance" lookups are a single index seek per account
+db.Index('ix_monthly_balance_account_latest',
+         MonthlyBalance.account_id, MonthlyBalance.year.desc(), MonthlyBalance.month.desc())
+
+class DebtTerms(db.Model):
+    """Interest rate and minimum payment of a debt account, effective from a month onwards"""
+    __table_args__ = (
+        db.UniqueConstraint('account_id', 'effective_year', 'effective_month', name='uq_debt_terms_account_month'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    account_id = db.Column(db.Integer, db.ForeignKey('bank_account.id'), nullable=False)
+    effective_month = db.Column(db.Integer, nullable=False)  # 1-12
+    effective_year = db.Column(db.Integer, nullable=False)
+    annual_rate = db.Column(db.Float, nullable=False, default=0.0)  # APR as a fraction, 0.13 = 13%
+    minimum_payment = db.Column(Money, nullable=False, default=0.0)
+    created_date = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    account = db.relationship('BankAccount', backref=db.backref('debt_terms', lazy=True, cascade='all, delete-orphan'))
+    
+    def __repr__(self):
+        return f'<DebtTerms {self.effective_year}-{self.effective_month} Account:{self.account_id} {self.annual_rate:.2%}>'
+
+# Newest-first per account, same shape as ix_monthly_balance_account_latest
+db.Index('ix_debt_terms_account_latest',
+         DebtTerms.account_id, DebtTerms.effective_year.desc(), DebtTerms.effective_month.desc())
+
 class Category(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
@@ -100,10 +262,15 @@ class Category(db.Model):
         return f'<Category {self.name}>'
 
 class MonthlyCategory(db.Model):
+    """Per account-month category totals, derived from MonthlyTransaction by refresh_monthly_categories"""
+    __table_args__ = (
+        db.UniqueConstraint('monthly_balance_id', 'category_id', name='uq_monthly_category_balance_category'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     monthly_balance_id = db.Column(db.Integer, db.ForeignKey('monthly_balance.id'), nullable=False)
     category_id = db.Column(db.Integer, db.ForeignKey('category.id'), nullable=False)
-    amount = db.Column(db.Float, nullable=False, default=0.0)
+    amount = db.Column(Money, nullable=False, default=0.0)
     
     # Relationships
     monthly_balance = db.relationship('MonthlyBalance', backref='category_amounts')
@@ -113,15 +280,19 @@ class FixedExpense(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
-    amount = db.Column(db.Float, nullable=False)
+    amount = db.Column(Money, nullable=False)
     frequency = db.Column(db.String(50), nullable=False, default='monthly')  # monthly, yearly, quarterly
     category = db.Column(db.String(100))
     start_date = db.Column(db.Date, nullable=False)
     end_date = db.Column(db.Date)  # Optional, for temporary expenses
     is_active = db.Column(db.Boolean, nullable=False, default=True)
+    default_account_id = db.Column(db.Integer, db.ForeignKey('bank_account.id'), nullable=True)  # Account that usually pays it
     created_date = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_date = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Relationships
+    default_account = db.relationship('BankAccount', foreign_keys=[default_account_id])
+    
     def __repr__(self):
         return f'<FixedExpense {self.name}: €{self.amount}>'
 
@@ -130,10 +301,13 @@ class MonthlyTransaction(db.Model):
     account_id = db.Column(db.Integer, db.ForeignKey('bank_account.id'), nullable=False)
     month = db.Column(db.Integer, nullable=False)  # 1-12
     year = db.Column(db.Integer, nullable=False)
+    period = db.Column(db.Integer, db.Computed('year * 12 + month - 1', persisted=True), index=True)  # See to_period
     transaction_type = db.Column(db.String(20), nullable=False)  # income, expense, misc_income, misc_expense
-    amount = db.Column(db.Float, nullable=False)
+    amount = db.Column(Money, nullable=False)
     description = db.Column(db.String(200), nullable=False)
     category = db.Column(db.String(100))
+    category_predicted = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())  # Filled in by TransactionCategorizer
+    is_summary = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())  # Generated month total, see sync_summary_transactions
     fixed_expense_id = db.Column(db.Integer, db.ForeignKey('fixed_expense.id'), nullable=True)  # Link to fixed expense if applicable
     source_account_id = db.Column(db.Integer, db.ForeignKey('bank_account.id'), nullable=True)  # For debt payments - which account paid it
     created_date = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
@@ -146,12 +320,51 @@ class MonthlyTransaction(db.Model):
     def __repr__(self):
         return f'<MonthlyTransaction {self.transaction_type}: €{self.amount}>'
 
+# Full-text index over transaction descriptions and categories, kept in sync by the database:
+# an external-content FTS5 table with triggers on SQLite, a generated tsvector column on Postgres.
+# Created with the table; migrate_transaction_search.py adds it to existing databases.
+TRANSACTION_SEARCH_DDL = {
+    'sqlite': [
+        """CREATE VIRTUAL TABLE IF NOT EXISTS monthly_transaction_fts USING fts5(
+            description, category, content='monthly_transaction', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )""",
+        """CREATE TRIGGER IF NOT EXISTS monthly_transaction_fts_insert AFTER INSERT ON monthly_transaction BEGIN
+            INSERT INTO monthly_transaction_fts (rowid, description, category)
+            VALUES (new.id, new.description, new.category);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS monthly_transaction_fts_delete AFTER DELETE ON monthly_transaction BEGIN
+            INSERT INTO monthly_transaction_fts (monthly_transaction_fts, rowid, description, category)
+            VALUES ('delete', old.id, old.description, old.category);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS monthly_transaction_fts_update AFTER UPDATE OF description, category ON monthly_transaction BEGIN
+            INSERT INTO monthly_transaction_fts (monthly_transaction_fts, rowid, description, category)
+            VALUES ('delete', old.id, old.description, old.category);
+            INSERT INTO monthly_transaction_fts (rowid, description, category)
+            VALUES (new.id, new.description, new.category);
+        END""",
+    ],
+    'postgresql': [
+        """ALTER TABLE monthly_transaction ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS (to_tsvector('simple', coalesce(description, '') || ' ' || coalesce(category, ''))) STORED""",
+        """CREATE INDEX IF NOT EXISTS ix_monthly_transaction_search_vector
+            ON monthly_transaction USING GIN (search_vector)""",
+    ],
+}
+
+for search_dialect, statements in TRANSACTION_SEARCH_DDL.items():
+    for statement in statements:
+        event.listen(MonthlyTransaction.__table__, 'after_create', DDL(statement).execute_if(dialect=search_dialect))
+
+transaction_search_fts = db.table('monthly_transaction_fts', db.column('rowid'))
+
 class Investment(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     month = db.Column(db.Integer, nullable=False)  # 1-12
     year = db.Column(db.Integer, nullable=False)
+    period = db.Column(db.Integer, db.Computed('year * 12 + month - 1', persisted=True), index=True)  # See to_period
     investment_type = db.Column(db.String(50), nullable=False)  # Index, Metals, Crypto
-    amount = db.Column(db.Float, nullable=False)
+    amount = db.Column(Money, nullable=False)
     notes = db.Column(db.Text, nullable=True)
     created_date = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_date = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -159,6 +372,110 @@ class Investment(db.Model):
     def __repr__(self):
         return f'<Investment {self.investment_type}: €{self.amount}>'
 
+class HouseholdMonthlySummary(db.Model):
+    """Household totals for one month across all accounts, kept up to date by refresh_household_summary"""
+    period = db.Column(db.Integer, primary_key=True, autoincrement=False)  # See to_period
+    month = db.Column(db.Integer, nullable=False)
+    year = db.Column(db.Integer, nullable=False)
+    opening_balance = db.Column(Money, nullable=False, default=0.0)
+    closing_balance = db.Column(Money, nullable=False, default=0.0)  # Opening balance where a month isn't closed
+    income = db.Column(Money, nullable=False, default=0.0)
+    expenses = db.Column(Money, nullable=False, default=0.0)
+    regular_income = db.Column(Money, nullable=False, default=0.0)  # Income of non-debt accounts only
+    investments = db.Column(Money, nullable=False, default=0.0)
+    account_count = db.Column(db.Integer, nullable=False, default=0)
+    updated_date = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<HouseholdMonthlySummary {self.year}-{self.month}>'
+
+NET_WORTH_HOUSEHOLD = 0  # NetWorthIndex.account_id of the household total rows
+
+class NetWorthIndex(db.Model):
+    """Balance as of each month per account (debts negative) and for the household
+    
+    Every account has a row for each period from its first MonthlyBalance up to the index
+    horizon, carrying the last known balance forward - the running total of its monthly
+    changes - so "as of month M" is one primary key lookup and a trend is one range scan.
+    Maintained incrementally by update_net_worth_index.
+    """
+    account_id = db.Column(db.Integer, primary_key=True, autoincrement=False)  # NET_WORTH_HOUSEHOLD for the total
+    period = db.Column(db.Integer, primary_key=True, autoincrement=False)  # See to_period
+    balance = db.Column(Money, nullable=False, default=0.0)
+    
+    def __repr__(self):
+        return f'<NetWorthIndex {self.period} Account:{self.account_id} {self.balance}>'
+
+# Period helpers - a period is a month number: year * 12 + (month - 1)
+def to_period(year, month):
+    """Convert a year/month pair into a single comparable month number"""
+    return year * 12 + month - 1
+
+def from_period(period):
+    """Convert a month number back into a (year, month) pair"""
+    year, month_index = divmod(period, 12)
+    return year, month_index + 1
+
+# Fixed expense calendar
+FREQUENCY_MONTHS = {'monthly': 1, 'quarterly': 3, 'yearly': 12}
+
+class FixedExpenseCalendar:
+    """Due occurrences of fixed expenses across a month range
+    
+    Occurrences are precomputed once as an (expenses x months) boolean matrix, honoring
+    frequency, start_date and end_date, with a per-month index of due expenses so that
+    "what is due in month M" is a dictionary lookup.
+    """
+    
+    def __init__(self, expenses, start_period, end_period):
+        self.expenses = list(expenses)
+        self.start_period = start_period
+        self.end_period = end_period
+        self.periods = np.arange(start_period, end_period + 1, dtype=np.int64)
+        
+        no_end = np.iinfo(np.int64).max
+        steps = np.array([FREQUENCY_MONTHS.get((e.frequency or 'monthly').lower(), 1) for e in self.expenses], dtype=np.int64)
+        starts = np.array([to_period(e.start_date.year, e.start_date.month) for e in self.expenses], dtype=np.int64)
+        ends = np.array([to_period(e.end_date.year, e.end_date.month) if e.end_date else no_end for e in self.expenses], dtype=np.int64)
+        self.amounts = np.array([to_cents(e.amount or 0) for e in self.expenses], dtype=np.int64)  # cents
+        
+        # offsets[i, j] = months between expense i's first occurrence and period j
+        offsets = self.periods[None, :] - starts[:, None]
+        self.due = (offsets >= 0) & (self.periods[None, :] <= ends[:, None]) & (offsets % steps[:, None] == 0)
+        self.monthly_totals = (self.due * self.amounts[:, None]).sum(axis=0)  # cents, exact
+        
+        # Per-month due index: period -> row indexes of the expenses due that month
+        self._due_index = {int(period): np.flatnonzero(self.due[:, j]) for j, period in enumerate(self.periods)}
+    
+    @classmethod
+    def for_range(cls, start_year, start_month, end_year, end_month, expenses=None):
+        """Build a calendar for a month range from the active fixed expenses (one query)"""
+        if expenses is None:
+            expenses = FixedExpense.query.filter_by(is_active=True).all()
+        return cls(expenses, to_period(start_year, start_month), to_period(end_year, end_month))
+    
+    def due_in(self, year, month):
+        """Fixed expenses due in the given month"""
+        return [self.expenses[i] for i in self._due_index.get(to_period(year, month), ())]
+    
+    def total_due(self, year, month):
+        """Total amount of fixed expenses due in the given month"""
+        period = to_period(year, month)
+        if period < self.start_period or period > self.end_period:
+            return 0.0
+        return from_cents(self.monthly_totals[period - self.start_period])
+    
+    def occurrences(self):
+        """Iterate (expense, year, month) for every due occurrence in the range"""
+        expense_indexes, month_indexes = np.nonzero(self.due)
+        for i, j in zip(expense_indexes, month_indexes):
+            year, month = from_period(int(self.periods[j]))
+            yield self.expenses[i], year, month
+    
+    def average_monthly_total(self):
+        """Average amount due per month across the range (the monthly equivalent)"""
+        return from_cents(self.monthly_totals.mean()) if len(self.periods) else 0.0
+
 # Create database tables
 with app.app_context():
     db.create_all()
@@ -190,21 +507,12 @@ def index():
     current_month = datetime.now().month
     current_year = datetime.now().year
     
-    # Get current month's data
-    current_month_balances = MonthlyBalance.query.filter_by(
-        month=current_month, 
-        year=current_year
-    ).all()
-    
-    total_current_balance = sum([bal.closing_balance or bal.opening_balance or 0 for bal in current_month_balances])
-    total_income = sum([bal.income or 0 for bal in current_month_balances])
-    total_calculated_expenses = sum([bal.expenses or 0 for bal in current_month_balances])
-    
-    # Get total investments for current month to adjust expenses
-    total_investments = Investment.query.filter_by(
-        month=current_month,
-        year=current_year
-    ).with_entities(db.func.sum(Investment.amount)).scalar() or 0
+    # Current month's household totals - one primary key lookup on the summary table
+    summary = db.session.get(HouseholdMonthlySummary, to_period(current_year, current_month))
+    total_current_balance = summary.closing_balance if summary else 0
+    total_income = summary.income if summary else 0
+    total_calculated_expenses = summary.expenses if summary else 0
+    total_investments = summary.investments if summary else 0
     
     # Calculate adjusted expenses (expenses minus investments)
     total_actual_expenses = max(0, total_calculated_expenses - total_investments)
@@ -270,21 +578,24 @@ def monthly_data():
         year=selected_year
     ).all()
     
-    # Get active fixed expenses for this month
-    fixed_expenses = FixedExpense.query.filter_by(is_active=True).all()
+    # Get fixed expenses due this month (honors frequency, start and end dates)
+    calendar = FixedExpenseCalendar.for_range(selected_year, selected_month, selected_year, selected_month)
+    fixed_expenses = calendar.due_in(selected_year, selected_month)
     
     # Check which fixed expenses have been paid this month
-    paid_fixed_expenses = []
-    for expense in fixed_expenses:
-        payment = MonthlyTransaction.query.filter_by(
-            month=selected_month,
-            year=selected_year,
-            fixed_expense_id=expense.id
-        ).first()
-        paid_fixed_expenses.append({
-            'expense': expense,
-            'payment': payment
-        })
+    payments = {}
+    if fixed_expenses:
+        for payment in MonthlyTransaction.query.filter(
+            MonthlyTransaction.month == selected_month,
+            MonthlyTransaction.year == selected_year,
+            MonthlyTransaction.fixed_expense_id.in_([e.id for e in fixed_expenses])
+        ).all():
+            payments.setdefault(payment.fixed_expense_id, payment)
+    
+    paid_fixed_expenses = [{
+        'expense': expense,
+        'payment': payments.get(expense.id)
+    } for expense in fixed_expenses]
     
     return render_template('monthly_data.html', 
                          accounts=accounts,
@@ -318,6 +629,7 @@ def add_monthly_income():
     )
     
     db.session.add(transaction)
+    refresh_monthly_categories([(account_id, to_period(year, month))])
     db.session.commit()
     
     flash(f'Income of €{amount:.2f} added successfully!', 'success')
@@ -345,6 +657,7 @@ def add_monthly_expense():
     )
     
     db.session.add(transaction)
+    refresh_monthly_categories([(account_id, to_period(year, month))])
     db.session.commit()
     
     flash(f'Expense of €{amount:.2f} added successfully!', 'success')
@@ -383,6 +696,7 @@ def mark_fixed_expense_paid():
         )
         
         db.session.add(transaction)
+        refresh_monthly_categories([(account_id, to_period(year, month))])
         db.session.commit()
         
         flash(f'{fixed_expense.name} marked as paid (€{fixed_expense.amount:.2f}) - for tracking only!', 'success')
@@ -402,12 +716,12 @@ def track_debt_payment():
     source_account = BankAccount.query.get_or_404(source_account_id)
     
     # Verify debt account is actually a debt account
-    if debt_account.account_type.lower() not in ['credit', 'loan']:
+    if not debt_account.is_debt:
         flash('Invalid debt account selected!', 'error')
         return redirect(url_for('monthly_data', month=month, year=year))
     
     # Verify source account is a regular account
-    if source_account.account_type.lower() in ['credit', 'loan']:
+    if source_account.is_debt:
         flash('Source account cannot be a debt account!', 'error')
         return redirect(url_for('monthly_data', month=month, year=year))
     
@@ -424,55 +738,101 @@ def track_debt_payment():
     )
     
     db.session.add(transaction)
+    refresh_monthly_categories([(debt_account_id, to_period(year, month))])
     db.session.commit()
     
     flash(f'Debt payment tracked: €{amount:.2f} from {source_account.name} to {debt_account.name} - for tracking only!', 'success')
     return redirect(url_for('monthly_data', month=month, year=year))
 
+def insert_fixed_expense_tracking(occurrences):
+    """Create tracking transactions for (fixed_expense, account_id, year, month) occurrences - doesn't commit
+    
+    Takes the FixedExpense rows the caller already loaded. Uses two IN queries (already-tracked
+    set, accounts) and one bulk insert, skipping occurrences that are already tracked for that month.
+    """
+    occurrences = list(occurrences)
+    if not occurrences:
+        return 0
+    
+    expense_ids = {o[0].id for o in occurrences}
+    account_ids = {o[1] for o in occurrences}
+    periods = [to_period(o[2], o[3]) for o in occurrences]
+    
+    already_tracked = set(db.session.query(
+        MonthlyTransaction.fixed_expense_id,
+        MonthlyTransaction.year,
+        MonthlyTransaction.month
+    ).filter(
+        MonthlyTransaction.fixed_expense_id.in_(expense_ids),
+        MonthlyTransaction.period.between(min(periods), max(periods))
+    ).all())
+    
+    valid_accounts = set(db.session.scalars(db.select(BankAccount.id).where(BankAccount.id.in_(account_ids))))
+    
+    rows = []
+    for fixed_expense, account_id, year, month in occurrences:
+        key = (fixed_expense.id, year, month)
+        if key in already_tracked or account_id not in valid_accounts:
+            continue
+        
+        already_tracked.add(key)
+        rows.append({
+            'account_id': account_id,
+            'month': month,
+            'year': year,
+            'transaction_type': 'expense',
+            'amount': fixed_expense.amount,
+            'description': f'Fixed Expense - Tracking Only: {fixed_expense.name}',
+            'category': fixed_expense.category,
+            'fixed_expense_id': fixed_expense.id,
+        })
+    
+    return bulk_insert_monthly_transactions(rows)
+
+def fixed_expense_range_error(start_year, start_month, end_year, end_month):
+    """Error message if a fixed expense month range is reversed or too long, else None"""
+    months = to_period(end_year, end_month) - to_period(start_year, start_month) + 1
+    if months < 1:
+        return 'End month must not be before the start month'
+    if months > app.config['FIXED_EXPENSE_MAX_RANGE_MONTHS']:
+        return f'Month range is too long - at most {app.config["FIXED_EXPENSE_MAX_RANGE_MONTHS"]} months at a time'
+    return None
+
 @app.route('/bulk_allocate_fixed_expenses', methods=['POST'])
 def bulk_allocate_fixed_expenses():
-    """Bulk allocate multiple fixed expenses to accounts (for tracking only - doesn't affect balance calculations)"""
+    """Bulk allocate multiple fixed expenses to accounts (for tracking only - doesn't affect balance calculations)
+    
+    Optional end_month/end_year allocate the same assignment across the range, booking each
+    expense only in the months it is due (per its frequency, start and end date).
+    """
     month = int(request.form['month'])
     year = int(request.form['year'])
+    end_month = int(request.form.get('end_month') or month)
+    end_year = int(request.form.get('end_year') or year)
     
-    allocations_made = 0
-    
-    # Process each fixed expense allocation
+    # Collect expense -> account assignments from the form
+    allocations = {}
     for key, account_id in request.form.items():
         if key.startswith('expense_') and account_id:
             try:
-                fixed_expense_id = int(key.replace('expense_', ''))
-                account_id = int(account_id)
-                
-                # Check if already allocated this month
-                existing_payment = MonthlyTransaction.query.filter_by(
-                    month=month,
-                    year=year,
-                    fixed_expense_id=fixed_expense_id
-                ).first()
-                
-                if not existing_payment:
-                    fixed_expense = FixedExpense.query.get(fixed_expense_id)
-                    account = BankAccount.query.get(account_id)
-                    
-                    if fixed_expense and account:
-                        # Create tracking transaction
-                        transaction = MonthlyTransaction(
-                            account_id=account_id,
-                            month=month,
-                            year=year,
-                            transaction_type='expense',
-                            amount=fixed_expense.amount,
-                            description=f'Fixed Expense - Tracking Only: {fixed_expense.name}',
-                            category=fixed_expense.category,
-                            fixed_expense_id=fixed_expense_id
-                        )
-                        
-                        db.session.add(transaction)
-                        allocations_made += 1
+                allocations[int(key.replace('expense_', ''))] = int(account_id)
             except (ValueError, TypeError):
                 continue
     
+    range_error = fixed_expense_range_error(year, month, end_year, end_month)
+    if range_error:
+        flash(range_error, 'error')
+        return redirect(url_for('monthly_data', month=month, year=year))
+    
+    expenses = FixedExpense.query.filter(FixedExpense.id.in_(allocations)).all() if allocations else []
+    calendar = FixedExpenseCalendar.for_range(year, month, end_year, end_month, expenses=expenses)
+    occurrences = [
+        (expense, allocations[expense.id], alloc_year, alloc_month)
+        for expense, alloc_year, alloc_month in calendar.occurrences()
+    ]
+    
+    allocations_made = insert_fixed_expense_tracking(occurrences)
+    
     if allocations_made > 0:
         db.session.commit()
         flash(f'Successfully allocated {allocations_made} fixed expenses for tracking!', 'success')
@@ -481,6 +841,442 @@ def bulk_allocate_fixed_expenses():
     
     return redirect(url_for('monthly_data', month=month, year=year))
 
+@app.route('/roll_forward_fixed_expenses', methods=['POST'])
+def roll_forward_fixed_expenses():
+    """Generate tracking transactions for every due fixed expense occurrence in a month range
+    
+    Each occurrence is booked to the expense's default account. Occurrences that are already
+    tracked are skipped, so running it again over the same range adds nothing.
+    """
+    today = datetime.now()
+    start_month = int(request.form.get('start_month') or today.month)
+    start_year = int(request.form.get('start_year') or today.year)
+    default_end_year, default_end_month = from_period(to_period(start_year, start_month) + 11)
+    end_month = int(request.form.get('end_month') or default_end_month)
+    end_year = int(request.form.get('end_year') or default_end_year)
+    
+    range_error = fixed_expense_range_error(start_year, start_month, end_year, end_month)
+    if range_error:
+        flash(range_error, 'error')
+        return redirect(url_for('fixed_expenses'))
+    
+    calendar = FixedExpenseCalendar.for_range(start_year, start_month, end_year, end_month)
+    
+    occurrences = []
+    without_account = set()
+    for expense, year, month in calendar.occurrences():
+        if expense.default_account_id:
+            occurrences.append((expense, expense.default_account_id, year, month))
+        else:
+            without_account.add(expense.name)
+    
+    created = insert_fixed_expense_tracking(occurrences)
+    db.session.commit()
+    
+    flash(f'Generated {created} fixed expense tracking entries for '
+          f'{start_year}-{start_month:02d} to {end_year}-{end_month:02d}', 'success' if created else 'info')
+    if without_account:
+        flash(f'Skipped (no default account): {", ".join(sorted(without_account))}', 'warning')
+    
+    return redirect(url_for('fixed_expenses'))
+
+def dialect_insert(model):
+    """INSERT construct with ON CONFLICT support for the configured database (checked at startup)"""
+    return SUPPORTED_DATABASES[db.engine.dialect.name](model)
+
+MONTHLY_BALANCE_KEY = ['account_id', 'month', 'year']
+
+def ledger_scopes(rows):
+    """(account_id, period) pairs touched by MonthlyBalance/MonthlyTransaction row dicts
+    
+    Pass as the ledger_scopes execution option on bulk statements that don't carry their
+    rows as parameters, so the LedgerCache only reloads those account-months.
+    """
+    return {(row['account_id'], to_period(row['year'], row['month'])) for row in rows}
+
+def upsert_monthly_balances(rows, update_columns=(), only_if_changed=False):
+    """Insert or update MonthlyBalance rows keyed on (account, month, year) in one statement - doesn't commit
+    
+    rows is a list of dicts with the key columns plus any values; on conflict only
+    update_columns are overwritten. Returns the resulting MonthlyBalance objects. With
+    only_if_changed, rows whose values already match are left unwritten (and not returned).
+    """
+    if not rows:
+        return []
+    
+    now = datetime.utcnow()
+    rows = [dict(row, updated_date=now) for row in rows]
+    stmt = dialect_insert(MonthlyBalance).values(rows)
+    
+    # Always touch updated_date so the conflicting row is returned as well
+    set_ = {column: stmt.excluded[column] for column in update_columns}
+    set_['updated_date'] = stmt.excluded.updated_date
+    
+    where = None
+    if only_if_changed and update_columns:
+        where = db.or_(*[getattr(MonthlyBalance, column).is_distinct_from(stmt.excluded[column])
+                         for column in update_columns])
+    
+    stmt = stmt.on_conflict_do_update(index_elements=MONTHLY_BALANCE_KEY, set_=set_, where=where).returning(MonthlyBalance)
+    
+    return db.session.scalars(stmt, execution_options={'populate_existing': True,
+                                                       'ledger_scopes': ledger_scopes(rows)}).all()
+
+def upsert_monthly_balance(account_id, month, year, **values):
+    """Get or create (and update with values) the MonthlyBalance for an account-month in one round-trip"""
+    row = dict(account_id=account_id, month=month, year=year, **values)
+    return upsert_monthly_balances([row], update_columns=list(values))[0]
+
+def refresh_household_summary(periods):
+    """Recompute HouseholdMonthlySummary rows for the given periods - doesn't commit
+    
+    Balance writes reach it through refresh_month_aggregates, investment writes call it
+    directly - always before committing, so the summary changes in the same transaction. Totals come from two grouped queries;
+    months left without balances or investments lose their summary row.
+    """
+    periods = sorted(set(periods))
+    if not periods:
+        return 0
+    
+    db.session.flush()
+    
+    balance_totals = {row.period: row for row in db.session.query(
+        MonthlyBalance.period.label('period'),
+        db.func.sum(MonthlyBalance.opening_balance).label('opening_balance'),
+        db.func.sum(known_balance_sql()).label('closing_balance'),
+        db.func.sum(MonthlyBalance.income).label('income'),
+        db.func.sum(MonthlyBalance.expenses).label('expenses'),
+        db.func.coalesce(db.func.sum(db.case(
+            (BankAccount.is_debt.is_(False), MonthlyBalance.income), else_=0
+        )), 0).label('regular_income'),
+        db.func.count(MonthlyBalance.id).label('account_count')
+    ).join(BankAccount, MonthlyBalance.account_id == BankAccount.id).filter(
+        MonthlyBalance.period.in_(periods)
+    ).group_by(MonthlyBalance.period).all()}
+    
+    investment_totals = dict(db.session.query(
+        Investment.period, db.func.sum(Investment.amount)
+    ).filter(Investment.period.in_(periods)).group_by(Investment.period).all())
+    
+    rows = []
+    for period in periods:
+        totals = balance_totals.get(period)
+        if totals is None and period not in investment_totals:
+            continue
+        year, month = from_period(period)
+        rows.append({
+            'period': period,
+            'month': month,
+            'year': year,
+            'opening_balance': totals.opening_balance if totals else 0,
+            'closing_balance': totals.closing_balance if totals else 0,
+            'income': totals.income if totals else 0,
+            'expenses': totals.expenses if totals else 0,
+            'regular_income': totals.regular_income if totals else 0,
+            'investments': investment_totals.get(period) or 0,
+            'account_count': totals.account_count if totals else 0,
+            'updated_date': datetime.utcnow()
+        })
+    
+    empty = set(periods) - {row['period'] for row in rows}
+    if empty:
+        HouseholdMonthlySummary.query.filter(
+            HouseholdMonthlySummary.period.in_(empty)
+        ).delete(synchronize_session=False)
+    
+    if rows:
+        stmt = dialect_insert(HouseholdMonthlySummary).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['period'],
+            set_={column: stmt.excluded[column] for column in rows[0] if column != 'period'}
+        )
+        db.session.execute(stmt)
+    
+    return len(rows)
+
+def rebuild_household_summary():
+    """Rebuild the whole HouseholdMonthlySummary table from MonthlyBalance and Investment - doesn't commit"""
+    periods = {period for (period,) in db.session.query(MonthlyBalance.period).distinct()}
+    periods |= {period for (period,) in db.session.query(Investment.period).distinct()}
+    
+    HouseholdMonthlySummary.query.filter(
+        HouseholdMonthlySummary.period.notin_(periods) if periods else db.true()
+    ).delete(synchronize_session=False)
+    return refresh_household_summary(periods)
+
+INCOME_TRANSACTION_TYPES = ('income', 'misc_income')
+UNCATEGORIZED = {'income': 'Other Income', 'expense': 'Other Expenses'}  # Default categories for blank or unknown names
+
+def refresh_monthly_categories(account_periods):
+    """Recompute MonthlyCategory totals for (account_id, period) pairs - doesn't commit
+    
+    One grouped query sums the pairs' transactions by category name and type, leaving out summary
+    and tracking rows (category_spending_filter). Names are matched to existing Category rows
+    (case-insensitively); free-text names without one count towards UNCATEGORIZED, the category
+    list itself is never changed. Account-months without a MonthlyBalance are skipped until their balance
+    is entered, refresh_month_aggregates picks them up then.
+    """
+    account_periods = set(account_periods)
+    if not account_periods:
+        return 0
+    
+    db.session.flush()
+    account_ids = {account_id for account_id, _ in account_periods}
+    periods = [period for _, period in account_periods]
+    
+    balance_ids = {
+        (account_id, period): balance_id
+        for balance_id, account_id, period in db.session.query(
+            MonthlyBalance.id, MonthlyBalance.account_id, MonthlyBalance.period
+        ).filter(
+            MonthlyBalance.account_id.in_(account_ids),
+            MonthlyBalance.period.between(min(periods), max(periods))
+        )
+        if (account_id, period) in account_periods
+    }
+    if not balance_ids:
+        return 0
+    
+    category_type = db.case((MonthlyTransaction.transaction_type.in_(INCOME_TRANSACTION_TYPES), 'income'), else_='expense')
+    name = db.func.coalesce(db.func.nullif(db.func.trim(MonthlyTransaction.category), ''), db.case(
+        (MonthlyTransaction.transaction_type.in_(INCOME_TRANSACTION_TYPES), UNCATEGORIZED['income']),
+        else_=UNCATEGORIZED['expense']
+    ))
+    totals = [row for row in db.session.query(
+        MonthlyTransaction.account_id, MonthlyTransaction.period, name, category_type,
+        db.func.sum(MonthlyTransaction.amount)
+    ).filter(
+        MonthlyTransaction.account_id.in_(account_ids),
+        MonthlyTransaction.period.between(min(periods), max(periods)),
+        category_spending_filter()
+    ).group_by(MonthlyTransaction.account_id, MonthlyTransaction.period, name, category_type)
+        if (row[0], row[1]) in balance_ids]
+    
+    # Oldest category wins when names repeat
+    categories = {(category.name.strip().lower(), category.category_type): category.id
+                  for category in Category.query.order_by(Category.id.desc())}
+    
+    amounts = {}  # (monthly_balance_id, category_id) -> cents
+    for account_id, period, category_name, kind, amount in totals:
+        category_id = (categories.get((category_name.lower(), kind))
+                       or categories.get((UNCATEGORIZED[kind].lower(), kind)))
+        if category_id is None:
+            continue  # No Uncategorized row to fall back on
+        key = (balance_ids[(account_id, period)], category_id)
+        amounts[key] = amounts.get(key, 0) + to_cents(amount)
+    
+    rows = [{'monthly_balance_id': balance_id, 'category_id': category_id, 'amount': from_cents(amount)}
+            for (balance_id, category_id), amount in amounts.items()]
+    
+    keep = {(row['monthly_balance_id'], row['category_id']) for row in rows}
+    stale = [category_amount_id for category_amount_id, balance_id, category_id in db.session.query(
+        MonthlyCategory.id, MonthlyCategory.monthly_balance_id, MonthlyCategory.category_id
+    ).filter(MonthlyCategory.monthly_balance_id.in_(balance_ids.values()))
+        if (balance_id, category_id) not in keep]
+    if stale:
+        MonthlyCategory.query.filter(MonthlyCategory.id.in_(stale)).delete(synchronize_session=False)
+    
+    if rows:
+        stmt = dialect_insert(MonthlyCategory)
+        stmt = stmt.on_conflict_do_update(index_elements=['monthly_balance_id', 'category_id'],
+                                          set_={'amount': stmt.excluded.amount})
+        db.session.execute(stmt, rows)
+    
+    return len(rows)
+
+def rebuild_monthly_categories():
+    """Rebuild the whole MonthlyCategory table from MonthlyTransaction - doesn't commit"""
+    MonthlyCategory.query.delete(synchronize_session=False)
+    return refresh_monthly_categories(db.session.query(MonthlyBalance.account_id, MonthlyBalance.period).all())
+
+def net_worth_horizon():
+    """Last period the net worth index covers: the current month or the latest balance, if later"""
+    latest = db.session.query(db.func.max(MonthlyBalance.period)).scalar()
+    current = to_period(datetime.now().year, datetime.now().month)
+    return current if latest is None else max(current, latest)
+
+def signed_balance_entries(account_ids=None, from_period=None):
+    """{account_id: [(period, cents)]} of known balances, oldest first, with debts negative"""
+    query = db.session.query(
+        MonthlyBalance.account_id,
+        MonthlyBalance.period,
+        cents(known_balance_sql()),
+        BankAccount.is_debt
+    ).join(BankAccount, MonthlyBalance.account_id == BankAccount.id)
+    
+    if account_ids is not None:
+        query = query.filter(MonthlyBalance.account_id.in_(list(account_ids)))
+    if from_period is not None:
+        query = query.filter(MonthlyBalance.period >= from_period)
+    
+    entries = {}
+    for account_id, period, amount, is_debt in query.order_by(MonthlyBalance.account_id, MonthlyBalance.period):
+        amount = int(amount)
+        entries.setdefault(account_id, []).append((period, -amount if is_debt else amount))
+    return entries
+
+def carry_forward(entries, end_period):
+    """Yield (period, cents) from the first entry to end_period, repeating the last known balance"""
+    if not entries:
+        return
+    values = dict(entries)
+    current = None
+    for period in range(entries[0][0], end_period + 1):
+        current = values.get(period, current)
+        yield period, current
+
+def rebuild_net_worth_index():
+    """Rebuild the whole NetWorthIndex from MonthlyBalance - doesn't commit"""
+    NetWorthIndex.query.delete(synchronize_session=False)
+    horizon = net_worth_horizon()
+    
+    rows = []
+    household = {}
+    for account_id, entries in signed_balance_entries().items():
+        for period, amount in carry_forward(entries, horizon):
+            rows.append({'account_id': account_id, 'period': period, 'balance': from_cents(amount)})
+            household[period] = household.get(period, 0) + amount
+    
+    rows.extend({'account_id': NET_WORTH_HOUSEHOLD, 'period': period, 'balance': from_cents(amount)}
+                for period, amount in household.items())
+    if rows:
+        db.session.execute(db.insert(NetWorthIndex), rows)
+    return len(rows)
+
+def update_net_worth_index(account_periods):
+    """Bring the NetWorthIndex up to date after balances changed - doesn't commit
+    
+    account_periods are the (account_id, period) pairs that were written. Only each account's
+    rows from its earliest changed month up to its next untouched balance are recomputed,
+    then the household totals over that span; a later horizon extends every account by
+    carrying its last row forward. An empty index is built in full.
+    """
+    account_periods = set(account_periods)
+    if not account_periods:
+        return 0
+    
+    db.session.flush()
+    old_horizon = db.session.query(db.func.max(NetWorthIndex.period)).scalar()
+    if old_horizon is None:
+        return rebuild_net_worth_index()
+    
+    horizon = net_worth_horizon()
+    written = 0
+    
+    if horizon > old_horizon:
+        last_rows = db.session.query(NetWorthIndex.account_id, NetWorthIndex.balance).filter(
+            NetWorthIndex.period == old_horizon
+        ).all()
+        rows = [{'account_id': account_id, 'period': period, 'balance': balance}
+                for account_id, balance in last_rows
+                for period in range(old_horizon + 1, horizon + 1)]
+        if rows:
+            db.session.execute(db.insert(NetWorthIndex), rows)
+            written += len(rows)
+    
+    changed = {}
+    for account_id, period in account_periods:
+        changed.setdefault(account_id, []).append(period)
+    
+    span_start, span_end = None, None
+    for account_id, periods in changed.items():
+        start, last_changed = min(periods), max(periods)
+        
+        # Balance carried into the range comes from the last entry before it
+        carry_in = db.session.query(db.func.max(MonthlyBalance.period)).filter(
+            MonthlyBalance.account_id == account_id,
+            MonthlyBalance.period < start
+        ).scalar()
+        entries = signed_balance_entries([account_id], carry_in if carry_in is not None else start).get(account_id, [])
+        end = next((period for period, _ in entries if period > last_changed), horizon + 1) - 1
+        
+        NetWorthIndex.query.filter(
+            NetWorthIndex.account_id == account_id,
+            NetWorthIndex.period.between(start, end)
+        ).delete(synchronize_session=False)
+        
+        rows = [{'account_id': account_id, 'period': period, 'balance': from_cents(amount)}
+                for period, amount in carry_forward(entries, end) if period >= start]
+        if rows:
+            db.session.execute(db.insert(NetWorthIndex), rows)
+            written += len(rows)
+        
+        span_start = start if span_start is None else min(span_start, start)
+        span_end = end if span_end is None else max(span_end, end)
+    
+    # Household totals over the recomputed span, from the per-account rows
+    totals = db.session.query(
+        NetWorthIndex.period, db.func.sum(NetWorthIndex.balance)
+    ).filter(
+        NetWorthIndex.account_id != NET_WORTH_HOUSEHOLD,
+        NetWorthIndex.period.between(span_start, span_end)
+    ).group_by(NetWorthIndex.period).all()
+    
+    NetWorthIndex.query.filter(
+        NetWorthIndex.account_id == NET_WORTH_HOUSEHOLD,
+        NetWorthIndex.period.between(span_start, span_end)
+    ).delete(synchronize_session=False)
+    if totals:
+        db.session.execute(db.insert(NetWorthIndex), [
+            {'account_id': NET_WORTH_HOUSEHOLD, 'period': period, 'balance': balance} for period, balance in totals
+        ])
+        written += len(totals)
+    
+    return written
+
+def refresh_month_aggregates(account_periods):
+    """Refresh everything derived from MonthlyBalance after (account_id, period) pairs were written - doesn't commit
+    
+    Call from every route that writes balances, before committing. Balance writes also write the
+    summary transactions, and a new balance row makes the month's categories countable.
+    """
+    account_periods = set(account_periods)
+    refresh_household_summary(period for _, period in account_periods)
+    update_net_worth_index(account_periods)
+    refresh_monthly_categories(account_periods)
+
+def net_worth_as_of(period, account_id=NET_WORTH_HOUSEHOLD):
+    """Net worth (or one account's signed balance) as of a period - a single index seek"""
+    balance = db.session.query(NetWorthIndex.balance).filter(
+        NetWorthIndex.account_id == account_id,
+        NetWorthIndex.period <= period
+    ).order_by(NetWorthIndex.period.desc()).limit(1).scalar()
+    return balance or 0
+
+def net_worth_series(start_period, end_period, account_id=NET_WORTH_HOUSEHOLD):
+    """[(period, balance)] for every month in a range - one range scan, carried past the horizon"""
+    rows = dict(db.session.query(NetWorthIndex.period, NetWorthIndex.balance).filter(
+        NetWorthIndex.account_id == account_id,
+        NetWorthIndex.period.between(start_period, end_period)
+    ).all())
+    
+    series = []
+    current = net_worth_as_of(start_period - 1, account_id) if start_period not in rows else 0
+    for period in range(start_period, end_period + 1):
+        current = rows.get(period, current)
+        series.append((period, current))
+    return series
+
+def transaction_type_totals(account_id, month, year):
+    """Sum of transaction amounts per transaction_type for an account-month (one GROUP BY query)"""
+    rows = db.session.query(
+        MonthlyTransaction.transaction_type,
+        db.func.sum(MonthlyTransaction.amount)
+    ).filter(
+        MonthlyTransaction.account_id == account_id,
+        MonthlyTransaction.month == month,
+        MonthlyTransaction.year == year
+    ).group_by(MonthlyTransaction.transaction_type).all()
+    
+    return {transaction_type: total or 0 for transaction_type, total in rows}
+
+def income_expense_totals(account_id, month, year):
+    """(income, expenses) for an account-month, including misc adjustments"""
+    totals = transaction_type_totals(account_id, month, year)
+    income = totals.get('income', 0) + totals.get('misc_income', 0)
+    expenses = totals.get('expense', 0) + totals.get('misc_expense', 0)
+    return income, expenses
+
 @app.route('/set_closing_balance', methods=['POST'])
 def set_closing_balance():
     """Set closing balance and auto-balance with misc transactions"""
@@ -493,49 +1289,35 @@ def set_closing_balance():
     account = BankAccount.query.get_or_404(account_id)
     
     # Get or create monthly balance record
-    balance = MonthlyBalance.query.filter_by(
-        account_id=account_id,
-        month=month,
-        year=year
-    ).first()
+    balance = upsert_monthly_balance(account_id, month, year)
     
-    if not balance:
-        balance = MonthlyBalance(
-            account_id=account_id,
-            month=month,
-            year=year,
-            opening_balance=0.0
-        )
-        db.session.add(balance)
+    # Totals per transaction type in one aggregate query. Existing misc rows are the
+    # previous auto-balance and get replaced, so they don't count towards the expectation.
+    type_totals = transaction_type_totals(account_id, month, year)
+    total_income = type_totals.get('income', 0)
+    total_expenses = type_totals.get('expense', 0)
     
-    # Calculate totals from transactions
-    transactions = MonthlyTransaction.query.filter_by(
-        account_id=account_id,
-        month=month,
-        year=year
-    ).all()
-    
-    total_income = sum(t.amount for t in transactions if t.transaction_type in ['income', 'misc_income'])
-    total_expenses = sum(t.amount for t in transactions if t.transaction_type in ['expense', 'misc_expense'])
-    
-    # Calculate expected closing balance
+    # Calculate expected closing balance, in whole cents so the comparison is exact
     expected_closing = balance.opening_balance + total_income - total_expenses
-    difference = closing_balance - expected_closing
+    difference = from_cents(to_cents(closing_balance) - to_cents(expected_closing))
     
     # Remove existing misc transactions for auto-balancing
-    existing_misc = MonthlyTransaction.query.filter_by(
+    MonthlyTransaction.query.filter_by(
         account_id=account_id,
         month=month,
         year=year
-    ).filter(MonthlyTransaction.transaction_type.in_(['misc_income', 'misc_expense'])).all()
+    ).filter(
+        MonthlyTransaction.transaction_type.in_(['misc_income', 'misc_expense'])
+    ).execution_options(ledger_scopes=[(account_id, to_period(year, month))]).delete(synchronize_session=False)
     
-    for misc in existing_misc:
-        db.session.delete(misc)
+    misc_income = 0
+    misc_expense = 0
     
-    # Add misc transaction if there's a difference
-    if abs(difference) > 0.01:  # Only if difference is significant
+    # Add misc transaction if there's a difference of at least a cent
+    if difference:
         if difference > 0:
             # Need misc income
+            misc_income = difference
             misc_transaction = MonthlyTransaction(
                 account_id=account_id,
                 month=month,
@@ -543,10 +1325,12 @@ def set_closing_balance():
                 transaction_type='misc_income',
                 amount=difference,
                 description='Auto-generated: Balance adjustment',
-                category='Miscellaneous'
+                category='Miscellaneous',
+                is_summary=True
             )
         else:
             # Need misc expense
+            misc_expense = abs(difference)
             misc_transaction = MonthlyTransaction(
                 account_id=account_id,
                 month=month,
@@ -554,7 +1338,8 @@ def set_closing_balance():
                 transaction_type='misc_expense',
                 amount=abs(difference),
                 description='Auto-generated: Balance adjustment',
-                category='Miscellaneous'
+                category='Miscellaneous',
+                is_summary=True
             )
         
         db.session.add(misc_transaction)
@@ -562,25 +1347,160 @@ def set_closing_balance():
     # Update closing balance
     balance.closing_balance = closing_balance
     
-    # Recalculate totals for the balance record
-    all_transactions = MonthlyTransaction.query.filter_by(
-        account_id=account_id,
-        month=month,
-        year=year
-    ).all()
-    
-    balance.income = sum(t.amount for t in all_transactions if t.transaction_type in ['income', 'misc_income'])
-    balance.expenses = sum(t.amount for t in all_transactions if t.transaction_type in ['expense', 'misc_expense'])
+    # Totals for the balance record follow from the aggregate plus the new misc row
+    balance.income = total_income + misc_income
+    balance.expenses = total_expenses + misc_expense
     
+    refresh_month_aggregates([(account_id, to_period(year, month))])
     db.session.commit()
     
-    if abs(difference) > 0.01:
+    if difference:
         flash(f'Closing balance set. Auto-balanced with €{abs(difference):.2f} misc {"income" if difference > 0 else "expense"}', 'info')
     else:
         flash(f'Closing balance set to €{closing_balance:.2f}', 'success')
     
     return redirect(url_for('monthly_data', month=month, year=year))
 
+def category_spending_filter(model=MonthlyTransaction):
+    """SQL filter keeping transactions that belong in per-category figures
+    
+    Summary rows (is_summary) restate the month's totals and fixed expense / debt payment tracking
+    rows duplicate money already counted there, so both are left out - as the monthly data page does.
+    """
+    return db.and_(
+        model.is_summary.is_(False),
+        model.fixed_expense_id.is_(None),
+        model.source_account_id.is_(None)
+    )
+
+def category_spending_rows(frame):
+    """Boolean mask of the ledger cache transactions frame rows category_spending_filter keeps"""
+    return (~frame['is_summary'].astype(bool) & frame['fixed_expense_id'].isna()
+            & frame['source_account_id'].isna()).to_numpy()
+
+def sync_summary_transactions(desired):
+    """Bring the summary transactions of account-months in line with the desired rows - doesn't commit
+    
+    desired maps (account_id, month, year) to a list of row dicts (transaction_type, amount,
+    description, category). Only rows written here (is_summary) are matched, on
+    (transaction_type, category), and only the needed inserts, updates and deletes are issued.
+    Imported and manual transactions - even ones categorized 'Income' or 'Miscellaneous' - and
+    fixed expense and debt payment tracking rows are never touched. Returns (inserted, updated, deleted).
+    """
+    if not desired:
+        return 0, 0, 0
+    
+    existing = {}
+    for transaction in MonthlyTransaction.query.filter(
+        db.tuple_(MonthlyTransaction.account_id, MonthlyTransaction.month, MonthlyTransaction.year).in_(list(desired)),
+        MonthlyTransaction.is_summary.is_(True)
+    ).order_by(MonthlyTransaction.id).all():
+        key = (transaction.account_id, transaction.month, transaction.year)
+        existing.setdefault(key, []).append(transaction)
+    
+    to_insert = []
+    to_delete = []
+    updated = 0
+    
+    for (account_id, month, year), rows in desired.items():
+        current = existing.get((account_id, month, year), [])
+        
+        for row in rows:
+            match = next((t for t in current
+                          if t.transaction_type == row['transaction_type'] and t.category == row['category']), None)
+            if match is None:
+                to_insert.append(dict(row, account_id=account_id, month=month, year=year, is_summary=True))
+                continue
+            
+            current.remove(match)
+            if to_cents(match.amount) != to_cents(row['amount']) or match.description != row['description']:
+                match.amount = row['amount']
+                match.description = row['description']
+                updated += 1
+        
+        # Summary rows left over are stale (e.g. a net gain that is now an expense)
+        to_delete.extend(t.id for t in current)
+    
+    if to_delete:
+        MonthlyTransaction.query.filter(MonthlyTransaction.id.in_(to_delete)).execution_options(
+            ledger_scopes=ledger_scopes(dict(account_id=a, month=m, year=y) for a, m, y in desired)
+        ).delete(synchronize_session=False)
+    inserted = bulk_insert_monthly_transactions(to_insert)
+    
+    return inserted, updated, len(to_delete)
+
+def debt_account_entry(account, opening_balance, paid_amount, closing_balance):
+    """Balance values and summary transactions for a debt account's month"""
+    # Calculate monthly spend: Monthly Spend = Closing Balance - Opening Balance + Paid Amount
+    monthly_spend = closing_balance - opening_balance + paid_amount
+    
+    # Paid amount is stored as income (debt reduction) and monthly spend as expenses
+    balance_values = {
+        'opening_balance': opening_balance,
+        'closing_balance': closing_balance,
+        'income': paid_amount,
+        'expenses': monthly_spend
+    }
+    
+    rows = []
+    if paid_amount > 0:
+        rows.append({
+            'transaction_type': 'income',
+            'amount': paid_amount,
+            'description': f'Payment to {account.name}',
+            'category': 'Debt Payment'
+        })
+    if monthly_spend > 0:
+        rows.append({
+            'transaction_type': 'expense',
+            'amount': monthly_spend,
+            'description': f'Monthly spending on {account.name}',
+            'category': 'Credit Card Spending' if account.account_type == 'credit' else 'Loan Interest/Fees'
+        })
+    
+    return balance_values, rows
+
+def regular_account_entry(account, opening_balance, income, closing_balance):
+    """Balance values and summary transactions for a regular account's month"""
+    # Calculate expenses: Expenses = Opening Balance + Income - Closing Balance
+    calculated_expenses = opening_balance + income - closing_balance
+    
+    balance_values = {
+        'opening_balance': opening_balance,
+        'closing_balance': closing_balance,
+        'income': income,
+        'expenses': calculated_expenses
+    }
+    
+    rows = []
+    if income > 0:
+        rows.append({
+            'transaction_type': 'income',
+            'amount': income,
+            'description': f'Total income for {account.name}',
+            'category': 'Income'
+        })
+    
+    # One total expense row (no need to break down by fixed vs non-fixed)
+    # The closing balance already reflects all actual payments
+    if calculated_expenses > 0:
+        rows.append({
+            'transaction_type': 'expense',
+            'amount': calculated_expenses,
+            'description': f'Total expenses for {account.name}',
+            'category': 'Total Expenses'
+        })
+    elif calculated_expenses < 0:
+        # If negative, it means there was a net gain (more income than expenses)
+        rows.append({
+            'transaction_type': 'misc_income',
+            'amount': abs(calculated_expenses),
+            'description': f'Net gain for {account.name}',
+            'category': 'Miscellaneous'
+        })
+    
+    return balance_values, rows
+
 @app.route('/set_debt_account_data', methods=['POST'])
 def set_debt_account_data():
     """Set debt account data (opening balance, paid amount, closing balance) and calculate monthly spend"""
@@ -593,75 +1513,21 @@ def set_debt_account_data():
     
     # Get account to verify it's a debt account
     account = BankAccount.query.get_or_404(account_id)
-    if account.account_type.lower() not in ['credit', 'loan']:
+    if not account.is_debt:
         flash('This endpoint is only for credit cards and loan accounts', 'error')
         return redirect(url_for('monthly_data', month=month, year=year))
     
-    # Get or create monthly balance record
-    balance = MonthlyBalance.query.filter_by(
-        account_id=account_id,
-        month=month,
-        year=year
-    ).first()
-    
-    if not balance:
-        balance = MonthlyBalance(
-            account_id=account_id,
-            month=month,
-            year=year
-        )
-        db.session.add(balance)
-    
-    # Set the balances
-    balance.opening_balance = opening_balance
-    balance.closing_balance = closing_balance
-    
-    # Calculate monthly spend: Monthly Spend = Closing Balance - Opening Balance + Paid Amount
-    monthly_spend = closing_balance - opening_balance + paid_amount
-    
-    # Store paid amount as income (debt reduction) and monthly spend as expenses
-    balance.income = paid_amount  # Payments made to reduce debt
-    balance.expenses = monthly_spend  # Money spent on this account
-    
-    # Clear existing transactions for this account/month and create new ones
-    existing_transactions = MonthlyTransaction.query.filter_by(
-        account_id=account_id,
-        month=month,
-        year=year
-    ).all()
-    
-    for transaction in existing_transactions:
-        db.session.delete(transaction)
+    balance_values, rows = debt_account_entry(account, opening_balance, paid_amount, closing_balance)
     
-    # Create payment transaction if paid amount > 0
-    if paid_amount > 0:
-        payment_transaction = MonthlyTransaction(
-            account_id=account_id,
-            month=month,
-            year=year,
-            transaction_type='income',
-            amount=paid_amount,
-            description=f'Payment to {account.name}',
-            category='Debt Payment'
-        )
-        db.session.add(payment_transaction)
-    
-    # Create spending transaction if monthly spend > 0
-    if monthly_spend > 0:
-        spend_transaction = MonthlyTransaction(
-            account_id=account_id,
-            month=month,
-            year=year,
-            transaction_type='expense',
-            amount=monthly_spend,
-            description=f'Monthly spending on {account.name}',
-            category='Credit Card Spending' if account.account_type.lower() == 'credit' else 'Loan Interest/Fees'
-        )
-        db.session.add(spend_transaction)
+    # Only write what changed: the balance row and the summary transactions
+    upsert_monthly_balances([dict(balance_values, account_id=account_id, month=month, year=year)],
+                            update_columns=list(balance_values), only_if_changed=True)
+    sync_summary_transactions({(account_id, month, year): rows})
+    refresh_month_aggregates([(account_id, to_period(year, month))])
     
     db.session.commit()
     
-    flash(f'Debt account updated. Monthly spend: €{monthly_spend:.2f}', 'success')
+    flash(f'Debt account updated. Monthly spend: €{balance_values["expenses"]:.2f}', 'success')
     return redirect(url_for('monthly_data', month=month, year=year))
 
 @app.route('/set_regular_account_data', methods=['POST'])
@@ -676,151 +1542,1236 @@ def set_regular_account_data():
     
     # Get account to verify it's a regular account
     account = BankAccount.query.get_or_404(account_id)
-    if account.account_type.lower() in ['credit', 'loan']:
+    if account.is_debt:
         flash('This endpoint is only for regular bank accounts', 'error')
         return redirect(url_for('monthly_data', month=month, year=year))
     
-    # Get or create monthly balance record
-    balance = MonthlyBalance.query.filter_by(
-        account_id=account_id,
-        month=month,
-        year=year
-    ).first()
+    balance_values, rows = regular_account_entry(account, opening_balance, income, closing_balance)
     
-    if not balance:
-        balance = MonthlyBalance(
-            account_id=account_id,
-            month=month,
-            year=year
-        )
-        db.session.add(balance)
+    # Only write what changed: the balance row and the summary transactions
+    upsert_monthly_balances([dict(balance_values, account_id=account_id, month=month, year=year)],
+                            update_columns=list(balance_values), only_if_changed=True)
+    sync_summary_transactions({(account_id, month, year): rows})
+    refresh_month_aggregates([(account_id, to_period(year, month))])
     
-    # Set the balances
-    balance.opening_balance = opening_balance
-    balance.closing_balance = closing_balance
-    balance.income = income
+    db.session.commit()
     
-    # Calculate expenses: Expenses = Opening Balance + Income - Closing Balance
-    calculated_expenses = opening_balance + income - closing_balance
-    balance.expenses = calculated_expenses
+    flash(f'Account updated. Total expenses: €{balance_values["expenses"]:.2f}', 'success')
+    return redirect(url_for('monthly_data', month=month, year=year))
+
+def month_summary(month, year):
+    """Per-account balances and household totals for a month (one query)"""
+    rows = db.session.query(MonthlyBalance, BankAccount.name).join(
+        BankAccount, MonthlyBalance.account_id == BankAccount.id
+    ).filter(
+        MonthlyBalance.month == month,
+        MonthlyBalance.year == year
+    ).order_by(BankAccount.name).all()
+    
+    accounts = [{
+        'account_id': balance.account_id,
+        'name': name,
+        'opening_balance': balance.opening_balance,
+        'closing_balance': balance.closing_balance,
+        'income': balance.income,
+        'expenses': balance.expenses
+    } for balance, name in rows]
     
-    # Clear existing transactions for this account/month and create new ones
-    existing_transactions = MonthlyTransaction.query.filter_by(
-        account_id=account_id,
-        month=month,
-        year=year
+    return {
+        'month': month,
+        'year': year,
+        'accounts': accounts,
+        'totals': {
+            'opening_balance': sum(a['opening_balance'] or 0 for a in accounts),
+            'closing_balance': sum(a['opening_balance'] or 0 if a['closing_balance'] is None else a['closing_balance']
+                                   for a in accounts),
+            'income': sum(a['income'] or 0 for a in accounts),
+            'expenses': sum(a['expenses'] or 0 for a in accounts)
+        }
+    }
+
+@app.route('/api/monthly_data', methods=['POST'])
+def submit_monthly_data():
+    """Submit a whole month for all accounts in one transaction
+    
+    Expects JSON: {"month": 6, "year": 2025, "accounts": [{"account_id": 1, "opening_balance": ...,
+    "closing_balance": ..., "income": ...}, ...]} - debt accounts send "paid_amount" instead of "income".
+    Nothing is written unless every entry validates.
+    """
+    data = request.get_json(silent=True) or {}
+    
+    try:
+        month = int(data['month'])
+        year = int(data['year'])
+    except (KeyError, TypeError, ValueError):
+        return jsonify({'success': False, 'error': 'month and year are required'}), 400
+    
+    if not 1 <= month <= 12:
+        return jsonify({'success': False, 'error': 'month must be between 1 and 12'}), 400
+    
+    entries = data.get('accounts') or []
+    if not isinstance(entries, list) or not entries:
+        return jsonify({'success': False, 'error': 'accounts must be a non-empty list'}), 400
+    
+    # Validate every entry before writing anything
+    errors = []
+    parsed = {}
+    for index, entry in enumerate(entries):
+        try:
+            account_id = int(entry['account_id'])
+            if entry.get('closing_balance') in (None, ''):
+                errors.append(f'Entry {index}: closing_balance is required for account {account_id}')
+                continue
+            amounts = (float(entry['opening_balance']), float(entry['closing_balance']),
+                       float(entry.get('income') or 0), float(entry.get('paid_amount') or 0))
+        except (KeyError, TypeError, ValueError, AttributeError):
+            errors.append(f'Entry {index}: account_id, opening_balance and closing_balance must be numbers')
+            continue
+        
+        if not all(math.isfinite(amount) for amount in amounts):
+            errors.append(f'Entry {index}: amounts must be finite numbers')
+            continue
+        opening_balance, closing_balance, income, paid_amount = amounts
+        
+        if account_id in parsed:
+            errors.append(f'Entry {index}: account {account_id} appears more than once')
+            continue
+        parsed[account_id] = (opening_balance, closing_balance, income, paid_amount)
+    
+    accounts = {a.id: a for a in BankAccount.query.filter(BankAccount.id.in_(list(parsed))).all()} if parsed else {}
+    for account_id in parsed:
+        if account_id not in accounts:
+            errors.append(f'Account {account_id} not found')
+    
+    if errors:
+        return jsonify({'success': False, 'error': 'Validation failed', 'errors': errors}), 400
+    
+    balance_rows = []
+    desired = {}
+    for account_id, (opening_balance, closing_balance, income, paid_amount) in parsed.items():
+        account = accounts[account_id]
+        if account.is_debt:
+            balance_values, rows = debt_account_entry(account, opening_balance, paid_amount, closing_balance)
+        else:
+            balance_values, rows = regular_account_entry(account, opening_balance, income, closing_balance)
+        
+        balance_rows.append(dict(balance_values, account_id=account_id, month=month, year=year))
+        desired[(account_id, month, year)] = rows
+    
+    try:
+        upsert_monthly_balances(balance_rows, update_columns=['opening_balance', 'closing_balance', 'income', 'expenses'],
+                                only_if_changed=True)
+        inserted, updated, deleted = sync_summary_transactions(desired)
+        refresh_month_aggregates((account_id, to_period(year, month)) for account_id in parsed)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        app.logger.exception('Could not save month %s/%s', month, year)
+        return jsonify({'success': False, 'error': 'Could not save month'}), 500
+    
+    summary = month_summary(month, year)
+    summary.update({
+        'success': True,
+        'transactions': {'inserted': inserted, 'updated': updated, 'deleted': deleted}
+    })
+    return jsonify(summary)
+
+def rollover_balances(target_year, target_month):
+    """Carry closing balances forward as opening balances up to the target month - doesn't commit
+    
+    For every active account the latest MonthlyBalance at or before the target month is the
+    starting point; each missing month after it (backfilling any gap) gets a row whose opening
+    balance is the previous closing balance (or the previous opening balance when the month was
+    never closed). Months that already have a row are never touched - including rows another request
+    writes meanwhile (ON CONFLICT DO NOTHING) - so it is safe to re-run or run concurrently.
+    Month aggregates are refreshed for the created rows. Returns the number of rows created.
+    """
+    target_period = to_period(target_year, target_month)
+    period_column = MonthlyBalance.period
+    
+    latest_periods = db.session.query(
+        MonthlyBalance.account_id.label('account_id'),
+        db.func.max(period_column).label('period')
+    ).join(BankAccount, MonthlyBalance.account_id == BankAccount.id).filter(
+        BankAccount.is_active.is_(True),
+        period_column <= target_period
+    ).group_by(MonthlyBalance.account_id).subquery()
+    
+    latest_balances = MonthlyBalance.query.join(
+        latest_periods,
+        db.and_(MonthlyBalance.account_id == latest_periods.c.account_id,
+                period_column == latest_periods.c.period)
+    ).all()
+    
+    rows = []
+    for balance in latest_balances:
+        carried = balance.closing_balance if balance.closing_balance is not None else balance.opening_balance
+        for period in range(to_period(balance.year, balance.month) + 1, target_period + 1):
+            year, month = from_period(period)
+            rows.append({
+                'account_id': balance.account_id,
+                'month': month,
+                'year': year,
+                'opening_balance': carried or 0.0,
+                'income': 0.0,
+                'expenses': 0.0,
+                'notes': 'Carried forward from previous month'
+            })
+    
+    if not rows:
+        return 0
+    
+    # Rows written since the read above (a concurrent rollover or save) win - only the rest are created
+    stmt = dialect_insert(MonthlyBalance).values(rows).on_conflict_do_nothing(
+        index_elements=MONTHLY_BALANCE_KEY
+    ).returning(MonthlyBalance.account_id, MonthlyBalance.period)
+    created = db.session.execute(stmt, execution_options={'ledger_scopes': ledger_scopes(rows)}).all()
+    refresh_month_aggregates((account_id, period) for account_id, period in created)
+    return len(created)
+
+@app.route('/rollover_month', methods=['POST'])
+def rollover_month():
+    """Create this month's opening balances from the previous closing balances (backfills gaps)"""
+    month = int(request.form.get('month') or datetime.now().month)
+    year = int(request.form.get('year') or datetime.now().year)
+    
+    created = rollover_balances(year, month)
+    db.session.commit()
+    
+    if created:
+        flash(f'Carried balances forward: created {created} monthly balance records up to {month}/{year}', 'success')
+    else:
+        flash(f'All accounts already have balances for {month}/{year}', 'info')
+    
+    return redirect(url_for('monthly_data', month=month, year=year))
+
+def parse_period_param(value):
+    """'YYYY-MM' query parameter to a period; raises ValueError"""
+    parsed = datetime.strptime(value, '%Y-%m')
+    return to_period(parsed.year, parsed.month)
+
+DASHBOARD_GRANULARITIES = {'month': 'M', 'quarter': 'Q', 'year': 'Y'}  # pandas period frequencies
+
+def resample_household_summary(start_period, end_period, granularity='month'):
+    """Household totals per month, quarter or year across a period range
+    
+    One range scan on HouseholdMonthlySummary (as integer cents), then a vectorized pandas
+    groupby on the calendar bucket: opening balance is the bucket's first entered month,
+    closing balance its last, income and expenses are summed.
+    """
+    rows = db.session.query(
+        HouseholdMonthlySummary.period,
+        cents(HouseholdMonthlySummary.opening_balance),
+        cents(HouseholdMonthlySummary.closing_balance),
+        cents(HouseholdMonthlySummary.income),
+        cents(HouseholdMonthlySummary.expenses)
+    ).filter(
+        HouseholdMonthlySummary.period.between(start_period, end_period),
+        HouseholdMonthlySummary.account_count > 0
     ).all()
     
-    # Remove all existing transactions (including fixed expenses) since closing balance already reflects actual payments
-    for transaction in existing_transactions:
-        db.session.delete(transaction)
+    columns = ['opening_balance', 'closing_balance', 'income', 'expenses']
+    frame = pd.DataFrame(rows, columns=['period'] + columns).set_index('period')
+    frame = frame.reindex(range(start_period, end_period + 1)).astype(float)
+    frame.index = pd.period_range(pd.Period(year=from_period(start_period)[0], month=from_period(start_period)[1], freq='M'),
+                                  periods=len(frame), freq='M')
+    frame[['income', 'expenses']] = frame[['income', 'expenses']].fillna(0)
+    
+    buckets = frame.groupby(frame.index.asfreq(DASHBOARD_GRANULARITIES[granularity]))
+    resampled = buckets.agg({'opening_balance': 'first', 'closing_balance': 'last',
+                             'income': 'sum', 'expenses': 'sum'}).fillna(0) / 100
+    resampled['net_worth'] = resampled['closing_balance'] - resampled['opening_balance']
+    
+    label = (lambda p: p.strftime('%Y-%m')) if granularity == 'month' else str
+    return [dict(month=label(bucket), **{column: round(float(value), 2) for column, value in values.items()})
+            for bucket, values in resampled.iterrows()]
+
+@app.route('/dashboard')
+def dashboard():
+    """Financial dashboard with charts and analytics
+    
+    Optional start/end (YYYY-MM) pick the range, granularity groups it by month, quarter or year.
+    Defaults to the last 12 months by month.
+    """
+    today = datetime.now()
+    default_end = to_period(today.year, today.month)
+    granularity = request.args.get('granularity', 'month')
+    if granularity not in DASHBOARD_GRANULARITIES:
+        granularity = 'month'
+    
+    try:
+        end_period = parse_period_param(request.args['end']) if request.args.get('end') else default_end
+        start_period = parse_period_param(request.args['start']) if request.args.get('start') else end_period - 11
+    except ValueError:
+        flash('Dashboard months must be given as YYYY-MM', 'error')
+        start_period, end_period = default_end - 11, default_end
+    
+    if end_period < start_period:
+        flash('The end month must not be before the start month', 'error')
+        start_period, end_period = default_end - 11, default_end
+    
+    months_data = resample_household_summary(start_period, end_period, granularity)
+    
+    # Create charts
+    range_label = f"{'%d-%02d' % from_period(start_period)} to {'%d-%02d' % from_period(end_period)}"
+    net_worth_chart = create_net_worth_chart(months_data, range_label)
+    income_expense_chart = create_income_expense_chart(months_data, range_label)
+    
+    return render_template('dashboard.html',
+                         months_data=months_data,
+                         net_worth_chart=net_worth_chart,
+                         income_expense_chart=income_expense_chart,
+                         start='%d-%02d' % from_period(start_period),
+                         end='%d-%02d' % from_period(end_period),
+                         granularity=granularity,
+                         granularities=list(DASHBOARD_GRANULARITIES))
+
+@app.route('/api/net_worth')
+def api_net_worth():
+    """Net worth from the NetWorthIndex
+    
+    ?as_of=YYYY-MM returns the household total and every account's signed balance that month;
+    ?start=YYYY-MM&end=YYYY-MM returns a monthly series. account_id narrows a series to one account.
+    """
+    today = datetime.now()
+    
+    try:
+        account_id = int(request.args.get('account_id', NET_WORTH_HOUSEHOLD))
+        if 'start' in request.args or 'end' in request.args:
+            end_period = parse_period_param(request.args.get('end') or f"{today.year}-{today.month:02d}")
+            start_period = parse_period_param(request.args['start']) if request.args.get('start') else end_period - 11
+        else:
+            as_of = parse_period_param(request.args.get('as_of') or f"{today.year}-{today.month:02d}")
+    except ValueError:
+        return jsonify({'success': False, 'error': 'Months must be given as YYYY-MM'}), 400
+    
+    if 'start' in request.args or 'end' in request.args:
+        if end_period < start_period:
+            return jsonify({'success': False, 'error': 'end must not be before start'}), 400
+        
+        series = net_worth_series(start_period, end_period, account_id)
+        return jsonify({
+            'success': True,
+            'account_id': account_id,
+            'series': [{'month': '%d-%02d' % from_period(period), 'net_worth': balance} for period, balance in series]
+        })
+    
+    # Accounts have a row for every month from their first balance to the horizon
+    horizon = db.session.query(db.func.max(NetWorthIndex.period)).scalar()
+    lookup_period = min(as_of, horizon) if horizon is not None else as_of
+    accounts = db.session.query(NetWorthIndex.account_id, BankAccount.name, NetWorthIndex.balance).join(
+        BankAccount, NetWorthIndex.account_id == BankAccount.id
+    ).filter(NetWorthIndex.period == lookup_period).order_by(NetWorthIndex.account_id).all()
+    
+    return jsonify({
+        'success': True,
+        'as_of': '%d-%02d' % from_period(as_of),
+        'net_worth': net_worth_as_of(as_of),
+        'accounts': [{'account_id': account_id, 'name': name, 'balance': balance}
+                     for account_id, name, balance in accounts]
+    })
+
+class LedgerCache:
+    """Per-process columnar copy of MonthlyTransaction and MonthlyBalance as pandas frames
+    
+    Each frame loads with one query on first use. Commits made through this process report the
+    (account_id, period) scopes they wrote and the next read reloads just those account-months;
+    bulk statements that can't say what they touched mark the whole frame stale. Writes from
+    other processes are picked up when a frame is older than LEDGER_CACHE_MAX_AGE seconds.
+    Money columns are int64 cents; frames are shared, callers must not modify them.
+    """
+    
+    SOURCES = {
+        'transactions': (MonthlyTransaction, ('id', 'account_id', 'period', 'transaction_type', 'category',
+                                              'amount', 'fixed_expense_id', 'source_account_id', 'is_summary')),
+        'balances': (MonthlyBalance, ('id', 'account_id', 'period', 'opening_balance', 'closing_balance',
+                                      'income', 'expenses')),
+    }
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._frames = {}
+        self._loaded_at = {}
+        self._pending = {name: set() for name in self.SOURCES}
+        self._stale = set()
+        self._versions = {name: 0 for name in self.SOURCES}  # Bumped whenever a frame's data is replaced
+        self._stats = {name: dict(full_loads=0, patches=0, rows_patched=0, last_load_ms=None, last_patch_ms=None)
+                       for name in self.SOURCES}
+    
+    def _query(self, name, scopes=None):
+        model, columns = self.SOURCES[name]
+        selected = [cents(getattr(model, column)) if isinstance(getattr(model, column).type, Money)
+                    else getattr(model, column) for column in columns]
+        frames = []
+        
+        if scopes is None:
+            frames.append(pd.DataFrame(db.session.query(*selected).all(), columns=columns))
+        else:
+            # Tuple IN keeps each chunk to one statement
+            scopes = sorted(scopes)
+            for start in range(0, len(scopes), 500):
+                rows = db.session.query(*selected).filter(
+                    db.tuple_(model.account_id, model.period).in_(scopes[start:start + 500])
+                ).all()
+                frames.append(pd.DataFrame(rows, columns=columns))
+        
+        frame = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        for column in columns:
+            if isinstance(getattr(model, column).type, (Money, db.Integer)):
+                nullable = getattr(model, column).nullable or frame[column].isna().any()
+                frame[column] = frame[column].astype('Int64' if nullable else 'int64')
+        return frame
+    
+    def invalidate(self, changes):
+        """Queue committed changes: {frame name: set of (account_id, period), or None for everything}"""
+        with self._lock:
+            for name, scopes in changes.items():
+                if scopes is None:
+                    self._stale.add(name)
+                else:
+                    self._pending[name] |= scopes
+    
+    def frame(self, name):
+        """The up-to-date frame, reloading pending scopes or the whole table first as needed"""
+        with self._lock:
+            stats = self._stats[name]
+            max_age = app.config['LEDGER_CACHE_MAX_AGE']
+            expired = name in self._loaded_at and time.monotonic() - self._loaded_at[name] > max_age
+            
+            if name not in self._frames or name in self._stale or expired:
+                started = time.perf_counter()
+                self._frames[name] = self._query(name)
+                self._loaded_at[name] = time.monotonic()
+                self._stale.discard(name)
+                self._pending[name] = set()
+                self._versions[name] += 1
+                stats['full_loads'] += 1
+                stats['last_load_ms'] = round((time.perf_counter() - started) * 1000, 2)
+            elif self._pending[name]:
+                started = time.perf_counter()
+                scopes, self._pending[name] = self._pending[name], set()
+                fresh = self._query(name, scopes)
+                frame = self._frames[name]
+                touched = pd.MultiIndex.from_arrays([frame['account_id'], frame['period']]).isin(list(scopes))
+                kept = frame[~touched]
+                self._frames[name] = pd.concat([kept, fresh], ignore_index=True) if len(fresh) else kept.reset_index(drop=True)
+                self._versions[name] += 1
+                stats['patches'] += 1
+                stats['rows_patched'] += len(fresh)
+                stats['last_patch_ms'] = round((time.perf_counter() - started) * 1000, 2)
+            
+            return self._frames[name]
+    
+    def versions(self, *names):
+        """Data versions of the named frames, brought up to date first - a cache key for results derived from them"""
+        for name in names:
+            self.frame(name)
+        with self._lock:
+            return tuple(self._versions[name] for name in names)
+    
+    def stats(self):
+        with self._lock:
+            now = time.monotonic()
+            return {name: dict(self._stats[name],
+                               loaded=name in self._frames,
+                               rows=len(self._frames[name]) if name in self._frames else 0,
+                               memory_bytes=int(self._frames[name].memory_usage(deep=True).sum()) if name in self._frames else 0,
+                               age_seconds=round(now - self._loaded_at[name], 1) if name in self._loaded_at else None,
+                               version=self._versions[name],
+                               pending_scopes=len(self._pending[name]),
+                               stale=name in self._stale)
+                    for name in self.SOURCES}
+
+ledger_cache = LedgerCache()
+LEDGER_FRAMES = {MonthlyTransaction: 'transactions', MonthlyBalance: 'balances'}
+
+def record_ledger_changes(session, name, scopes):
+    """Collect uncommitted ledger scopes on the session until it commits or rolls back"""
+    changes = session.info.setdefault('ledger_changes', {})
+    if scopes is None or changes.get(name, set()) is None:
+        changes[name] = None
+    else:
+        changes.setdefault(name, set()).update(scopes)
+
+@event.listens_for(Session, 'after_flush')
+def track_ledger_flush(session, flush_context):
+    for instance in list(session.new) + list(session.dirty) + list(session.deleted):
+        name = LEDGER_FRAMES.get(type(instance))
+        if name is None:
+            continue
+        state = db.inspect(instance)
+        if any(state.attrs[key].history.deleted for key in ('account_id', 'month', 'year')):
+            # Moved to another account-month, the old scope isn't known any more
+            record_ledger_changes(session, name, None)
+        else:
+            record_ledger_changes(session, name, {(instance.account_id, to_period(instance.year, instance.month))})
+
+@event.listens_for(Session, 'do_orm_execute')
+def track_ledger_statements(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    name = LEDGER_FRAMES.get(mapper.class_) if mapper is not None else None
+    if name is None:
+        return
+    
+    scopes = orm_execute_state.execution_options.get('ledger_scopes')
+    parameters = orm_execute_state.parameters
+    if scopes is None and orm_execute_state.is_insert and isinstance(parameters, list) and parameters:
+        # executemany insert, the rows are the parameters
+        scopes = ledger_scopes(parameters)
+    record_ledger_changes(orm_execute_state.session, name, set(scopes) if scopes is not None else None)
+
+@event.listens_for(Session, 'after_commit')
+def publish_ledger_changes(session):
+    changes = session.info.pop('ledger_changes', None)
+    if changes:
+        ledger_cache.invalidate(changes)
+
+@event.listens_for(Session, 'after_rollback')
+def discard_ledger_changes(session):
+    session.info.pop('ledger_changes', None)
+
+def analytics_period_range():
+    """start/end (YYYY-MM) query parameters as a period range, defaulting to the last 12 months; raises ValueError"""
+    today = datetime.now()
+    end_period = parse_period_param(request.args['end']) if request.args.get('end') else to_period(today.year, today.month)
+    start_period = parse_period_param(request.args['start']) if request.args.get('start') else end_period - 11
+    if end_period < start_period:
+        raise ValueError('end must not be before start')
+    return start_period, end_period
+
+@app.route('/api/ledger_cache')
+def api_ledger_cache():
+    """Size, age and refresh cost of the in-memory ledger frames"""
+    return jsonify({'success': True, 'frames': ledger_cache.stats()})
+
+@app.route('/api/analytics/categories')
+def api_analytics_categories():
+    """Category totals over a month range from the ledger cache, without summary or tracking rows
+    
+    ?start=YYYY-MM&end=YYYY-MM, transaction_type (default expense) and optional account_id.
+    """
+    try:
+        start_period, end_period = analytics_period_range()
+        account_id = int(request.args['account_id']) if request.args.get('account_id') else None
+    except ValueError as e:
+        return jsonify({'success': False, 'error': f'Invalid range: {e}'}), 400
+    
+    transaction_type = request.args.get('transaction_type', 'expense')
+    if transaction_type not in TRANSACTION_TYPES:
+        return jsonify({'success': False, 'error': f'Unknown transaction type: {transaction_type}'}), 400
+    
+    frame = ledger_cache.frame('transactions')
+    mask = (frame['period'].between(start_period, end_period).to_numpy()
+            & (frame['transaction_type'] == transaction_type).to_numpy() & category_spending_rows(frame))
+    if account_id is not None:
+        mask &= (frame['account_id'] == account_id).to_numpy()
+    selected = frame.loc[mask, ['category', 'amount']]
+    
+    grouped = selected.groupby(selected['category'].fillna('').replace('', 'Uncategorized'))['amount'].agg(['sum', 'count'])
+    grouped = grouped.sort_values('sum', ascending=False)
+    total = int(grouped['sum'].sum())
+    
+    return jsonify({
+        'success': True,
+        'start': '%d-%02d' % from_period(start_period),
+        'end': '%d-%02d' % from_period(end_period),
+        'transaction_type': transaction_type,
+        'total': from_cents(total),
+        'categories': [{'category': category, 'total': from_cents(amount), 'count': int(count),
+                        'share': round(amount / total, 4) if total else 0}
+                       for category, amount, count in grouped.itertuples()]
+    })
+
+@app.route('/api/analytics/kpis')
+def api_analytics_kpis():
+    """Household income, expense and savings figures over a month range from the ledger cache"""
+    try:
+        start_period, end_period = analytics_period_range()
+    except ValueError as e:
+        return jsonify({'success': False, 'error': f'Invalid range: {e}'}), 400
+    
+    balances = ledger_cache.frame('balances')
+    in_range = balances[balances['period'].between(start_period, end_period)]
+    monthly = in_range.groupby('period')[['income', 'expenses']].sum()
+    income, expenses = int(monthly['income'].sum()), int(monthly['expenses'].sum())
+    months = len(monthly)
+    
+    transactions = ledger_cache.frame('transactions')
+    spending = transactions.loc[transactions['period'].between(start_period, end_period).to_numpy()
+                                & (transactions['transaction_type'] == 'expense').to_numpy()
+                                & category_spending_rows(transactions)]
+    by_category = spending.groupby(spending['category'].fillna('').replace('', 'Uncategorized'))['amount'].sum()
+    
+    return jsonify({
+        'success': True,
+        'start': '%d-%02d' % from_period(start_period),
+        'end': '%d-%02d' % from_period(end_period),
+        'months': months,
+        'income': from_cents(income),
+        'expenses': from_cents(expenses),
+        'net': from_cents(income - expenses),
+        'savings_rate': round((income - expenses) / income, 4) if income else None,
+        'average_monthly_income': from_cents(income / months) if months else 0,
+        'average_monthly_expenses': from_cents(expenses / months) if months else 0,
+        'best_month': '%d-%02d' % from_period(int((monthly['income'] - monthly['expenses']).idxmax())) if months else None,
+        'top_expense_category': by_category.idxmax() if len(by_category) else None
+    })
+
+EXPENSE_TRANSACTION_TYPES = ('expense', 'misc_expense')
+
+def rolling_robust_scores(matrix, window, min_history):
+    """Robust z-scores of a months x series array against each series' previous `window` months
+    
+    Median and MAD come from one sliding-window view over every series at once. The scale is
+    1.4826 x MAD (normal-consistent), floored at 5% of the median and 100 cents so steady spending
+    doesn't divide by ~0. Returns (median, score) - NaN with fewer than min_history known months.
+    """
+    months, series = matrix.shape
+    padded = np.vstack([np.full((window, series), np.nan), matrix])
+    history = sliding_window_view(padded[:-1], window, axis=0)  # history[t] = the window months before t
+    
+    median = np.nanmedian(history, axis=-1)
+    mad = np.nanmedian(np.abs(history - median[..., None]), axis=-1)
+    scale = np.fmax(np.fmax(1.4826 * mad, 0.05 * np.abs(median)), 100)
+    score = (matrix - median) / scale
+    
+    thin = (~np.isnan(history)).sum(axis=-1) < min_history
+    median[thin] = np.nan
+    score[thin] = np.nan
+    return median, score
+
+@lru_cache(maxsize=32)
+def cached_spending_anomalies(versions, start_period, end_period, window, threshold):
+    """Months between start and end whose account or category spending scores above threshold
+    
+    Keyed on the ledger cache versions, so results are reused until new data arrives. Returns a
+    shared list - callers copy the entries before changing them.
+    """
+    first_period = start_period - window
+    periods = np.arange(first_period, end_period + 1)
+    anomalies = []
+    
+    # Accounts: MonthlyBalance.expenses (monthly spend on debt accounts), unknown where no balance was entered
+    balances = ledger_cache.frame('balances')
+    balances = balances[balances['period'].between(first_period, end_period)]
+    by_account = balances.pivot_table(index='period', columns='account_id', values='expenses', aggfunc='sum')
+    by_account = by_account.reindex(periods).astype(float)
+    
+    # Categories: household expense transactions, zero in months without any once a category has appeared
+    transactions = ledger_cache.frame('transactions')
+    spending = transactions.loc[transactions['transaction_type'].isin(EXPENSE_TRANSACTION_TYPES).to_numpy()
+                                & category_spending_rows(transactions)]
+    categories = spending['category'].fillna('').str.strip().replace('', UNCATEGORIZED['expense'])
+    first_seen = spending['period'].groupby(categories).min()
+    in_range = spending['period'].between(first_period, end_period).to_numpy()
+    by_category = spending.loc[in_range].pivot_table(index='period', columns=categories[in_range], values='amount', aggfunc='sum')
+    by_category = by_category.reindex(index=periods, columns=first_seen.index).astype(float).fillna(0)
+    by_category = by_category.mask(periods[:, None] < first_seen.to_numpy()[None, :])
+    
+    for kind, table in (('account', by_account), ('category', by_category)):
+        if table.shape[1] == 0:
+            continue
+        matrix = table.to_numpy()
+        median, score = rolling_robust_scores(matrix, window, max(3, window // 2))
+        flagged = np.argwhere((score >= threshold) & (periods >= start_period)[:, None])
+        for row, column in flagged:
+            label = table.columns[column]
+            anomalies.append({
+                'kind': kind,
+                **({'category': label} if kind == 'category' else {'account_id': int(label)}),
+                'month': '%d-%02d' % from_period(int(periods[row])),
+                'amount': from_cents(matrix[row, column]),
+                'typical': from_cents(median[row, column]),
+                'ratio': round(float(matrix[row, column] / median[row, column]), 2) if median[row, column] > 0 else None,
+                'score': round(float(score[row, column]), 2)
+            })
+    
+    return sorted(anomalies, key=lambda anomaly: anomaly['score'], reverse=True)
+
+@app.route('/api/analytics/anomalies')
+def api_spending_anomalies():
+    """Account and category months with spending far above their own recent history
     
-    # Create income transaction if income > 0
-    if income > 0:
-        income_transaction = MonthlyTransaction(
-            account_id=account_id,
-            month=month,
-            year=year,
-            transaction_type='income',
-            amount=income,
-            description=f'Total income for {account.name}',
-            category='Income'
+    ?start=YYYY-MM&end=YYYY-MM (default the last 12 months), window months of history (default 12)
+    and threshold on the robust z-score (default 3.5).
+    """
+    try:
+        start_period, end_period = analytics_period_range()
+        window = int(request.args.get('window', 12))
+        threshold = float(request.args.get('threshold', 3.5))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': f'Invalid parameters: {e}'}), 400
+    
+    if not 3 <= window <= 36 or threshold <= 0:
+        return jsonify({'success': False, 'error': 'window must be 3-36 months and threshold positive'}), 400
+    
+    versions = ledger_cache.versions('transactions', 'balances')
+    anomalies = cached_spending_anomalies(versions, start_period, end_period, window, threshold)
+    
+    names = dict(db.session.query(BankAccount.id, BankAccount.name).filter(
+        BankAccount.id.in_({anomaly['account_id'] for anomaly in anomalies if anomaly['kind'] == 'account'})
+    ).all())
+    
+    return jsonify({
+        'success': True,
+        'start': '%d-%02d' % from_period(start_period),
+        'end': '%d-%02d' % from_period(end_period),
+        'window': window,
+        'threshold': threshold,
+        'anomalies': [dict(anomaly, name=names.get(anomaly['account_id'])) if anomaly['kind'] == 'account' else dict(anomaly)
+                      for anomaly in anomalies]
+    })
+
+ANALYTICS_TABLES = {'monthly_transaction': MonthlyTransaction, 'monthly_balance': MonthlyBalance, 'bank_account': BankAccount}
+analytics_connections = threading.local()
+
+def duckdb_literal(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+def analytics_connection():
+    """This thread's DuckDB connection with the ledger tables in its 'ledger' schema
+    
+    Attaches the app database read-only (SQLite, or Postgres through DuckDB's postgres extension),
+    or, when ANALYTICS_PARQUET_DIR is set, maps the Parquet snapshot written by
+    export_parquet_snapshot() as views. Money columns are integer cents in both.
+    """
+    parquet_dir = app.config['ANALYTICS_PARQUET_DIR']
+    source = parquet_dir or db.engine.url.render_as_string(hide_password=False)
+    if getattr(analytics_connections, 'source', None) == source:
+        if analytics_connections.error is not None:
+            # Don't retry attaching (and extension downloads) on every request
+            raise analytics_connections.error
+        return analytics_connections.connection
+    
+    connection = duckdb.connect()
+    try:
+        if parquet_dir:
+            connection.execute('CREATE SCHEMA ledger')
+            for table in ANALYTICS_TABLES:
+                path = os.path.join(parquet_dir, f'{table}.parquet')
+                connection.execute(f'CREATE VIEW ledger.{table} AS SELECT * FROM read_parquet({duckdb_literal(path)})')
+        elif db.engine.dialect.name == 'sqlite':
+            connection.execute(f'ATTACH {duckdb_literal(db.engine.url.database)} AS ledger (TYPE sqlite, READ_ONLY)')
+        else:
+            dsn = db.engine.url.set(drivername='postgresql').render_as_string(hide_password=False)
+            connection.execute(f'ATTACH {duckdb_literal(dsn)} AS ledger (TYPE postgres, READ_ONLY)')
+    except duckdb.Error as e:
+        connection.close()
+        analytics_connections.connection, analytics_connections.source, analytics_connections.error = None, source, e
+        raise
+    
+    analytics_connections.connection, analytics_connections.source, analytics_connections.error = connection, source, None
+    return connection
+
+def export_parquet_snapshot(directory):
+    """Write the ledger tables to <directory>/<table>.parquet for ANALYTICS_PARQUET_DIR; returns row counts"""
+    os.makedirs(directory, exist_ok=True)
+    connection = duckdb.connect()
+    counts = {}
+    try:
+        for table, model in ANALYTICS_TABLES.items():
+            columns = [column for column in model.__table__.columns if column.computed is None]
+            frame = pd.DataFrame(db.session.execute(db.select(*[db.type_coerce(column, column.type.impl)
+                                                              if isinstance(column.type, Money) else column
+                                                              for column in columns])).all(),
+                                 columns=[column.name for column in columns])
+            connection.register('snapshot', frame)
+            path = os.path.join(directory, f'{table}.parquet')
+            connection.execute(f'COPY snapshot TO {duckdb_literal(path)} (FORMAT parquet)')
+            connection.unregister('snapshot')
+            counts[table] = len(frame)
+    finally:
+        connection.close()
+    return counts
+
+def category_spend_duckdb(start_year, end_year, transaction_type='expense'):
+    rows = analytics_connection().execute("""
+        SELECT year, COALESCE(NULLIF(category, ''), 'Uncategorized') AS category,
+               SUM(amount) AS total, COUNT(*) AS count
+        FROM ledger.monthly_transaction
+        WHERE transaction_type = ? AND year BETWEEN ? AND ?
+          AND NOT is_summary AND fixed_expense_id IS NULL AND source_account_id IS NULL
+        GROUP BY ALL
+        ORDER BY year, total DESC, category
+    """, [transaction_type, start_year, end_year]).fetchall()
+    return [{'year': year, 'category': category, 'total': from_cents(total), 'count': count}
+            for year, category, total, count in rows]
+
+def category_spend_orm(start_year, end_year, transaction_type='expense'):
+    category = db.func.coalesce(db.func.nullif(MonthlyTransaction.category, ''), 'Uncategorized')
+    total = db.func.sum(cents(MonthlyTransaction.amount))
+    rows = db.session.query(MonthlyTransaction.year, category, total, db.func.count(MonthlyTransaction.id)).filter(
+        MonthlyTransaction.transaction_type == transaction_type,
+        MonthlyTransaction.year.between(start_year, end_year),
+        category_spending_filter()
+    ).group_by(MonthlyTransaction.year, category).order_by(MonthlyTransaction.year, total.desc(), category).all()
+    return [{'year': year, 'category': category, 'total': from_cents(total), 'count': count}
+            for year, category, total, count in rows]
+
+def account_trends_duckdb(start_period, end_period, account_id=None):
+    rows = analytics_connection().execute("""
+        WITH monthly AS (
+            SELECT b.account_id, a.name, b.year * 12 + b.month - 1 AS period,
+                   COALESCE(b.closing_balance, b.opening_balance, 0) AS balance, b.income, b.expenses
+            FROM ledger.monthly_balance b JOIN ledger.bank_account a ON a.id = b.account_id
+            WHERE b.year * 12 + b.month - 1 BETWEEN ? AND ? AND (? IS NULL OR b.account_id = ?)
         )
-        db.session.add(income_transaction)
+        SELECT account_id, name, period, balance, income, expenses,
+               balance - LAG(balance) OVER account_months AS change,
+               AVG(expenses) OVER (account_months ROWS 2 PRECEDING) AS average_expenses
+        FROM monthly
+        WINDOW account_months AS (PARTITION BY account_id ORDER BY period)
+        ORDER BY account_id, period
+    """, [start_period, end_period, account_id, account_id]).fetchall()
+    return [account_trend_entry(*row) for row in rows]
+
+def account_trends_orm(start_period, end_period, account_id=None):
+    query = db.session.query(
+        MonthlyBalance.account_id, BankAccount.name, MonthlyBalance.period,
+        cents(known_balance_sql()),
+        cents(MonthlyBalance.income), cents(MonthlyBalance.expenses)
+    ).join(BankAccount, MonthlyBalance.account_id == BankAccount.id).filter(
+        MonthlyBalance.period.between(start_period, end_period)
+    )
+    if account_id is not None:
+        query = query.filter(MonthlyBalance.account_id == account_id)
+    
+    entries, previous, recent_expenses = [], None, []
+    for row_account_id, name, period, balance, income, expenses in query.order_by(MonthlyBalance.account_id, MonthlyBalance.period):
+        if previous is None or previous[0] != row_account_id:
+            previous, recent_expenses = None, []
+        recent_expenses = (recent_expenses + [expenses])[-3:]
+        entries.append(account_trend_entry(row_account_id, name, period, balance, income, expenses,
+                                           balance - previous[1] if previous else None,
+                                           sum(recent_expenses) / len(recent_expenses)))
+        previous = (row_account_id, balance)
+    return entries
+
+def account_trend_entry(account_id, name, period, balance, income, expenses, change, average_expenses):
+    return {'account_id': account_id, 'name': name, 'month': '%d-%02d' % from_period(period),
+            'balance': from_cents(balance), 'income': from_cents(income), 'expenses': from_cents(expenses),
+            'change': from_cents(change) if change is not None else None,
+            'average_expenses': from_cents(average_expenses)}
+
+ANALYTICS_REPORTS = {
+    'category_spend': (category_spend_duckdb, category_spend_orm),
+    'account_trends': (account_trends_duckdb, account_trends_orm),
+}
+
+def run_analytics_report(name, **params):
+    """Run a report on DuckDB when it's installed and enabled, otherwise on the ORM; returns (rows, backend)"""
+    duckdb_report, orm_report = ANALYTICS_REPORTS[name]
+    if duckdb is not None and app.config['ANALYTICS_BACKEND'] == 'duckdb':
+        try:
+            return duckdb_report(**params), 'duckdb'
+        except duckdb.Error as e:
+            app.logger.warning('DuckDB analytics unavailable, falling back to the ORM: %s', e)
+    return orm_report(**params), 'orm'
+
+@app.route('/api/reports/category_spend')
+def api_report_category_spend():
+    """Spend (or any transaction type) by category per year, ?start_year=&end_year=&transaction_type="""
+    today = datetime.now()
+    try:
+        end_year = int(request.args.get('end_year', today.year))
+        start_year = int(request.args.get('start_year', end_year - 4))
+    except ValueError:
+        return jsonify({'success': False, 'error': 'start_year and end_year must be numbers'}), 400
+    
+    transaction_type = request.args.get('transaction_type', 'expense')
+    if transaction_type not in TRANSACTION_TYPES:
+        return jsonify({'success': False, 'error': f'Unknown transaction type: {transaction_type}'}), 400
+    
+    rows, backend = run_analytics_report('category_spend', start_year=start_year, end_year=end_year,
+                                         transaction_type=transaction_type)
+    return jsonify({'success': True, 'backend': backend, 'start_year': start_year, 'end_year': end_year,
+                    'transaction_type': transaction_type, 'rows': rows})
+
+@app.route('/api/reports/account_trends')
+def api_report_account_trends():
+    """Per-account monthly balance, change and 3-month average expenses, ?start=YYYY-MM&end=YYYY-MM&account_id="""
+    try:
+        start_period, end_period = analytics_period_range()
+        account_id = int(request.args['account_id']) if request.args.get('account_id') else None
+    except ValueError as e:
+        return jsonify({'success': False, 'error': f'Invalid range: {e}'}), 400
+    
+    rows, backend = run_analytics_report('account_trends', start_period=start_period, end_period=end_period,
+                                         account_id=account_id)
+    return jsonify({'success': True, 'backend': backend, 'start': '%d-%02d' % from_period(start_period),
+                    'end': '%d-%02d' % from_period(end_period), 'rows': rows})
+
+@app.route('/api/category_pivot')
+def api_category_pivot():
+    """Categories x months from MonthlyCategory in one grouped query
     
-    # Create total expense transaction (no need to break down by fixed vs non-fixed)
-    # The closing balance already reflects all actual payments
-    if calculated_expenses > 0:
-        expense_transaction = MonthlyTransaction(
-            account_id=account_id,
-            month=month,
-            year=year,
-            transaction_type='expense',
-            amount=calculated_expenses,
-            description=f'Total expenses for {account.name}',
-            category='Total Expenses'
-        )
-        db.session.add(expense_transaction)
-    elif calculated_expenses < 0:
-        # If negative, it means there was a net gain (more income than expenses)
-        misc_income_transaction = MonthlyTransaction(
-            account_id=account_id,
-            month=month,
-            year=year,
-            transaction_type='misc_income',
-            amount=abs(calculated_expenses),
-            description=f'Net gain for {account.name}',
-            category='Miscellaneous'
-        )
-        db.session.add(misc_income_transaction)
+    ?start=YYYY-MM&end=YYYY-MM, category_type (expense or income, default expense) and optional account_id.
+    """
+    try:
+        start_period, end_period = analytics_period_range()
+        account_id = int(request.args['account_id']) if request.args.get('account_id') else None
+    except ValueError as e:
+        return jsonify({'success': False, 'error': f'Invalid range: {e}'}), 400
+    
+    category_type = request.args.get('category_type', 'expense')
+    if category_type not in UNCATEGORIZED:
+        return jsonify({'success': False, 'error': f'Unknown category type: {category_type}'}), 400
+    
+    query = db.session.query(
+        Category.name, MonthlyBalance.period, db.func.sum(cents(MonthlyCategory.amount))
+    ).join(MonthlyCategory.monthly_balance).join(MonthlyCategory.category).filter(
+        Category.category_type == category_type,
+        MonthlyBalance.period.between(start_period, end_period)
+    )
+    if account_id is not None:
+        query = query.filter(MonthlyBalance.account_id == account_id)
+    rows = query.group_by(Category.name, MonthlyBalance.period).all()
+    
+    periods = list(range(start_period, end_period + 1))
+    pivot = pd.DataFrame(rows, columns=['category', 'period', 'amount']).pivot(
+        index='category', columns='period', values='amount'
+    ).reindex(columns=periods).fillna(0).astype('int64')
+    pivot = pivot.loc[pivot.sum(axis=1).sort_values(ascending=False).index]
+    
+    return jsonify({
+        'success': True,
+        'category_type': category_type,
+        'months': ['%d-%02d' % from_period(period) for period in periods],
+        'categories': [{'category': category, 'values': [from_cents(value) for value in values], 'total': from_cents(values.sum())}
+                       for category, values in zip(pivot.index, pivot.to_numpy())],
+        'month_totals': [from_cents(value) for value in pivot.sum(axis=0)]
+    })
+
+def search_tokens(text_query):
+    """Words of a search box query, lower-cased; punctuation is dropped so nothing reaches the match syntax"""
+    return re.findall(r'\w+', text_query.lower())
+
+def transaction_search_query(tokens):
+    """MonthlyTransaction query matching every token as a word prefix in the description or category
+    
+    Uses the FTS5 table on SQLite and the tsvector GIN index on Postgres (see TRANSACTION_SEARCH_DDL),
+    falling back to ILIKE scans on other databases. Returns (query, key) - order and paginate on key,
+    on SQLite the FTS rowid lets FTS5 walk its index in id order instead of sorting every match.
+    """
+    query = db.session.query(MonthlyTransaction)
+    dialect = db.engine.dialect.name
+    
+    if dialect == 'sqlite':
+        match = ' '.join(f'"{token}"*' for token in tokens)
+        return query.join(transaction_search_fts, transaction_search_fts.c.rowid == MonthlyTransaction.id).filter(
+            db.text('monthly_transaction_fts MATCH :match').bindparams(match=match)
+        ), transaction_search_fts.c.rowid
+    if dialect == 'postgresql':
+        match = ' & '.join(f'{token}:*' for token in tokens)
+        return query.filter(
+            db.text("monthly_transaction.search_vector @@ to_tsquery('simple', :match)").bindparams(match=match)
+        ), MonthlyTransaction.id
+    
+    for token in tokens:
+        query = query.filter(db.or_(MonthlyTransaction.description.ilike(f'%{token}%'),
+                                    MonthlyTransaction.category.ilike(f'%{token}%')))
+    return query, MonthlyTransaction.id
+
+@app.route('/api/transactions/search')
+def api_search_transactions():
+    """Full-text search over transaction descriptions and categories, newest first
     
-    db.session.commit()
+    ?q=netflix with optional account_id, start/end (YYYY-MM) and limit. Keyset paginated:
+    pass the response's next_after back as after for the next page.
+    """
+    tokens = search_tokens(request.args.get('q', ''))
+    if not tokens:
+        return jsonify({'success': False, 'error': 'q must contain at least one word'}), 400
     
-    flash(f'Account updated. Total expenses: €{calculated_expenses:.2f}', 'success')
-    return redirect(url_for('monthly_data', month=month, year=year))
+    try:
+        limit = min(max(int(request.args.get('limit', 50)), 1), 200)
+        after = int(request.args['after']) if request.args.get('after') else None
+        account_id = int(request.args['account_id']) if request.args.get('account_id') else None
+        start_period = parse_period_param(request.args['start']) if request.args.get('start') else None
+        end_period = parse_period_param(request.args['end']) if request.args.get('end') else None
+    except ValueError:
+        return jsonify({'success': False, 'error': 'Invalid limit, after, account_id or month (YYYY-MM)'}), 400
+    
+    query, key = transaction_search_query(tokens)
+    if after is not None:
+        query = query.filter(key < after)
+    if account_id is not None:
+        query = query.filter(MonthlyTransaction.account_id == account_id)
+    if start_period is not None:
+        query = query.filter(MonthlyTransaction.period >= start_period)
+    if end_period is not None:
+        query = query.filter(MonthlyTransaction.period <= end_period)
+    
+    # One extra row tells whether there is a next page
+    transactions = query.order_by(key.desc()).limit(limit + 1).all()
+    has_more = len(transactions) > limit
+    transactions = transactions[:limit]
+    
+    return jsonify({
+        'success': True,
+        'query': ' '.join(tokens),
+        'results': [{
+            'id': transaction.id,
+            'account_id': transaction.account_id,
+            'month': transaction.month,
+            'year': transaction.year,
+            'transaction_type': transaction.transaction_type,
+            'amount': transaction.amount,
+            'description': transaction.description,
+            'category': transaction.category
+        } for transaction in transactions],
+        'next_after': transactions[-1].id if has_more else None
+    })
 
-@app.route('/dashboard')
-def dashboard():
-    """Financial dashboard with charts and analytics"""
-    current_month = datetime.now().month
-    current_year = datetime.now().year
-    
-    # Get last 12 months data
-    months_data = []
-    for i in range(12):
-        date = datetime.now() - timedelta(days=30*i)
-        month = date.month
-        year = date.year
+FORECAST_MIN_MONTHS = 6  # Months of history before a series is forecast
+FORECAST_SEASONAL_MONTHS = 24  # Months of history before month-of-year effects are fitted
+FORECAST_MEASURES = ('income', 'expenses')
+
+class ForecastModels:
+    """Trend plus month-of-year seasonality for every account's and the household's monthly income and expenses
+    
+    All series share one design matrix (intercept, trend in years, 11 month dummies) over a common
+    month grid; months a series has no balance for get zero weight and every series' normal
+    equations are solved in one batched np.linalg.solve. Series shorter than FORECAST_SEASONAL_MONTHS,
+    or all of them for model='trend', get their seasonal terms penalized away. Household series use
+    account_id NET_WORTH_HOUSEHOLD and sum regular accounts only - debt account spending and payments
+    already show up in the paying accounts' expenses. Build through fitted_forecast_models(), which
+    caches by data version.
+    """
+    
+    TREND_ONLY_PENALTY = 1e12
+    
+    def __init__(self, balances, debt_account_ids=()):
+        per_account = balances.pivot_table(index='period', columns='account_id', values=list(FORECAST_MEASURES), aggfunc='sum')
+        regular = balances[~balances['account_id'].isin(list(debt_account_ids)).to_numpy()]
+        household = regular.groupby('period')[list(FORECAST_MEASURES)].sum()
+        household.columns = pd.MultiIndex.from_product([household.columns, [NET_WORTH_HOUSEHOLD]])
         
-        monthly_balances = MonthlyBalance.query.filter_by(month=month, year=year).all()
+        table = pd.concat([per_account, household], axis=1)
+        if table.empty:
+            self.periods, self.series, self.history = np.arange(0), [], np.empty((0, 0))
+            self.observed, self.coefficients, self.sigma = np.empty(0), {}, {}
+            return
         
-        total_opening = sum([bal.opening_balance for bal in monthly_balances])
-        total_closing = sum([bal.closing_balance or bal.opening_balance for bal in monthly_balances])
-        total_income = sum([bal.income for bal in monthly_balances])
-        total_expenses = sum([bal.expenses for bal in monthly_balances])
+        self.periods = np.arange(table.index.min(), table.index.max() + 1)
+        table = table.reindex(self.periods).astype(float)
+        self.series = [(int(account_id), measure) for measure, account_id in table.columns]
+        self.history = table.to_numpy()
         
-        months_data.append({
-            'month': f"{year}-{month:02d}",
-            'opening_balance': total_opening,
-            'closing_balance': total_closing,
-            'income': total_income,
-            'expenses': total_expenses,
-            'net_worth': total_closing - total_opening
-        })
+        weights = ~np.isnan(self.history)
+        self.observed = weights.sum(axis=0)
+        design = self.design(self.periods)
+        values = np.nan_to_num(self.history)
+        
+        # Per-series weighted normal equations, stacked: (series, terms, terms) and (series, terms)
+        gram = np.einsum('tp,ts,tq->spq', design, weights.astype(float), design)
+        moments = np.einsum('tp,ts->sp', design, values)
+        
+        self.coefficients, self.sigma = {}, {}
+        for model in ('seasonal', 'trend'):
+            seasonal = (self.observed >= FORECAST_SEASONAL_MONTHS) if model == 'seasonal' else np.zeros(len(self.series), bool)
+            # A tiny ridge keeps months never observed solvable; the trend-only penalty zeroes the seasonal terms
+            penalty = 1e-6 + np.where(seasonal, 0, self.TREND_ONLY_PENALTY)[:, None] * np.r_[0, 0, np.ones(11)]
+            coefficients = np.linalg.solve(gram + penalty[:, :, None] * np.eye(design.shape[1]), moments[:, :, None])[:, :, 0]
+            
+            residuals = np.where(weights, self.history - design @ coefficients.T, 0)
+            terms = np.where(seasonal, design.shape[1], 2)
+            self.coefficients[model] = coefficients
+            self.sigma[model] = np.sqrt((residuals ** 2).sum(axis=0) / np.maximum(self.observed - terms, 1))
+    
+    @staticmethod
+    def design(periods):
+        months = periods % 12  # 0 = January
+        return np.column_stack([np.ones(len(periods)), (periods - periods[0]) / 12,
+                                months[:, None] == np.arange(1, 12)[None, :]]).astype(float)
+    
+    def forecast(self, account_id, horizon=6, model='seasonal'):
+        """History and forecast (with a ~95% band) of one account's or the household's income and expenses
+        
+        Returns None when the series has fewer than FORECAST_MIN_MONTHS months of history.
+        """
+        columns = {measure: self.series.index((account_id, measure)) for measure in FORECAST_MEASURES
+                   if (account_id, measure) in self.series}
+        if not columns or min(self.observed[column] for column in columns.values()) < FORECAST_MIN_MONTHS:
+            return None
+        
+        grid = np.arange(self.periods[0], self.periods[-1] + horizon + 1)
+        future = self.design(grid)[len(self.periods):]
+        result = {'history': [], 'forecast': []}
+        
+        # History starts at the account's first balance, not the household's
+        first = int(np.argmax(~np.isnan(self.history[:, list(columns.values())]).any(axis=1)))
+        for index, period in enumerate(self.periods[first:], start=first):
+            entry = {'month': '%d-%02d' % from_period(int(period))}
+            for measure, column in columns.items():
+                value = self.history[index, column]
+                entry[measure] = None if np.isnan(value) else from_cents(value)
+            result['history'].append(entry)
+        
+        predictions = {measure: future @ self.coefficients[model][column] for measure, column in columns.items()}
+        for step, period in enumerate(grid[len(self.periods):]):
+            entry = {'month': '%d-%02d' % from_period(int(period))}
+            for measure, column in columns.items():
+                band = 1.96 * self.sigma[model][column]
+                value = max(predictions[measure][step], 0)
+                entry[measure] = from_cents(value)
+                entry[f'{measure}_low'] = from_cents(max(value - band, 0))
+                entry[f'{measure}_high'] = from_cents(value + band)
+            result['forecast'].append(entry)
+        
+        result['seasonal'] = bool(model == 'seasonal' and min(self.observed[column] for column in columns.values()) >= FORECAST_SEASONAL_MONTHS)
+        return result
+
+@lru_cache(maxsize=2)
+def fitted_forecast_models(version, debt_account_ids):
+    """ForecastModels for the balances ledger at a data version (see LedgerCache.versions)"""
+    return ForecastModels(ledger_cache.frame('balances'), debt_account_ids)
+
+def current_forecast_models():
+    """fitted_forecast_models for the current balances and debt accounts"""
+    debt_account_ids = frozenset(account_id for (account_id,) in
+                                 db.session.query(BankAccount.id).filter(BankAccount.is_debt.is_(True)))
+    return fitted_forecast_models(ledger_cache.versions('balances'), debt_account_ids)
+
+def forecast_request_params():
+    """account_id, horizon and model query parameters; raises ValueError"""
+    account_id = int(request.args.get('account_id', NET_WORTH_HOUSEHOLD))
+    horizon = int(request.args.get('horizon', 6))
+    model = request.args.get('model', 'seasonal')
+    if not 1 <= horizon <= 36 or model not in ('seasonal', 'trend'):
+        raise ValueError('horizon must be 1-36 months and model seasonal or trend')
+    return account_id, horizon, model
+
+@app.route('/forecast')
+def forecast():
+    """Income and expense forecast for the household or one account (?account_id=, horizon=, model=)"""
+    try:
+        account_id, horizon, model = forecast_request_params()
+    except ValueError as e:
+        flash(str(e), 'error')
+        account_id, horizon, model = NET_WORTH_HOUSEHOLD, 6, 'seasonal'
+    
+    models = current_forecast_models()
+    result = models.forecast(account_id, horizon, model)
+    accounts = BankAccount.query.filter_by(is_active=True).order_by(BankAccount.name).all()
+    history_months = int(models.observed[models.series.index((account_id, 'expenses'))]) \
+        if (account_id, 'expenses') in models.series else 0
+    
+    error = None
+    forecast_chart = None
+    if result is None:
+        error = f'At least {FORECAST_MIN_MONTHS} months of balances are needed to forecast (found {history_months}).'
+    else:
+        name = 'Household' if account_id == NET_WORTH_HOUSEHOLD else \
+            next((account.name for account in accounts if account.id == account_id), f'Account {account_id}')
+        forecast_chart = create_forecast_chart(result, f'{name} - {"Trend + Seasonality" if result["seasonal"] else "Linear Trend"}')
+    
+    return render_template('forecast.html',
+                         error=error,
+                         forecast_chart=forecast_chart,
+                         forecast=result,
+                         accounts=accounts,
+                         account_id=account_id,
+                         horizon=horizon,
+                         model=model,
+                         history_months=history_months,
+                         seasonal_months=FORECAST_SEASONAL_MONTHS)
+
+@app.route('/api/forecast')
+def api_forecast():
+    """Forecast series as JSON, ?account_id= (default household), horizon= (months) and model=seasonal|trend"""
+    try:
+        account_id, horizon, model = forecast_request_params()
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     
-    months_data.reverse()  # Show oldest to newest
+    result = current_forecast_models().forecast(account_id, horizon, model)
+    if result is None:
+        return jsonify({'success': False, 'error': f'At least {FORECAST_MIN_MONTHS} months of balances are needed'}), 400
     
-    # Create charts
-    months = [data['month'] for data in months_data]
-    net_worth_chart = create_net_worth_chart(months_data)
-    income_expense_chart = create_income_expense_chart(months_data)
+    return jsonify(dict(result, success=True, account_id=account_id, model=model))
+
+def fixed_expense_totals(start_year, start_month, months=12):
+    """Fixed expense totals, monthly equivalent and a due-per-month projection for the next months
+    
+    The per-frequency totals are one SUM(CASE ...) aggregate over active expenses whose
+    start/end window covers today. The projection and monthly equivalent come from
+    FixedExpenseCalendar, fed only the expenses active at some point in the projected months.
+    """
+    today = datetime.now().date()
+    frequency = db.func.coalesce(db.func.lower(FixedExpense.frequency), 'monthly')
+    
+    def total_for(name):
+        return db.func.coalesce(db.func.sum(db.case((frequency == name, cents(FixedExpense.amount)), else_=0)), 0)
+    
+    total_monthly, total_quarterly, total_yearly = db.session.query(
+        total_for('monthly'), total_for('quarterly'), total_for('yearly')
+    ).filter(
+        FixedExpense.is_active.is_(True),
+        FixedExpense.start_date <= today,
+        db.or_(FixedExpense.end_date.is_(None), FixedExpense.end_date >= today)
+    ).one()
+    
+    first_period = to_period(start_year, start_month)
+    end_year, end_month = from_period(first_period + months - 1)
+    after_year, after_month = from_period(first_period + months)
+    expenses = db.session.query(
+        FixedExpense.id, FixedExpense.amount, FixedExpense.frequency, FixedExpense.start_date, FixedExpense.end_date
+    ).filter(
+        FixedExpense.is_active.is_(True),
+        FixedExpense.start_date < datetime(after_year, after_month, 1).date(),
+        db.or_(FixedExpense.end_date.is_(None), FixedExpense.end_date >= datetime(start_year, start_month, 1).date())
+    ).all()
+    calendar = FixedExpenseCalendar.for_range(start_year, start_month, end_year, end_month, expenses=expenses)
     
-    return render_template('dashboard.html',
-                         months_data=months_data,
-                         net_worth_chart=net_worth_chart,
-                         income_expense_chart=income_expense_chart)
+    upcoming_due = []
+    for period in range(first_period, first_period + months):
+        year, month = from_period(period)
+        upcoming_due.append({
+            'month': f"{year}-{month:02d}",
+            'total': calendar.total_due(year, month),
+            'count': len(calendar.due_in(year, month))
+        })
+    
+    return {
+        'total_monthly': from_cents(total_monthly),
+        'total_quarterly': from_cents(total_quarterly),
+        'total_yearly': from_cents(total_yearly),
+        'monthly_equivalent': calendar.average_monthly_total(),
+        'upcoming_due': upcoming_due
+    }
 
 @app.route('/fixed_expenses')
 def fixed_expenses():
     """Fixed expenses management page"""
-    active_expenses = FixedExpense.query.filter_by(is_active=True).all()
-    inactive_expenses = FixedExpense.query.filter_by(is_active=False).all()
-    
-    # Calculate total monthly fixed expenses
-    total_monthly = sum([exp.amount for exp in active_expenses if exp.frequency == 'monthly'])
-    total_yearly = sum([exp.amount for exp in active_expenses if exp.frequency == 'yearly'])
-    total_quarterly = sum([exp.amount for exp in active_expenses if exp.frequency == 'quarterly'])
-    
-    # Convert to monthly equivalent
-    monthly_equivalent = total_monthly + (total_yearly / 12) + (total_quarterly / 3)
+    per_page = app.config['FIXED_EXPENSES_PER_PAGE']
+    page = request.args.get('page', 1, type=int)
+    inactive_page = request.args.get('inactive_page', 1, type=int)
+    
+    # Only the visible page of each list is loaded
+    active_pagination = FixedExpense.query.filter_by(is_active=True).order_by(
+        FixedExpense.name, FixedExpense.id
+    ).paginate(page=page, per_page=per_page, error_out=False)
+    inactive_pagination = FixedExpense.query.filter_by(is_active=False).order_by(
+        FixedExpense.name, FixedExpense.id
+    ).paginate(page=inactive_page, per_page=per_page, error_out=False)
+    
+    # Totals, monthly equivalent and 12-month projection without loading every expense
+    today = datetime.now()
+    totals = fixed_expense_totals(today.year, today.month)
     
     return render_template('fixed_expenses.html', 
-                         active_expenses=active_expenses,
-                         inactive_expenses=inactive_expenses,
-                         total_monthly=total_monthly,
-                         total_yearly=total_yearly,
-                         total_quarterly=total_quarterly,
-                         monthly_equivalent=monthly_equivalent)
+                         active_expenses=active_pagination.items,
+                         inactive_expenses=inactive_pagination.items,
+                         active_pagination=active_pagination,
+                         inactive_pagination=inactive_pagination,
+                         total_monthly=totals['total_monthly'],
+                         total_yearly=totals['total_yearly'],
+                         total_quarterly=totals['total_quarterly'],
+                         monthly_equivalent=totals['monthly_equivalent'],
+                         upcoming_due=totals['upcoming_due'])
 
 @app.route('/add_fixed_expense', methods=['GET', 'POST'])
 def add_fixed_expense():
@@ -838,7 +2789,8 @@ def add_fixed_expense():
             frequency=request.form['frequency'],
             category=request.form.get('category', ''),
             start_date=start_date,
-            end_date=end_date
+            end_date=end_date,
+            default_account_id=int(request.form['default_account_id']) if request.form.get('default_account_id') else None
         )
         
         db.session.add(expense)
@@ -847,7 +2799,8 @@ def add_fixed_expense():
         flash('Fixed expense added successfully!', 'success')
         return redirect(url_for('fixed_expenses'))
     
-    return render_template('add_fixed_expense.html')
+    accounts = BankAccount.query.filter_by(is_active=True).all()
+    return render_template('add_fixed_expense.html', accounts=accounts)
 
 @app.route('/edit_fixed_expense/<int:expense_id>', methods=['GET', 'POST'])
 def edit_fixed_expense(expense_id):
@@ -866,6 +2819,11 @@ def edit_fixed_expense(expense_id):
             expense.end_date = datetime.strptime(request.form['end_date'], '%Y-%m-%d').date()
         else:
             expense.end_date = None
+        
+        if request.form.get('default_account_id'):
+            expense.default_account_id = int(request.form['default_account_id'])
+        else:
+            expense.default_account_id = None
             
         expense.is_active = 'is_active' in request.form
         expense.updated_date = datetime.utcnow()
@@ -875,7 +2833,8 @@ def edit_fixed_expense(expense_id):
         flash('Fixed expense updated successfully!', 'success')
         return redirect(url_for('fixed_expenses'))
     
-    return render_template('edit_fixed_expense.html', expense=expense)
+    accounts = BankAccount.query.filter_by(is_active=True).all()
+    return render_template('edit_fixed_expense.html', expense=expense, accounts=accounts)
 
 @app.route('/toggle_fixed_expense/<int:expense_id>')
 def toggle_fixed_expense(expense_id):
@@ -938,9 +2897,437 @@ def get_stock_data(symbol):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/upload_csv', methods=['POST'])
-def upload_csv():
-    """Upload CSV file with transactions"""
+STATEMENT_EXTENSIONS = ('.csv', '.xlsx', '.xls')
+TRANSACTION_TYPES = ('income', 'expense', 'misc_income', 'misc_expense')
+
+def bulk_insert_monthly_transactions(rows, chunk_size=None, prepare_chunk=None):
+    """Insert MonthlyTransaction rows (dicts) in chunks of executemany INSERTs - doesn't commit
+    
+    prepare_chunk, if given, is called with each chunk (a list of row dicts) before it is inserted.
+    Refreshes the MonthlyCategory totals of every account-month it inserted into.
+    """
+    chunk_size = chunk_size or app.config['IMPORT_CHUNK_SIZE']
+    inserted = 0
+    chunk = []
+    account_periods = set()
+    
+    def insert_chunk():
+        if prepare_chunk:
+            prepare_chunk(chunk)
+        db.session.execute(db.insert(MonthlyTransaction), chunk)
+        account_periods.update(ledger_scopes(chunk))
+        return len(chunk)
+    
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            inserted += insert_chunk()
+            chunk = []
+    
+    if chunk:
+        inserted += insert_chunk()
+    
+    refresh_monthly_categories(account_periods)
+    return inserted
+
+def iter_statement_sheet(file, filename, sheet_name=None):
+    """Stream raw rows (tuples of cell values) from a CSV, XLSX or XLS statement"""
+    extension = os.path.splitext(filename.lower())[1]
+    
+    if extension == '.xlsx':
+        import openpyxl
+        
+        # Read-only mode streams rows from the XML instead of building the whole workbook
+        workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+        try:
+            sheet = workbook[sheet_name] if sheet_name else workbook.active
+            for row in sheet.iter_rows(values_only=True):
+                yield row
+        finally:
+            workbook.close()
+    
+    elif extension == '.xls':
+        import xlrd
+        
+        # on_demand only loads the sheet that is actually read
+        workbook = xlrd.open_workbook(file_contents=file.read(), on_demand=True)
+        try:
+            sheet = workbook.sheet_by_name(sheet_name) if sheet_name else workbook.sheet_by_index(0)
+            for row_index in range(sheet.nrows):
+                values = []
+                for cell in sheet.row(row_index):
+                    if cell.ctype == xlrd.XL_CELL_DATE:
+                        values.append(xlrd.xldate_as_datetime(cell.value, workbook.datemode))
+                    else:
+                        values.append(cell.value)
+                yield tuple(values)
+        finally:
+            workbook.release_resources()
+    
+    elif extension == '.csv':
+        stream = io.TextIOWrapper(file, encoding='utf-8-sig', newline='')
+        for row in csv.reader(stream):
+            yield tuple(row)
+    
+    else:
+        raise ValueError(f'Unsupported file type: {extension}')
+
+def resolve_statement_columns(header_row, header_map):
+    """Map statement fields to column indexes using the configured header aliases"""
+    headers = [str(value).strip().lower() if value is not None else '' for value in header_row]
+    
+    columns = {}
+    for field, aliases in header_map.items():
+        if isinstance(aliases, str):
+            aliases = [aliases]
+        for alias in aliases:
+            if alias.strip().lower() in headers:
+                columns[field] = headers.index(alias.strip().lower())
+                break
+    
+    missing = [field for field in ('date', 'description') if field not in columns]
+    if 'amount' not in columns and 'debit' not in columns and 'credit' not in columns:
+        missing.append('amount')
+    if missing:
+        raise ValueError(f'Statement is missing required columns: {missing}')
+    
+    return columns
+
+def parse_statement_amount(value):
+    """Parse a cell into a float amount - '€1,234.50', '1.234,50', '(12.00)' - raising ValueError if unreadable
+    
+    When both ',' and '.' appear the last one is the decimal separator. A lone separator followed
+    by exactly three digits ('1,234' or '1.234') could be either, so it is rejected, not guessed.
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        if not math.isfinite(value):
+            raise ValueError(f'Unreadable amount: {value!r}')
+        return float(value)
+    
+    text = str(value).strip()
+    for symbol in ('€', 'EUR', '\u00a0', ' '):
+        text = text.replace(symbol, '')
+    
+    negative = False
+    if text.startswith('(') and text.endswith(')'):
+        negative, text = True, text[1:-1]
+    if text[:1] in ('-', '+'):
+        negative, text = negative != (text[0] == '-'), text[1:]
+    elif text.endswith('-'):
+        negative, text = not negative, text[:-1]
+    
+    if not text:
+        return None
+    if not re.fullmatch(r'[\d.,]+', text):
+        raise ValueError(f'Unreadable amount: {value!r}')
+    
+    if ',' in text and '.' in text:
+        decimal = ',' if text.rfind(',') > text.rfind('.') else '.'
+    elif ',' in text or '.' in text:
+        separator = ',' if ',' in text else '.'
+        integer, _, fraction = text.rpartition(separator)
+        if text.count(separator) > 1:
+            decimal = None
+        elif len(fraction) == 3 and integer.lstrip('0'):
+            raise ValueError(f'Ambiguous amount: {value!r} (is "{separator}" a thousands or decimal separator?)')
+        else:
+            decimal = separator
+    else:
+        decimal = None
+    
+    integer, fraction = text.rsplit(decimal, 1) if decimal else (text, '')
+    thousands = {',': '.', '.': ','}[decimal] if decimal else (',' if ',' in text else '.')
+    groups = integer.split(thousands) if integer else ['0']
+    if (not all(group.isdigit() for group in groups) or (fraction and not fraction.isdigit())
+            or (len(groups) > 1 and not (len(groups[0]) <= 3 and all(len(group) == 3 for group in groups[1:])))):
+        raise ValueError(f'Unreadable amount: {value!r}')
+    
+    amount = float(''.join(groups) + ('.' + fraction if fraction else ''))
+    return -amount if negative else amount
+
+def parse_statement_date(value):
+    """Parse a statement date cell - ISO first, then day first - raising ValueError if unreadable"""
+    if isinstance(value, datetime):
+        return value
+    text = str(value).strip()
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        pass
+    try:
+        # Bank exports in EUR locales write day first (05/03/2024 = 5 March)
+        return date_parser.parse(text, dayfirst=True)
+    except (ValueError, OverflowError):
+        raise ValueError(f'Unreadable date: {value!r}')
+
+def parse_statement_row(row, columns, account_id):
+    """Convert one raw statement row into MonthlyTransaction column values
+    
+    Raises ValueError saying why for rows that can't be imported - no date, an unreadable date,
+    a malformed or ambiguous amount, or a zero amount - so the import can skip and report them.
+    """
+    def cell(field):
+        index = columns.get(field)
+        if index is None or index >= len(row):
+            return None
+        return row[index]
+    
+    raw_date = cell('date')
+    if raw_date is None or str(raw_date).strip() == '':
+        raise ValueError('Missing date')
+    date = parse_statement_date(raw_date)
+    
+    # Malformed or ambiguous amounts raise here and are skipped rather than stored wrong
+    amount = parse_statement_amount(cell('amount'))
+    if amount is None:
+        debit = parse_statement_amount(cell('debit')) or 0
+        credit = parse_statement_amount(cell('credit')) or 0
+        amount = credit - abs(debit)
+    
+    transaction_type = str(cell('type') or '').strip().lower()
+    if transaction_type not in TRANSACTION_TYPES:
+        transaction_type = 'income' if amount > 0 else 'expense'
+    
+    if amount == 0:
+        raise ValueError('Zero or missing amount')
+    
+    description = str(cell('description') or '').strip() or 'Imported transaction'
+    category = str(cell('category') or '').strip() or None
+    
+    return {
+        'account_id': account_id,
+        'month': date.month,
+        'year': date.year,
+        'transaction_type': transaction_type,
+        'amount': abs(amount),
+        'description': description[:200],
+        'category': category[:100] if category else None,
+    }
+
+class TransactionCategorizer:
+    """Predicts transaction categories from descriptions: character n-gram TF-IDF plus logistic regression
+    
+    Trained on income/expense transactions categorized by the user or their bank - not summary or
+    tracking rows, nor categories it predicted itself - and saved with joblib under
+    CATEGORIZER_MODEL_DIR as categorizer-<version>.joblib, where the version hashes the training
+    set's size, last id and text length. Imports use the newest saved model and refit in the
+    background afterwards (retrain_in_background). Get one with TransactionCategorizer.current().
+    """
+    
+    _loaded = None  # Last categorizer used by this process
+    _training = threading.Lock()  # Held while a background refit runs
+    
+    def __init__(self, version, pipeline):
+        self.version = version
+        self.pipeline = pipeline
+        self.known = {label.lower(): label for label in pipeline.classes_}
+    
+    @staticmethod
+    def text(transaction_type, description):
+        return f'{transaction_type} {description}'
+    
+    @staticmethod
+    def training_filter():
+        return (MonthlyTransaction.transaction_type.in_(('income', 'expense')),
+                db.func.trim(db.func.coalesce(MonthlyTransaction.category, '')) != '',
+                MonthlyTransaction.category_predicted.is_(False),
+                category_spending_filter())
+    
+    @classmethod
+    def training_version(cls):
+        """(version hash, labeled row count) of the current training set - one aggregate query"""
+        count, last_id, text_length = db.session.query(
+            db.func.count(MonthlyTransaction.id),
+            db.func.max(MonthlyTransaction.id),
+            db.func.sum(db.func.length(MonthlyTransaction.description) + db.func.length(MonthlyTransaction.category))
+        ).filter(*cls.training_filter()).one()
+        return hashlib.sha1(f'{count}:{last_id}:{text_length}'.encode()).hexdigest()[:16], count
+    
+    @classmethod
+    def current(cls, train=True):
+        """Categorizer for the current training set from memory or disk, or trained now; None with too little data
+        
+        With train=False nothing is fitted: when the training set changed since the last fit the
+        newest saved model is returned instead (None if there is none yet).
+        """
+        version, count = cls.training_version()
+        if cls._loaded is not None and cls._loaded.version == version:
+            return cls._loaded
+        if count < app.config['CATEGORIZER_MIN_TRAINING_ROWS']:
+            return None
+        
+        model_dir = app.config['CATEGORIZER_MODEL_DIR']
+        path = os.path.join(model_dir, f'categorizer-{version}.joblib')
+        if os.path.exists(path):
+            pipeline = joblib.load(path)
+        elif not train:
+            return cls._loaded or cls.latest_saved()
+        else:
+            pipeline = cls.train()
+            if pipeline is None:
+                return None
+            os.makedirs(model_dir, exist_ok=True)
+            joblib.dump(pipeline, path + '.tmp')
+            os.replace(path + '.tmp', path)
+            for old in os.listdir(model_dir):
+                if old.startswith('categorizer-') and old.endswith('.joblib') and old != os.path.basename(path):
+                    os.remove(os.path.join(model_dir, old))
+        
+        cls._loaded = cls(version, pipeline)
+        return cls._loaded
+    
+    @classmethod
+    def latest_saved(cls):
+        """Most recently saved categorizer, whatever training set it was fitted on; None if there is none"""
+        model_dir = app.config['CATEGORIZER_MODEL_DIR']
+        if not os.path.isdir(model_dir):
+            return None
+        saved = [name for name in os.listdir(model_dir) if name.startswith('categorizer-') and name.endswith('.joblib')]
+        if not saved:
+            return None
+        
+        name = max(saved, key=lambda name: os.path.getmtime(os.path.join(model_dir, name)))
+        cls._loaded = cls(name[len('categorizer-'):-len('.joblib')], joblib.load(os.path.join(model_dir, name)))
+        return cls._loaded
+    
+    @classmethod
+    def retrain_in_background(cls):
+        """Refit for the current training set in a daemon thread, unless one is already running
+        
+        Keeps the fit (up to CATEGORIZER_MAX_TRAINING_ROWS rows) out of the import request; the
+        next import picks the new model up. Returns the thread, or None if a refit is in progress.
+        """
+        if not cls._training.acquire(blocking=False):
+            return None
+        
+        def refit():
+            try:
+                with app.app_context():
+                    cls.current(train=True)
+            except Exception:
+                app.logger.exception('Refitting the transaction categorizer failed')
+            finally:
+                cls._training.release()
+        
+        thread = threading.Thread(target=refit, name='categorizer-refit', daemon=True)
+        thread.start()
+        return thread
+    
+    @classmethod
+    def train(cls):
+        """Fit on the most recent CATEGORIZER_MAX_TRAINING_ROWS labeled transactions; None if fewer than two categories"""
+        rows = db.session.query(
+            MonthlyTransaction.transaction_type, MonthlyTransaction.description, MonthlyTransaction.category
+        ).filter(*cls.training_filter()).order_by(MonthlyTransaction.id.desc()).limit(
+            app.config['CATEGORIZER_MAX_TRAINING_ROWS']
+        ).all()
+        labels = [category.strip() for _, _, category in rows]
+        if len(set(labels)) < 2:
+            return None
+        
+        pipeline = make_pipeline(
+            TfidfVectorizer(analyzer='char_wb', ngram_range=(2, 4), sublinear_tf=True, min_df=2),
+            LogisticRegression(max_iter=1000)
+        )
+        pipeline.fit([cls.text(transaction_type, description) for transaction_type, description, _ in rows], labels)
+        return pipeline
+    
+    def categorize(self, rows):
+        """Fill blank or unknown categories of transaction row dicts in place - one predict for the batch
+        
+        Known categories are only normalized to the model's spelling. Predictions below
+        CATEGORIZER_MIN_PROBABILITY leave the row as it was. Filled rows are flagged
+        category_predicted so they never become training labels. Returns the number of rows filled.
+        """
+        targets = []
+        for row in rows:
+            row['category_predicted'] = False
+            category = (row.get('category') or '').strip().lower()
+            if category in self.known:
+                row['category'] = self.known[category]
+            elif row['transaction_type'] in ('income', 'expense'):
+                targets.append(row)
+        if not targets:
+            return 0
+        
+        probabilities = self.pipeline.predict_proba([self.text(row['transaction_type'], row['description']) for row in targets])
+        best = probabilities.argmax(axis=1)
+        confident = probabilities[np.arange(len(targets)), best] >= app.config['CATEGORIZER_MIN_PROBABILITY']
+        for row, label, is_confident in zip(targets, self.pipeline.classes_[best], confident):
+            if is_confident:
+                row['category'] = label
+                row['category_predicted'] = True
+        return int(confident.sum())
+
+def import_statement_file(file, filename, account_id, header_map=None, sheet_name=None, auto_categorize=True):
+    """Stream a statement file into MonthlyTransaction using chunked bulk inserts - doesn't commit
+    
+    With auto_categorize, each chunk goes through the newest saved TransactionCategorizer before it
+    is inserted - nothing is fitted here. Rows that can't be imported are skipped, not fatal; empty
+    rows are ignored. Returns (inserted, skipped, categorized) where skipped is a list of
+    {'row': <1-based row number in the file>, 'reason': ...} dicts.
+    """
+    header_map = header_map or app.config['STATEMENT_HEADER_MAP']
+    rows = iter_statement_sheet(file, filename, sheet_name)
+    row_number = 0
+    
+    def is_empty(row):
+        return all(value in (None, '') for value in row)
+    
+    # The header is the first non-empty row
+    columns = None
+    for row in rows:
+        row_number += 1
+        if not is_empty(row):
+            columns = resolve_statement_columns(row, header_map)
+            break
+    
+    if columns is None:
+        raise ValueError('Statement file is empty')
+    
+    skipped = []
+    
+    def parsed_rows():
+        nonlocal row_number
+        for row in rows:
+            row_number += 1
+            if is_empty(row):
+                continue
+            try:
+                parsed = parse_statement_row(row, columns, account_id)
+            except ValueError as e:
+                skipped.append({'row': row_number, 'reason': str(e)})
+                continue
+            yield parsed
+    
+    categorizer = TransactionCategorizer.current(train=False) if auto_categorize else None
+    categorized = 0
+    
+    def categorize_chunk(chunk):
+        nonlocal categorized
+        categorized += categorizer.categorize(chunk)
+    
+    inserted = bulk_insert_monthly_transactions(parsed_rows(), prepare_chunk=categorize_chunk if categorizer else None)
+    return inserted, skipped, categorized
+
+def valid_header_map(header_map):
+    """True if header_map looks like STATEMENT_HEADER_MAP - field names mapped to a header or a list of headers"""
+    return isinstance(header_map, dict) and all(
+        isinstance(field, str) and (isinstance(aliases, str) or
+                                    (isinstance(aliases, list) and all(isinstance(alias, str) for alias in aliases)))
+        for field, aliases in header_map.items()
+    )
+
+def default_statement_account():
+    """Account older /upload_csv clients import into when they post no account - the first active non-debt account"""
+    return (BankAccount.query.filter(BankAccount.is_active == True, BankAccount.is_debt == False)
+            .order_by(BankAccount.id).first())
+
+@app.route('/import_statement', methods=['POST'])
+def import_statement(use_default_account=False):
+    """Import a bank statement (CSV, XLSX or XLS) into an account's monthly transactions"""
     if 'file' not in request.files:
         return jsonify({'error': 'No file provided'}), 400
     
@@ -948,36 +3335,74 @@ def upload_csv():
     if file.filename == '':
         return jsonify({'error': 'No file selected'}), 400
     
-    if file and file.filename.endswith('.csv'):
+    filename = secure_filename(file.filename)
+    if not filename.lower().endswith(STATEMENT_EXTENSIONS):
+        return jsonify({'error': f'Invalid file format. Please upload one of: {", ".join(STATEMENT_EXTENSIONS)}'}), 400
+    
+    account_field = request.form.get('account_id') or request.form.get('default_account_id')
+    if account_field is None and use_default_account:
+        account = default_statement_account()
+        if not account:
+            return jsonify({'error': 'No active account to import into - add an account first'}), 400
+        account_field = account.id
+    
+    try:
+        account_id = int(account_field)
+    except (TypeError, ValueError):
+        return jsonify({'error': 'account_id is required'}), 400
+    
+    if not BankAccount.query.get(account_id):
+        return jsonify({'error': 'Account not found'}), 404
+    
+    header_map = None
+    if request.form.get('header_map'):
         try:
-            # Read CSV file
-            df = pd.read_csv(file)
-            
-            # Validate required columns
-            required_columns = ['date', 'type', 'category', 'description', 'amount']
-            if not all(col in df.columns for col in required_columns):
-                return jsonify({'error': f'CSV must contain columns: {required_columns}'}), 400
-            
-            # Add transactions from CSV
-            for _, row in df.iterrows():
-                transaction = {
-                    'id': len(transactions) + 1,
-                    'date': str(row['date']),
-                    'type': str(row['type']),
-                    'category': str(row['category']),
-                    'description': str(row['description']),
-                    'amount': float(row['amount'])
-                }
-                transactions.append(transaction)
-            
-            return jsonify({'success': f'Added {len(df)} transactions from CSV'}), 200
-        
-        except Exception as e:
-            return jsonify({'error': f'Error processing CSV: {str(e)}'}), 500
+            header_map = json.loads(request.form['header_map'])
+        except ValueError:
+            return jsonify({'error': 'header_map must be valid JSON'}), 400
+        if not valid_header_map(header_map):
+            return jsonify({'error': 'header_map must be an object mapping fields to a header name or list of header names'}), 400
+    
+    try:
+        inserted, skipped, categorized = import_statement_file(
+            file.stream,
+            filename,
+            account_id,
+            header_map=header_map,
+            sheet_name=request.form.get('sheet') or None,
+            auto_categorize=request.form.get('auto_categorize', '1').lower() not in ('0', 'false', 'no', 'off')
+        )
+        db.session.commit()
+    except (ValueError, KeyError) as e:
+        db.session.rollback()
+        return jsonify({'error': f'Error processing statement: {str(e)}'}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'Error processing statement: {str(e)}'}), 500
+    
+    # New labeled rows change the training set - refit off the request for the next import
+    if inserted:
+        TransactionCategorizer.retrain_in_background()
+    
+    return jsonify({'success': f'Added {inserted} transactions from {filename}',
+                    'inserted': inserted,
+                    'skipped': len(skipped),
+                    'skipped_rows': skipped[:app.config['STATEMENT_MAX_SKIPPED_ROWS']],
+                    'categorized': categorized}), 200
+
+@app.route('/upload_csv', methods=['POST'])
+def upload_csv():
+    """Upload CSV file with transactions (kept for older clients - same pipeline as /import_statement)
     
-    return jsonify({'error': 'Invalid file format. Please upload a CSV file.'}), 400
+    Older clients post no account, so the rows go to default_account_id or the first active non-debt account.
+    """
+    file = request.files.get('file')
+    if file and file.filename and not file.filename.lower().endswith('.csv'):
+        return jsonify({'error': 'Invalid file format. Please upload a CSV file.'}), 400
+    
+    return import_statement(use_default_account=True)
 
-def create_net_worth_chart(months_data):
+def create_net_worth_chart(months_data, range_label='Last 12 Months'):
     """Create net worth trend chart"""
     months = [data['month'] for data in months_data]
     closing_balances = [data['closing_balance'] for data in months_data]
@@ -992,15 +3417,15 @@ def create_net_worth_chart(months_data):
     ))
     
     fig.update_layout(
-        title='Net Worth Trend (Last 12 Months)',
-        xaxis_title='Month',
+        title=f'Net Worth Trend ({range_label})',
+        xaxis_title='Period',
         yaxis_title='Amount (€)',
         template='plotly_white'
     )
     
     return json.dumps(fig, cls=PlotlyJSONEncoder)
 
-def create_income_expense_chart(months_data):
+def create_income_expense_chart(months_data, range_label='Last 12 Months'):
     """Create income vs expense chart"""
     months = [data['month'] for data in months_data]
     income = [data['income'] for data in months_data]
@@ -1023,8 +3448,8 @@ def create_income_expense_chart(months_data):
     ))
     
     fig.update_layout(
-        title='Income vs Expenses (Last 12 Months)',
-        xaxis_title='Month',
+        title=f'Income vs Expenses ({range_label})',
+        xaxis_title='Period',
         yaxis_title='Amount (€)',
         barmode='group',
         template='plotly_white'
@@ -1032,6 +3457,55 @@ def create_income_expense_chart(months_data):
     
     return json.dumps(fig, cls=PlotlyJSONEncoder)
 
+def create_forecast_chart(result, title, history_months=24):
+    """Create income and expense history plus forecast chart with ~95% bands"""
+    history = result['history'][-history_months:]
+    forecast = result['forecast']
+    colors = {'income': 'green', 'expenses': 'red'}
+    
+    fig = go.Figure()
+    
+    for measure, color in colors.items():
+        if measure not in forecast[0]:
+            continue
+        label = measure.capitalize()
+        fig.add_trace(go.Scatter(
+            x=[entry['month'] for entry in history],
+            y=[entry[measure] for entry in history],
+            mode='lines+markers',
+            name=label,
+            line=dict(color=color, width=2)
+        ))
+        
+        months = [entry['month'] for entry in forecast]
+        fig.add_trace(go.Scatter(
+            x=months + months[::-1],
+            y=[entry[f'{measure}_high'] for entry in forecast] + [entry[f'{measure}_low'] for entry in forecast][::-1],
+            fill='toself',
+            fillcolor=color,
+            opacity=0.15,
+            line=dict(width=0),
+            hoverinfo='skip',
+            showlegend=False
+        ))
+        fig.add_trace(go.Scatter(
+            x=[history[-1]['month']] + months if history[-1][measure] is not None else months,
+            y=([history[-1][measure]] if history[-1][measure] is not None else []) + [entry[measure] for entry in forecast],
+            mode='lines+markers',
+            name=f'{label} forecast',
+            line=dict(color=color, width=2, dash='dash')
+        ))
+    
+    fig.update_layout(
+        title=f'Forecast ({title})',
+        xaxis_title='Month',
+        yaxis_title='Amount (€)',
+        template='plotly_white',
+        hovermode='x unified'
+    )
+    
+    return json.dumps(fig, cls=PlotlyJSONEncoder)
+
 @app.route('/set_opening_balance', methods=['POST'])
 def set_opening_balance():
     """Set opening balance for an account for a specific month"""
@@ -1040,38 +3514,106 @@ def set_opening_balance():
     year = int(request.form['year'])
     opening_balance = float(request.form['opening_balance'])
     
-    # Get or create monthly balance record
-    balance = MonthlyBalance.query.filter_by(
-        account_id=account_id,
-        month=month,
-        year=year
-    ).first()
-    
-    if not balance:
-        balance = MonthlyBalance(
-            account_id=account_id,
-            month=month,
-            year=year
-        )
-        db.session.add(balance)
-    
-    balance.opening_balance = opening_balance
-    
     # Recalculate totals from transactions
-    transactions = MonthlyTransaction.query.filter_by(
-        account_id=account_id,
-        month=month,
-        year=year
-    ).all()
-    
-    balance.income = sum(t.amount for t in transactions if t.transaction_type in ['income', 'misc_income'])
-    balance.expenses = sum(t.amount for t in transactions if t.transaction_type in ['expense', 'misc_expense'])
+    income, expenses = income_expense_totals(account_id, month, year)
+    
+    # Create or update the monthly balance record in one statement
+    upsert_monthly_balance(
+        account_id, month, year,
+        opening_balance=opening_balance,
+        income=income,
+        expenses=expenses
+    )
+    refresh_month_aggregates([(account_id, to_period(year, month))])
     
     db.session.commit()
     
     flash(f'Opening balance set to €{opening_balance:.2f}', 'success')
     return redirect(url_for('monthly_data', month=month, year=year))
 
+def latest_per_account(model, year_column, month_column, account_ids=None, as_of_year=None, as_of_month=None):
+    """Subquery of (id, account_id) for each account's newest row of model, optionally at or before a month
+    
+    Ranks each account's rows newest-first with ROW_NUMBER() (served by the
+    account/year/month DESC indexes) and keeps rank 1.
+    """
+    rank = db.func.row_number().over(
+        partition_by=model.account_id,
+        order_by=(year_column.desc(), month_column.desc())
+    ).label('rank')
+    ranked = db.session.query(model.id.label('id'), model.account_id.label('account_id'), rank)
+    
+    if account_ids is not None:
+        ranked = ranked.filter(model.account_id.in_(list(account_ids)))
+    if as_of_year is not None and as_of_month is not None:
+        period_column = getattr(model, 'period', year_column * 12 + month_column - 1)
+        ranked = ranked.filter(period_column <= to_period(as_of_year, as_of_month))
+    
+    ranked = ranked.subquery()
+    return db.session.query(ranked.c.id, ranked.c.account_id).filter(ranked.c.rank == 1).subquery()
+
+def latest_balances(account_ids=None, as_of_year=None, as_of_month=None):
+    """Most recent MonthlyBalance per account (optionally at or before a month), keyed by account id"""
+    latest = latest_per_account(MonthlyBalance, MonthlyBalance.year, MonthlyBalance.month,
+                                account_ids, as_of_year, as_of_month)
+    balances = MonthlyBalance.query.join(latest, MonthlyBalance.id == latest.c.id).all()
+    return {balance.account_id: balance for balance in balances}
+
+def current_debt_terms(account_ids=None, as_of_year=None, as_of_month=None):
+    """DebtTerms in force per account (newest effective at or before a month), keyed by account id"""
+    latest = latest_per_account(DebtTerms, DebtTerms.effective_year, DebtTerms.effective_month,
+                                account_ids, as_of_year, as_of_month)
+    terms = DebtTerms.query.join(latest, DebtTerms.id == latest.c.id).all()
+    return {term.account_id: term for term in terms}
+
+def known_balance(balance):
+    """Best known balance of a MonthlyBalance row: closing if entered, otherwise opening"""
+    if balance is None:
+        return 0
+    if balance.closing_balance is not None:
+        return balance.closing_balance
+    return balance.opening_balance or 0
+
+def known_balance_sql(balance=MonthlyBalance):
+    """SQL counterpart of known_balance for a MonthlyBalance (or alias) - NULL closing means not closed yet"""
+    return db.func.coalesce(balance.closing_balance, balance.opening_balance, 0)
+
+def debt_positions(as_of_year, as_of_month):
+    """Active debt accounts with their latest known balance and the terms in force, in one query
+    
+    Accounts without DebtTerms fall back to DEFAULT_ANNUAL_RATES and a zero minimum payment.
+    """
+    balances = latest_per_account(MonthlyBalance, MonthlyBalance.year, MonthlyBalance.month,
+                                  as_of_year=as_of_year, as_of_month=as_of_month)
+    terms = latest_per_account(DebtTerms, DebtTerms.effective_year, DebtTerms.effective_month,
+                               as_of_year=as_of_year, as_of_month=as_of_month)
+    
+    rows = db.session.query(
+        BankAccount.id, BankAccount.name, BankAccount.account_type,
+        known_balance_sql(),
+        DebtTerms.annual_rate, DebtTerms.minimum_payment
+    ).outerjoin(
+        balances, balances.c.account_id == BankAccount.id
+    ).outerjoin(
+        MonthlyBalance, MonthlyBalance.id == balances.c.id
+    ).outerjoin(
+        terms, terms.c.account_id == BankAccount.id
+    ).outerjoin(
+        DebtTerms, DebtTerms.id == terms.c.id
+    ).filter(
+        BankAccount.is_debt.is_(True),
+        BankAccount.is_active.is_(True)
+    ).order_by(BankAccount.id).all()
+    
+    return [{
+        'account_id': account_id,
+        'name': name,
+        'account_type': account_type,
+        'balance': balance,
+        'annual_rate': annual_rate if annual_rate is not None else DEFAULT_ANNUAL_RATES.get(account_type, 0),
+        'minimum_payment': minimum_payment or 0
+    } for account_id, name, account_type, balance, annual_rate, minimum_payment in rows]
+
 @app.route('/debt')
 def debt():
     """Debt management screen showing all debt accounts, balances, and payments"""
@@ -1079,24 +3621,24 @@ def debt():
     current_year = datetime.now().year
     
     # Get all debt accounts (credit cards and loans)
-    debt_accounts = BankAccount.query.filter(
-        BankAccount.account_type.in_(['credit', 'loan', 'Credit Card', 'Loan'])
-    ).filter_by(is_active=True).all()
+    debt_accounts = BankAccount.query.filter_by(is_debt=True, is_active=True).all()
     
-    # Get current month balances for debt accounts
+    # Latest known balance for each debt account (falls back to earlier months if this one isn't entered yet)
+    latest = latest_balances([a.id for a in debt_accounts], current_year, current_month)
     debt_balances = {}
     for account in debt_accounts:
-        balance = MonthlyBalance.query.filter_by(
-            account_id=account.id,
-            month=current_month,
-            year=current_year
-        ).first()
+        balance = latest.get(account.id)
+        is_stale = balance is not None and (balance.year, balance.month) != (current_year, current_month)
         debt_balances[account.id] = {
             'account': account,
-            'current_balance': balance.closing_balance if balance and balance.closing_balance is not None else 0,
-            'opening_balance': balance.opening_balance if balance else 0
+            'current_balance': known_balance(balance),
+            'opening_balance': balance.opening_balance if balance else 0,
+            'as_of': f"{balance.year}-{balance.month:02d}" if is_stale else None
         }
     
+    # Interest rate and minimum payment in force for each debt account
+    debt_terms = current_debt_terms([a.id for a in debt_accounts], current_year, current_month)
+    
     # Get debt-related fixed expenses
     debt_fixed_expenses = FixedExpense.query.filter_by(
         category='Debt Payments',
@@ -1110,20 +3652,19 @@ def debt():
         MonthlyTransaction.source_account_id.isnot(None)
     ).all()
     
-    # Get payment history for last 6 months
+    # Get payment history for last 6 months (one range scan on the period index)
+    current_period = to_period(current_year, current_month)
+    payments_by_period = {}
+    for payment in MonthlyTransaction.query.filter(
+        MonthlyTransaction.period.between(current_period - 5, current_period),
+        MonthlyTransaction.source_account_id.isnot(None)
+    ).order_by(MonthlyTransaction.id).all():
+        payments_by_period.setdefault(payment.period, []).append(payment)
+    
     payment_history = []
-    for i in range(6):
-        hist_month = current_month - i
-        hist_year = current_year
-        if hist_month <= 0:
-            hist_month += 12
-            hist_year -= 1
-        
-        monthly_payments = MonthlyTransaction.query.filter(
-            MonthlyTransaction.month == hist_month,
-            MonthlyTransaction.year == hist_year,
-            MonthlyTransaction.source_account_id.isnot(None)
-        ).all()
+    for period in range(current_period, current_period - 6, -1):
+        hist_year, hist_month = from_period(period)
+        monthly_payments = payments_by_period.get(period, [])
         
         payment_history.append({
             'month': hist_month,
@@ -1138,26 +3679,17 @@ def debt():
     total_payments_made = sum([p.amount for p in debt_payments])
     
     # Calculate debt-to-income ratio (simplified)
-    # Get total income from regular accounts for current month
-    regular_accounts = BankAccount.query.filter(
-        BankAccount.account_type.in_(['checking', 'savings'])
-    ).filter_by(is_active=True).all()
-    
-    total_income = 0
-    for account in regular_accounts:
-        balance = MonthlyBalance.query.filter_by(
-            account_id=account.id,
-            month=current_month,
-            year=current_year
-        ).first()
-        if balance:
-            total_income += balance.income or 0
+    # Total income of regular accounts for current month, from the household summary
+    summary = db.session.get(HouseholdMonthlySummary, to_period(current_year, current_month))
+    total_income = summary.regular_income if summary else 0
     
     debt_to_income_ratio = (total_monthly_payments / total_income * 100) if total_income > 0 else 0
     
     return render_template('debt.html',
                          debt_accounts=debt_accounts,
                          debt_balances=debt_balances,
+                         debt_terms=debt_terms,
+                         default_annual_rates=DEFAULT_ANNUAL_RATES,
                          debt_fixed_expenses=debt_fixed_expenses,
                          debt_payments=debt_payments,
                          payment_history=payment_history,
@@ -1168,6 +3700,43 @@ def debt():
                          current_month=current_month,
                          current_year=current_year)
 
+@app.route('/set_debt_terms', methods=['POST'])
+def set_debt_terms():
+    """Record a debt account's APR and minimum payment, effective from a month onwards"""
+    account_id = int(request.form['account_id'])
+    month = int(request.form.get('month', datetime.now().month))
+    year = int(request.form.get('year', datetime.now().year))
+    
+    try:
+        annual_rate = float(request.form['annual_rate']) / 100  # Entered as a percentage
+        minimum_payment = float(request.form['minimum_payment'])
+    except (KeyError, ValueError):
+        flash('Please enter a valid interest rate and minimum payment', 'error')
+        return redirect(url_for('debt'))
+    
+    account = BankAccount.query.get_or_404(account_id)
+    if not account.is_debt:
+        flash('Interest terms can only be set on credit cards and loan accounts', 'error')
+        return redirect(url_for('debt'))
+    if annual_rate < 0 or minimum_payment < 0:
+        flash('Interest rate and minimum payment cannot be negative', 'error')
+        return redirect(url_for('debt'))
+    
+    # One row per account and effective month; re-entering the same month replaces it
+    stmt = dialect_insert(DebtTerms).values(
+        account_id=account_id, effective_month=month, effective_year=year,
+        annual_rate=annual_rate, minimum_payment=minimum_payment, created_date=datetime.utcnow()
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['account_id', 'effective_year', 'effective_month'],
+        set_={'annual_rate': stmt.excluded.annual_rate, 'minimum_payment': stmt.excluded.minimum_payment}
+    )
+    db.session.execute(stmt)
+    db.session.commit()
+    
+    flash(f'Terms for {account.name} set to {annual_rate:.2%} APR, €{minimum_payment:.2f} minimum from {year}-{month:02d}', 'success')
+    return redirect(url_for('debt'))
+
 @app.route('/calculate_debt_acceleration', methods=['POST'])
 def calculate_debt_acceleration():
     """Calculate realistic debt acceleration scenarios based on user's financial situation"""
@@ -1189,50 +3758,25 @@ def calculate_debt_acceleration():
         if available_for_debt < 0:
             return jsonify({'success': False, 'error': 'Your expenses exceed your income. Please adjust your inputs.'})
         
-        # Get debt accounts with current balances
-        debt_accounts = BankAccount.query.filter(
-            BankAccount.account_type.in_(['credit', 'loan', 'Credit Card', 'Loan'])
-        ).filter_by(is_active=True).all()
-        
-        # Build debt list with user-specified minimum payments
+        # Debt vector (latest balance and terms in force per account) in one query.
+        # Minimum payments sent by the client override the stored terms for what-if runs.
         debts = []
         total_debt = 0
         total_min_payments = 0
         
-        for account in debt_accounts:
-            # Get current balance
-            current_month = datetime.now().month
-            current_year = datetime.now().year
-            
-            balance = MonthlyBalance.query.filter_by(
-                account_id=account.id,
-                month=current_month,
-                year=current_year
-            ).first()
-            
-            current_balance = balance.closing_balance if balance and balance.closing_balance else 0
+        for position in debt_positions(datetime.now().year, datetime.now().month):
+            current_balance = position['balance']
             
             if current_balance > 0:
-                min_payment = float(minimum_payments.get(str(account.id), 0))
-                
-                # Set interest rates based on account type and name
-                if account.account_type == 'Credit Card':
-                    if 'Platinum' in account.name:
-                        annual_rate = 0.13  # 13% APR
-                    elif 'Click' in account.name:
-                        annual_rate = 0.11  # 11% APR
-                    else:
-                        annual_rate = 0.15  # Default credit card rate
-                else:  # Loan
-                    annual_rate = 0.07  # 7% APR for loans
+                min_payment = float(minimum_payments.get(str(position['account_id']), position['minimum_payment']))
                 
                 debt = {
-                    'name': account.name,
+                    'name': position['name'],
                     'balance': current_balance,
                     'min_payment': min_payment,
-                    'annual_rate': annual_rate,
-                    'monthly_rate': annual_rate / 12,
-                    'account_type': account.account_type
+                    'annual_rate': position['annual_rate'],
+                    'monthly_rate': position['annual_rate'] / 12,
+                    'account_type': position['account_type']
                 }
                 
                 debts.append(debt)
@@ -1246,7 +3790,8 @@ def calculate_debt_acceleration():
         scenarios = []
         
         # Always show minimum payment scenario first
-        min_scenario = calculate_minimum_payment_scenario(debts)
+        debts_key = debt_scenario_key(debts)
+        min_scenario = cached_debt_scenario(debts_key, 0)
         min_scenario['scenario_name'] = "Minimum Payments Only"
         min_scenario['scenario_description'] = "Pay only minimum required payments"
         scenarios.append(min_scenario)
@@ -1312,7 +3857,7 @@ def calculate_debt_acceleration():
         
         # Generate scenarios for the top 11 options
         for i, option in enumerate(sorted_scenarios[:11]):
-            scenario = calculate_debt_scenario_with_extra(debts, option['extra_amount'])
+            scenario = cached_debt_scenario(debts_key, round(option['extra_amount'], 2))
             if scenario:
                 # Add scenario metadata
                 scenario['scenario_name'] = option['name']
@@ -1334,6 +3879,31 @@ def calculate_debt_acceleration():
         print(f"Error in calculate_debt_acceleration: {str(e)}")
         return jsonify({'success': False, 'error': f'Calculation error: {str(e)}'})
 
+DEBT_SCENARIO_FIELDS = ('name', 'balance', 'min_payment', 'annual_rate', 'account_type')
+
+def debt_scenario_key(debts):
+    """Hashable, cent-rounded snapshot of a debt vector for cached_debt_scenario"""
+    return tuple(
+        (d['name'], round(d['balance'], 2), round(d['min_payment'], 2), d['annual_rate'], d['account_type'])
+        for d in debts
+    )
+
+@lru_cache(maxsize=256)
+def debt_scenario_plan(debts_key, extra_payment):
+    """Payoff scenario for a debt vector snapshot - cached, as the same balances, terms and extra
+    payment always give the same plan. The result is shared; use cached_debt_scenario for a copy."""
+    debts = [dict(zip(DEBT_SCENARIO_FIELDS, values)) for values in debts_key]
+    for debt in debts:
+        debt['monthly_rate'] = debt['annual_rate'] / 12
+    
+    if extra_payment:
+        return calculate_debt_scenario_with_extra(debts, extra_payment)
+    return calculate_minimum_payment_scenario(debts)
+
+def cached_debt_scenario(debts_key, extra_payment):
+    """Payoff scenario for a debt vector snapshot - a deep copy of the cached plan, safe to modify"""
+    return copy.deepcopy(debt_scenario_plan(debts_key, extra_payment))
+
 def calculate_minimum_payment_scenario(debts):
     """Calculate scenario with just minimum payments"""
     # Create a copy of debts to avoid modifying original
@@ -1571,6 +4141,7 @@ def add_investment():
         db.session.add(investment)
         flash(f'Added €{amount:.2f} to {investment_type} investments', 'success')
     
+    refresh_household_summary([to_period(year, month)])
     db.session.commit()
     return redirect(url_for('investments', month=month, year=year))
 
@@ -1582,6 +4153,7 @@ def delete_investment(investment_id):
     year = investment.year
     
     db.session.delete(investment)
+    refresh_household_summary([to_period(year, month)])
     db.session.commit()
     
     flash(f'Deleted {investment.investment_type} investment of €{investment.amount:.2f}', 'info')
@@ -1771,33 +4343,19 @@ def generate_pdf_download(scenarios, user_data, timestamp):
             selected_scenario = scenarios[0] if scenarios else None
         
         # Get debt accounts for the PDF
-        debt_accounts = BankAccount.query.filter_by(account_type='debt', is_active=True).all()
+        debt_accounts = BankAccount.query.filter_by(is_debt=True, is_active=True).all()
         
-        # Calculate debt balances for current month
-        current_date = datetime.now()
+        # Latest known balance for each debt account
+        latest = latest_balances([a.id for a in debt_accounts])
         debt_balances = {}
         total_debt = 0
         
         for account in debt_accounts:
-            # Get latest balance
-            latest_balance = DebtAccountData.query.filter_by(
-                account_id=account.id
-            ).order_by(DebtAccountData.month.desc(), DebtAccountData.year.desc()).first()
-            
-            if latest_balance:
-                current_balance = latest_balance.current_balance
-                debt_balances[account.id] = {
-                    'current_balance': current_balance,
-                    'minimum_payment': latest_balance.minimum_payment,
-                    'interest_rate': latest_balance.annual_interest_rate
-                }
-                total_debt += current_balance
-            else:
-                debt_balances[account.id] = {
-                    'current_balance': 0,
-                    'minimum_payment': 0,
-                    'interest_rate': 0
-                }
+            current_balance = known_balance(latest.get(account.id))
+            debt_balances[account.id] = {
+                'current_balance': current_balance
+            }
+            total_debt += current_balance
         
         # Create a complete HTML page that looks exactly like the debt page
         html_content = f"""
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark the reporting endpoints' DuckDB backend against the ORM path
+
+Usage:
+    python benchmark_analytics.py                  # the configured database (DATABASE_URL)
+    python benchmark_analytics.py --rows 200000    # a throwaway SQLite database with a synthetic ledger
+
+Each report runs on the ORM, on DuckDB attached to the database and on DuckDB over a Parquet
+snapshot; the script prints the median time of each and checks the backends agree.
+"""
+
+import sys
+import os
+import argparse
+import random
+import statistics
+import tempfile
+import time
+
+# Add the current directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+parser.add_argument('--rows', type=int, help='generate this many transactions in a temporary SQLite database')
+parser.add_argument('--repeat', type=int, default=5, help='runs per report and backend (default 5)')
+args = parser.parse_args()
+
+if args.rows:
+    workdir = tempfile.mkdtemp(prefix='benchmark_analytics_')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(workdir, 'ledger.db')
+
+from app import (app, db, duckdb, BankAccount, MonthlyBalance, MonthlyTransaction, ANALYTICS_REPORTS,
+                 analytics_connections, bulk_insert_monthly_transactions, export_parquet_snapshot, to_period)
+
+def seed_synthetic_ledger(rows, accounts=8, years=(2019, 2025)):
+    """Random accounts, a balance per account-month and `rows` transactions"""
+    db.create_all()
+    bank_accounts = [BankAccount(name=f'Account {i + 1}', bank_name='Synthetic Bank', account_type='credit' if i % 4 == 3 else 'checking')
+                     for i in range(accounts)]
+    db.session.add_all(bank_accounts)
+    db.session.flush()
+
+    categories = ['Groceries', 'Rent', 'Transport', 'Utilities', 'Dining', 'Travel', 'Health', '']
+    account_ids = [account.id for account in bank_accounts]
+    year_range = range(years[0], years[1] + 1)
+    bulk_insert_monthly_transactions([{
+        'account_id': random.choice(account_ids),
+        'month': random.randint(1, 12),
+        'year': random.choice(year_range),
+        'transaction_type': random.choice(['expense', 'expense', 'expense', 'income']),
+        'category': random.choice(categories),
+        'amount': random.randint(100, 200000) / 100,
+        'description': 'Synthetic',
+    } for _ in range(rows)])
+    db.session.execute(db.insert(MonthlyBalance), [{
+        'account_id': account_id, 'month': month, 'year': year,
+        'opening_balance': random.randint(0, 500000) / 100,
+        'closing_balance': random.randint(0, 500000) / 100,
+        'income': random.randint(0, 400000) / 100,
+        'expenses': random.randint(0, 400000) / 100,
+    } for account_id in account_ids for year in year_range for month in range(1, 13)])
+    db.session.commit()
+
+def time_report(report, params, repeat):
+    """Median seconds over `repeat` runs, after one warm-up run; returns (median, result)"""
+    result = report(**params)
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        report(**params)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), result
+
+def main():
+    """Time every report on each available backend"""
+    print("⏱️  Benchmarking analytics reports: DuckDB vs ORM")
+    print("=" * 50)
+
+    with app.app_context():
+        if args.rows:
+            print(f"🔧 Generating {args.rows} synthetic transactions in {workdir}...")
+            seed_synthetic_ledger(args.rows)
+
+        years = db.session.query(db.func.min(MonthlyTransaction.year), db.func.max(MonthlyTransaction.year)).one()
+        periods = db.session.query(db.func.min(MonthlyBalance.period), db.func.max(MonthlyBalance.period)).one()
+        if years[0] is None or periods[0] is None:
+            print("❌ No transactions or balances to report on - try --rows")
+            return False
+
+        print(f"📋 {MonthlyTransaction.query.count()} transactions, {MonthlyBalance.query.count()} monthly balances")
+        reports = {
+            'category_spend': {'start_year': years[0], 'end_year': years[1]},
+            'account_trends': {'start_period': periods[0], 'end_period': periods[1]},
+        }
+
+        backends = ['orm']
+        if duckdb is None:
+            print("⚠️  duckdb is not installed - only the ORM path will be timed")
+        else:
+            backends += ['duckdb (attached)', 'duckdb (parquet)']
+            snapshot_dir = tempfile.mkdtemp(prefix='ledger_snapshot_')
+            export_parquet_snapshot(snapshot_dir)
+
+        for name, params in reports.items():
+            duckdb_report, orm_report = ANALYTICS_REPORTS[name]
+            print(f"\n📊 {name}")
+            baseline = None
+            for backend in backends:
+                app.config['ANALYTICS_PARQUET_DIR'] = snapshot_dir if backend == 'duckdb (parquet)' else None
+                analytics_connections.__dict__.clear()
+                try:
+                    seconds, result = time_report(orm_report if backend == 'orm' else duckdb_report, params, args.repeat)
+                except Exception as e:
+                    print(f"   ⚠️  {backend}: unavailable ({str(e).splitlines()[0]})")
+                    continue
+
+                if baseline is None:
+                    baseline = (seconds, result)
+                    print(f"   • {backend:<18} {seconds * 1000:9.1f} ms   {len(result)} rows")
+                else:
+                    matches = '✅ same result' if result == baseline[1] else '❌ results differ'
+                    print(f"   • {backend:<18} {seconds * 1000:9.1f} ms   {baseline[0] / seconds:5.1f}x   {matches}")
+
+    print("\n🎯 Benchmark complete")
+    return True
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
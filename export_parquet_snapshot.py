@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Export the ledger tables to a Parquet snapshot for the DuckDB reporting backend
+
+Usage:
+    python export_parquet_snapshot.py [directory]     # defaults to ./analytics_snapshot
+
+Point ANALYTICS_PARQUET_DIR at the directory to run the /api/reports endpoints on the
+snapshot instead of attaching the live database. Re-run to pick up new data. Needs duckdb.
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import app, duckdb, export_parquet_snapshot
+
+def main():
+    """Write monthly_transaction, monthly_balance and bank_account as Parquet files"""
+    directory = sys.argv[1] if len(sys.argv) > 1 else 'analytics_snapshot'
+
+    print(f"🔄 Exporting ledger snapshot to {directory}")
+    print("=" * 50)
+
+    if duckdb is None:
+        print("❌ duckdb is not installed (pip install duckdb)")
+        return False
+
+    with app.app_context():
+        try:
+            counts = export_parquet_snapshot(directory)
+            for table, count in counts.items():
+                print(f"   • {table}: {count} rows")
+            print(f"✅ Snapshot written - set ANALYTICS_PARQUET_DIR={os.path.abspath(directory)} to use it")
+            return True
+        except Exception as e:
+            print(f"❌ Export failed: {str(e)}")
+            return False
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Migration script to normalize account types
+Rewrites free-form account_type values onto the fixed set and adds the indexed is_debt flag
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import inspect, text
+from app import app, db, normalize_account_type, DEBT_ACCOUNT_TYPES
+
+def migrate_database():
+    """Normalize bank_account.account_type and add the is_debt column and index"""
+
+    print("🔄 Migrating Database for Normalized Account Types")
+    print("=" * 50)
+
+    try:
+        with app.app_context():
+            columns = [column['name'] for column in inspect(db.engine).get_columns('bank_account')]
+
+            if 'is_debt' not in columns:
+                print("\n🔧 Adding is_debt column...")
+                db.session.execute(text("""
+                    ALTER TABLE bank_account
+                    ADD COLUMN is_debt BOOLEAN NOT NULL DEFAULT FALSE
+                """))
+            else:
+                print("✅ is_debt column already exists!")
+
+            current = db.session.execute(text("SELECT DISTINCT account_type FROM bank_account")).fetchall()
+            print(f"📋 Distinct account types: {[row[0] for row in current]}")
+
+            for (account_type,) in current:
+                normalized = normalize_account_type(account_type)
+                if normalized != account_type:
+                    db.session.execute(text("""
+                        UPDATE bank_account SET account_type = :normalized
+                        WHERE account_type = :account_type
+                    """), {'normalized': normalized, 'account_type': account_type})
+                    print(f"   • {account_type!r} → {normalized!r}")
+
+            db.session.execute(text("""
+                UPDATE bank_account
+                SET is_debt = CASE WHEN account_type IN :debt_types THEN TRUE ELSE FALSE END
+            """).bindparams(db.bindparam('debt_types', expanding=True)),
+                {'debt_types': list(DEBT_ACCOUNT_TYPES)})
+
+            print("\n🔧 Adding index on is_debt...")
+            db.session.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_bank_account_is_debt
+                ON bank_account (is_debt)
+            """))
+            db.session.commit()
+
+            debt_count = db.session.execute(text("SELECT COUNT(*) FROM bank_account WHERE is_debt")).scalar()
+            print(f"✅ Debt accounts flagged: {debt_count}")
+
+        print("\n🎯 Migration completed successfully!")
+        print("   • account_type values normalized")
+        print("   • is_debt column and ix_bank_account_is_debt index added")
+
+        return True
+
+    except Exception as e:
+        print(f"❌ Migration failed: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    success = migrate_database()
+    if success:
+        print("\n🎉 Database migration successful!")
+    else:
+        print("\n💔 Database migration failed.")
+        print("Please check the error and try again.")
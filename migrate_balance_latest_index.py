@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Migration script to add the "latest balance" index
+Creates ix_monthly_balance_account_latest on monthly_balance (account_id, year DESC, month DESC)
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import text
+from app import app, db
+
+def migrate_database():
+    """Create the newest-first per-account index on monthly_balance"""
+
+    print("🔄 Migrating Database for Latest Balance Lookups")
+    print("=" * 50)
+
+    try:
+        with app.app_context():
+            print("🔧 Creating ix_monthly_balance_account_latest...")
+            db.session.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_monthly_balance_account_latest
+                ON monthly_balance (account_id, year DESC, month DESC)
+            """))
+            db.session.commit()
+
+        print("\n🎯 Migration completed successfully!")
+        print("   • Latest balance per account is now a single index seek")
+
+        return True
+
+    except Exception as e:
+        print(f"❌ Migration failed: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    success = migrate_database()
+    if success:
+        print("\n🎉 Database migration successful!")
+    else:
+        print("\n💔 Database migration failed.")
+        print("Please check the error and try again.")
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Migration script to flag auto-categorized transactions
+Adds category_predicted column to monthly_transaction table (set when the import categorizer
+filled in the category, so those rows are never used to train it)
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import inspect, text
+from app import app, db
+
+def migrate_database():
+    """Add category_predicted column to monthly_transaction table"""
+
+    print("🔄 Migrating Database for Auto-Categorized Transactions")
+    print("=" * 50)
+
+    try:
+        with app.app_context():
+            columns = [column['name'] for column in inspect(db.engine).get_columns('monthly_transaction')]
+
+            if 'category_predicted' in columns:
+                print("✅ category_predicted column already exists!")
+                return True
+
+            print("📋 Current columns:", columns)
+
+            print("\n🔧 Adding category_predicted column...")
+            db.session.execute(text("""
+                ALTER TABLE monthly_transaction
+                ADD COLUMN category_predicted BOOLEAN NOT NULL DEFAULT FALSE
+            """))
+            db.session.commit()
+
+            new_columns = [column['name'] for column in inspect(db.engine).get_columns('monthly_transaction')]
+            if 'category_predicted' not in new_columns:
+                print("❌ Failed to add category_predicted column!")
+                return False
+
+            print("✅ Successfully added category_predicted column!")
+
+        print("\n🎯 Migration completed successfully!")
+        print("   • category_predicted column added to monthly_transaction table")
+        print("   • Existing transactions count as user-categorized; the next import refits the categorizer")
+
+        return True
+
+    except Exception as e:
+        print(f"❌ Migration failed: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    success = migrate_database()
+    if success:
+        print("\n🎉 Database migration successful!")
+    else:
+        print("\n💔 Database migration failed.")
+        print("Please check the error and try again.")
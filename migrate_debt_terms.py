@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Migration script to store interest rates and minimum payments on debt accounts
+Creates the debt_terms table and seeds it with the rates the debt simulator used to hardcode
+"""
+
+import sys
+import os
+from datetime import datetime
+
+# Add the current directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import inspect
+from app import app, db, BankAccount, DebtTerms, DEFAULT_ANNUAL_RATES, latest_balances, known_balance
+
+# Previously hardcoded in calculate_debt_acceleration and the debt page (matched on account name)
+LEGACY_RATES = {'Platinum': 0.13, 'Click': 0.11}
+LEGACY_MINIMUM_PAYMENTS = {'Wedding': 477, 'Xerox': 98, 'Pita': 40, 'Revolut': 100}
+
+def legacy_terms(account, balance):
+    """(annual_rate, minimum_payment) the simulator used for an account before terms were stored"""
+    annual_rate = DEFAULT_ANNUAL_RATES.get(account.account_type, 0)
+    if account.account_type == 'credit':
+        annual_rate = next((rate for key, rate in LEGACY_RATES.items() if key in account.name), annual_rate)
+    
+    minimum_payment = next((amount for key, amount in LEGACY_MINIMUM_PAYMENTS.items() if key in account.name), 0)
+    if 'Platinum' in account.name:
+        minimum_payment = balance  # Charge card, cleared in full
+    elif 'Click' in account.name:
+        minimum_payment = round(balance * 0.1, 2)
+    
+    return annual_rate, minimum_payment
+
+def migrate_database():
+    """Create debt_terms table and seed current terms for debt accounts that have none"""
+
+    print("🔄 Migrating Database for Debt Account Terms")
+    print("=" * 50)
+
+    try:
+        with app.app_context():
+            if 'debt_terms' in inspect(db.engine).get_table_names():
+                print("✅ debt_terms table already exists!")
+            else:
+                print("\n🔧 Creating debt_terms table...")
+                DebtTerms.__table__.create(db.engine, checkfirst=True)
+                print("✅ Successfully created debt_terms table!")
+
+            now = datetime.now()
+            debt_accounts = BankAccount.query.filter_by(is_debt=True).all()
+            seeded_ids = {account_id for (account_id,) in db.session.query(DebtTerms.account_id).distinct()}
+            latest = latest_balances([a.id for a in debt_accounts])
+
+            print(f"\n📋 Debt accounts: {len(debt_accounts)}, already with terms: {len(seeded_ids)}")
+
+            for account in debt_accounts:
+                if account.id in seeded_ids:
+                    continue
+                annual_rate, minimum_payment = legacy_terms(account, known_balance(latest.get(account.id)))
+                db.session.add(DebtTerms(
+                    account_id=account.id,
+                    effective_month=now.month,
+                    effective_year=now.year,
+                    annual_rate=annual_rate,
+                    minimum_payment=minimum_payment
+                ))
+                print(f"   • {account.name}: {annual_rate:.2%} APR, €{minimum_payment:.2f} minimum")
+
+            db.session.commit()
+
+        print("\n🎯 Migration completed successfully!")
+        print("   • debt_terms table created")
+        print("   • Existing debt accounts seeded with their previous rates")
+        print("   • Adjust rates and minimum payments from the Debt page")
+
+        return True
+
+    except Exception as e:
+        print(f"❌ Migration failed: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    success = migrate_database()
+    if success:
+        print("\n🎉 Database migration successful!")
+    else:
+        print("\n💔 Database migration failed.")
+        print("Please check the error and try again.")
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Migration script to add a default paying account to fixed expenses
+Adds default_account_id column to fixed_expense table (used by the roll-forward job)
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import inspect, text
+from app import app, db
+
+def migrate_database():
+    """Add default_account_id column to fixed_expense table"""
+
+    print("🔄 Migrating Database for Fixed Expense Default Accounts")
+    print("=" * 50)
+
+    try:
+        with app.app_context():
+            columns = [column['name'] for column in inspect(db.engine).get_columns('fixed_expense')]
+
+            if 'default_account_id' in columns:
+                print("✅ default_account_id column already exists!")
+                return True
+
+            print("📋 Current columns:", columns)
+
+            print("\n🔧 Adding default_account_id column...")
+            db.session.execute(text("""
+                ALTER TABLE fixed_expense
+                ADD COLUMN default_account_id INTEGER
+                REFERENCES bank_account(id)
+            """))
+            db.session.commit()
+
+            new_columns = [column['name'] for column in inspect(db.engine).get_columns('fixed_expense')]
+            if 'default_account_id' not in new_columns:
+                print("❌ Failed to add default_account_id column!")
+                return False
+
+            print("✅ Successfully added default_account_id column!")
+
+        print("\n🎯 Migration completed successfully!")
+        print("   • default_account_id column added to fixed_expense table")
+        print("   • Set a default account on each fixed expense to use Roll Forward")
+
+        return True
+
+    except Exception as e:
+        print(f"❌ Migration failed: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    success = migrate_database()
+    if success:
+        print("\n🎉 Database migration successful!")
+    else:
+        print("\n💔 Database migration failed.")
+        print("Please check the error and try again.")
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Migration script to store money amounts as integer cents
+Converts every Money column (balances, income, expenses, amounts) from floating point euros to BIGINT cents
+
+Run after the earlier migrate_*.py scripts, as SQLite tables are rebuilt from the current models.
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import inspect, text, Integer
+from app import app, db, Money
+
+def money_columns():
+    """{table name: [column names]} for every Money column in the models"""
+    columns = {}
+    for table in db.metadata.sorted_tables:
+        names = [column.name for column in table.columns if isinstance(column.type, Money)]
+        if names:
+            columns[table.name] = names
+    return columns
+
+def pending_columns(inspector, table_name, names):
+    """Money columns of a table that are still stored as floating point"""
+    types = {column['name']: column['type'] for column in inspector.get_columns(table_name)}
+    return [name for name in names if name in types and not isinstance(types[name], Integer)]
+
+def rebuild_sqlite_table(connection, table, names):
+    """SQLite can't change a column type in place - rebuild the table with the cents values"""
+    old_name = f"{table.name}_float_old"
+    old_columns = [column['name'] for column in inspect(connection).get_columns(table.name)]
+    copy_columns = [column.name for column in table.columns if column.name in old_columns and column.computed is None]
+    
+    # Keep references from other tables pointing at the table name, not the renamed copy
+    connection.execute(text("PRAGMA legacy_alter_table = ON"))
+    for (index_name,) in connection.execute(text(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :table AND sql IS NOT NULL"
+    ), {'table': table.name}).fetchall():
+        connection.execute(text(f'DROP INDEX "{index_name}"'))
+    connection.execute(text(f'ALTER TABLE "{table.name}" RENAME TO "{old_name}"'))
+    
+    table.create(connection)
+    
+    select_list = ', '.join(
+        f'CAST(ROUND("{name}" * 100) AS INTEGER)' if name in names else f'"{name}"'
+        for name in copy_columns
+    )
+    column_list = ', '.join(f'"{name}"' for name in copy_columns)
+    connection.execute(text(f'INSERT INTO "{table.name}" ({column_list}) SELECT {select_list} FROM "{old_name}"'))
+    connection.execute(text(f'DROP TABLE "{old_name}"'))
+    connection.execute(text("PRAGMA legacy_alter_table = OFF"))
+
+def migrate_database():
+    """Convert Money columns to BIGINT cents (ROUND(amount * 100))"""
+
+    print("🔄 Migrating Database for Integer Cent Amounts")
+    print("=" * 50)
+
+    try:
+        with app.app_context():
+            inspector = inspect(db.engine)
+            dialect = db.engine.dialect.name
+            todo = {}
+            for table_name, names in money_columns().items():
+                if table_name not in inspector.get_table_names():
+                    continue
+                pending = pending_columns(inspector, table_name, names)
+                if pending:
+                    todo[table_name] = pending
+                else:
+                    print(f"✅ {table_name} already stores cents")
+
+            if not todo:
+                print("✅ All money columns already store cents!")
+                return True
+
+            with db.engine.connect() as connection:
+                if dialect == 'sqlite':
+                    connection.execute(text("PRAGMA foreign_keys = OFF"))
+
+                for table_name, names in todo.items():
+                    print(f"\n🔧 Converting {table_name}: {', '.join(names)}")
+                    if dialect == 'sqlite':
+                        rebuild_sqlite_table(connection, db.metadata.tables[table_name], names)
+                    else:
+                        for name in names:
+                            connection.execute(text(
+                                f'ALTER TABLE "{table_name}" ALTER COLUMN "{name}" '
+                                f'TYPE BIGINT USING ROUND("{name}" * 100)'
+                            ))
+
+                connection.commit()
+
+                if dialect == 'sqlite':
+                    connection.execute(text("PRAGMA foreign_keys = ON"))
+
+            print("\n📋 Converted columns:")
+            for table_name, names in todo.items():
+                print(f"   • {table_name}: {', '.join(names)}")
+
+        print("\n🎯 Migration completed successfully!")
+        print("   • Amounts are stored as BIGINT cents")
+        print("   • Application code keeps working in euros through the Money column type")
+
+        return True
+
+    except Exception as e:
+        print(f"❌ Migration failed: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    success = migrate_database()
+    if success:
+        print("\n🎉 Database migration successful!")
+    else:
+        print("\n💔 Database migration failed.")
+        print("Please check the error and try again.")
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Migration script to make monthly balances unique per account and month
+Merges duplicate monthly_balance rows and adds the unique index used by the upsert helper
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import text
+from app import app, db
+
+def migrate_database():
+    """Remove duplicate monthly balances and add a unique index on (account_id, month, year)"""
+
+    print("🔄 Migrating Database for Unique Monthly Balances")
+    print("=" * 50)
+
+    try:
+        with app.app_context():
+            duplicates = db.session.execute(text("""
+                SELECT account_id, month, year, COUNT(*)
+                FROM monthly_balance
+                GROUP BY account_id, month, year
+                HAVING COUNT(*) > 1
+            """)).fetchall()
+
+            print(f"📋 Account-months with duplicate balances: {len(duplicates)}")
+
+            for account_id, month, year, count in duplicates:
+                ids = [row[0] for row in db.session.execute(text("""
+                    SELECT id FROM monthly_balance
+                    WHERE account_id = :account_id AND month = :month AND year = :year
+                    ORDER BY updated_date DESC, id DESC
+                """), {'account_id': account_id, 'month': month, 'year': year})]
+
+                # Keep the most recently updated row, move category amounts onto it
+                keep_id, remove_ids = ids[0], ids[1:]
+                for remove_id in remove_ids:
+                    db.session.execute(text("""
+                        UPDATE monthly_category SET monthly_balance_id = :keep_id
+                        WHERE monthly_balance_id = :remove_id
+                    """), {'keep_id': keep_id, 'remove_id': remove_id})
+                    db.session.execute(text("DELETE FROM monthly_balance WHERE id = :remove_id"),
+                                       {'remove_id': remove_id})
+
+                print(f"   • Account {account_id} {year}-{month:02d}: kept #{keep_id}, removed {len(remove_ids)}")
+
+            print("\n🔧 Adding unique index on (account_id, month, year)...")
+            db.session.execute(text("""
+                CREATE UNIQUE INDEX IF NOT EXISTS uq_monthly_balance_account_month
+                ON monthly_balance (account_id, month, year)
+            """))
+            db.session.commit()
+
+        print("\n🎯 Migration completed successfully!")
+        print("   • Duplicate monthly balances merged")
+        print("   • uq_monthly_balance_account_month index created")
+
+        return True
+
+    except Exception as e:
+        print(f"❌ Migration failed: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    success = migrate_database()
+    if success:
+        print("\n🎉 Database migration successful!")
+    else:
+        print("\n💔 Database migration failed.")
+        print("Please check the error and try again.")
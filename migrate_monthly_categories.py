@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Migration script to maintain category totals in monthly_category
+Merges duplicate (monthly_balance_id, category_id) rows, adds the unique index used by the
+upsert in refresh_monthly_categories and fills the table from existing transactions
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import text
+from app import app, db, MonthlyCategory, rebuild_monthly_categories
+
+def migrate_database():
+    """Add a unique index on monthly_category (monthly_balance_id, category_id) and rebuild the totals"""
+
+    print("🔄 Migrating Database for Monthly Category Totals")
+    print("=" * 50)
+
+    try:
+        with app.app_context():
+            # The rebuild recomputes every amount, so duplicates only need removing
+            removed = db.session.execute(text("""
+                DELETE FROM monthly_category
+                WHERE id NOT IN (
+                    SELECT MIN(id) FROM monthly_category GROUP BY monthly_balance_id, category_id
+                )
+            """)).rowcount
+            print(f"📋 Duplicate category rows removed: {removed}")
+
+            print("\n🔧 Adding unique index on (monthly_balance_id, category_id)...")
+            db.session.execute(text("""
+                CREATE UNIQUE INDEX IF NOT EXISTS uq_monthly_category_balance_category
+                ON monthly_category (monthly_balance_id, category_id)
+            """))
+
+            print("🔧 Computing category totals from monthly transactions...")
+            rebuilt = rebuild_monthly_categories()
+            db.session.commit()
+            print(f"✅ {rebuilt} category totals written ({MonthlyCategory.query.count()} rows)")
+
+        print("\n🎯 Migration completed successfully!")
+        print("   • uq_monthly_category_balance_category index created")
+        print("   • monthly_category filled from existing transactions")
+
+        return True
+
+    except Exception as e:
+        print(f"❌ Migration failed: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    success = migrate_database()
+    if success:
+        print("\n🎉 Database migration successful!")
+    else:
+        print("\n💔 Database migration failed.")
+        print("Please check the error and try again.")
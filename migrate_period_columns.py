@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Migration script to add the period key (year * 12 + month - 1) to monthly tables
+Adds a generated, indexed period column to monthly_balance, monthly_transaction and investment
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import inspect, text
+from app import app, db
+
+PERIOD_TABLES = ['monthly_balance', 'monthly_transaction', 'investment']
+PERIOD_EXPRESSION = 'year * 12 + month - 1'
+
+def migrate_database():
+    """Add generated period columns and their indexes"""
+
+    print("🔄 Migrating Database for Period Key Columns")
+    print("=" * 50)
+
+    try:
+        with app.app_context():
+            inspector = inspect(db.engine)
+            # SQLite can only add VIRTUAL generated columns to an existing table (still indexable);
+            # Postgres only supports STORED ones
+            storage = 'VIRTUAL' if db.engine.dialect.name == 'sqlite' else 'STORED'
+
+            for table_name in PERIOD_TABLES:
+                columns = [column['name'] for column in inspector.get_columns(table_name)]
+
+                if 'period' in columns:
+                    print(f"✅ {table_name}.period already exists!")
+                else:
+                    print(f"\n🔧 Adding {table_name}.period...")
+                    db.session.execute(text(f"""
+                        ALTER TABLE {table_name}
+                        ADD COLUMN period INTEGER GENERATED ALWAYS AS ({PERIOD_EXPRESSION}) {storage}
+                    """))
+
+                db.session.execute(text(f"""
+                    CREATE INDEX IF NOT EXISTS ix_{table_name}_period
+                    ON {table_name} (period)
+                """))
+
+            db.session.commit()
+
+            for table_name in PERIOD_TABLES:
+                columns = [column['name'] for column in inspect(db.engine).get_columns(table_name)]
+                if 'period' not in columns:
+                    print(f"❌ Failed to add {table_name}.period!")
+                    return False
+
+        print("\n🎯 Migration completed successfully!")
+        print("   • period columns added to monthly_balance, monthly_transaction and investment")
+        print("   • ix_<table>_period indexes created for month-range scans")
+
+        return True
+
+    except Exception as e:
+        print(f"❌ Migration failed: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    success = migrate_database()
+    if success:
+        print("\n🎉 Database migration successful!")
+    else:
+        print("\n💔 Database migration failed.")
+        print("Please check the error and try again.")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Migration script to mark generated summary transactions
+Adds is_summary column to monthly_transaction table (set on the month total rows the monthly data
+forms write, so imported and manual transactions with the same categories are never replaced)
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import inspect, text
+from app import app, db
+
+# (transaction_type, category, description pattern) of the rows the monthly data forms and the
+# closing balance auto-balancing have always generated
+GENERATED_SUMMARY_ROWS = [
+    ('income', 'Debt Payment', 'Payment to %'),
+    ('expense', 'Credit Card Spending', 'Monthly spending on %'),
+    ('expense', 'Loan Interest/Fees', 'Monthly spending on %'),
+    ('income', 'Income', 'Total income for %'),
+    ('expense', 'Total Expenses', 'Total expenses for %'),
+    ('misc_income', 'Miscellaneous', 'Net gain for %'),
+    ('misc_income', 'Miscellaneous', 'Auto-generated: Balance adjustment'),
+    ('misc_expense', 'Miscellaneous', 'Auto-generated: Balance adjustment'),
+]
+
+def migrate_database():
+    """Add is_summary column to monthly_transaction table and flag existing summary rows"""
+
+    print("🔄 Migrating Database for Summary Transactions")
+    print("=" * 50)
+
+    try:
+        with app.app_context():
+            columns = [column['name'] for column in inspect(db.engine).get_columns('monthly_transaction')]
+
+            if 'is_summary' in columns:
+                print("✅ is_summary column already exists!")
+                return True
+
+            print("📋 Current columns:", columns)
+
+            print("\n🔧 Adding is_summary column...")
+            db.session.execute(text("""
+                ALTER TABLE monthly_transaction
+                ADD COLUMN is_summary BOOLEAN NOT NULL DEFAULT FALSE
+            """))
+
+            print("🔧 Flagging existing summary transactions...")
+            flagged = 0
+            for transaction_type, category, description in GENERATED_SUMMARY_ROWS:
+                flagged += db.session.execute(text("""
+                    UPDATE monthly_transaction SET is_summary = TRUE
+                    WHERE transaction_type = :transaction_type AND category = :category
+                      AND description LIKE :description
+                      AND fixed_expense_id IS NULL AND source_account_id IS NULL
+                """), {'transaction_type': transaction_type, 'category': category,
+                       'description': description}).rowcount
+            db.session.commit()
+
+            new_columns = [column['name'] for column in inspect(db.engine).get_columns('monthly_transaction')]
+            if 'is_summary' not in new_columns:
+                print("❌ Failed to add is_summary column!")
+                return False
+
+            print(f"✅ Successfully added is_summary column and flagged {flagged} summary transactions!")
+
+        print("\n🎯 Migration completed successfully!")
+        print("   • is_summary column added to monthly_transaction table")
+        print("   • Generated month totals flagged by their type, category and description")
+        print("   • Run migrate_monthly_categories.py to recount category totals")
+
+        return True
+
+    except Exception as e:
+        print(f"❌ Migration failed: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    success = migrate_database()
+    if success:
+        print("\n🎉 Database migration successful!")
+    else:
+        print("\n💔 Database migration failed.")
+        print("Please check the error and try again.")
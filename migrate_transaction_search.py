@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Migration script to add full-text search over transaction descriptions
+SQLite: creates the monthly_transaction_fts FTS5 table with its sync triggers and indexes existing rows
+Postgres: adds the generated search_vector column and its GIN index
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import text
+from app import app, db, TRANSACTION_SEARCH_DDL
+
+def migrate_database():
+    """Create the search index objects for the current database and fill them"""
+
+    print("🔄 Migrating Database for Transaction Search")
+    print("=" * 50)
+
+    try:
+        with app.app_context():
+            dialect = db.engine.dialect.name
+            if dialect not in TRANSACTION_SEARCH_DDL:
+                print(f"⚠️  No full-text index for {dialect} - search falls back to ILIKE scans")
+                return True
+
+            print(f"🔧 Creating {dialect} search index...")
+            for statement in TRANSACTION_SEARCH_DDL[dialect]:
+                db.session.execute(text(statement))
+
+            if dialect == 'sqlite':
+                # External-content FTS tables only see rows written after the triggers exist
+                print("🔧 Indexing existing transactions...")
+                db.session.execute(text("INSERT INTO monthly_transaction_fts (monthly_transaction_fts) VALUES ('rebuild')"))
+
+            db.session.commit()
+            count = db.session.execute(text("SELECT COUNT(*) FROM monthly_transaction")).scalar()
+            print(f"✅ {count} transactions searchable")
+
+        print("\n🎯 Migration completed successfully!")
+        print("   • Search index created and kept in sync by the database")
+        print("   • Use GET /api/transactions/search?q=...")
+
+        return True
+
+    except Exception as e:
+        print(f"❌ Migration failed: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    success = migrate_database()
+    if success:
+        print("\n🎉 Database migration successful!")
+    else:
+        print("\n💔 Database migration failed.")
+        print("Please check the error and try again.")
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Rebuild the household monthly summary from monthly balances and investments
+
+Usage:
+    python rebuild_household_summary.py            # every month
+    python rebuild_household_summary.py 2025-01    # only from January 2025 onwards
+
+Write routes keep the summary current; run this after the summary table is first created,
+after backfills or imports done outside the app, or whenever the totals look out of step.
+"""
+
+import sys
+import os
+from datetime import datetime
+
+# Add the current directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import (app, db, MonthlyBalance, Investment, HouseholdMonthlySummary,
+                 refresh_household_summary, rebuild_household_summary, to_period)
+
+def main():
+    """Rebuild all summary rows, or those from the requested month onwards"""
+    since = datetime.strptime(sys.argv[1], '%Y-%m') if len(sys.argv) > 1 else None
+
+    print(f"🔄 Rebuilding household monthly summary{f' from {since.year}-{since.month:02d}' if since else ''}")
+    print("=" * 50)
+
+    with app.app_context():
+        try:
+            if since:
+                first_period = to_period(since.year, since.month)
+                periods = {p for (p,) in db.session.query(MonthlyBalance.period).filter(MonthlyBalance.period >= first_period).distinct()}
+                periods |= {p for (p,) in db.session.query(Investment.period).filter(Investment.period >= first_period).distinct()}
+                periods |= {p for (p,) in db.session.query(HouseholdMonthlySummary.period).filter(HouseholdMonthlySummary.period >= first_period)}
+                rebuilt = refresh_household_summary(periods)
+            else:
+                rebuilt = rebuild_household_summary()
+            db.session.commit()
+            print(f"✅ Rebuilt {rebuilt} monthly summary rows")
+            return True
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ Rebuild failed: {str(e)}")
+            return False
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
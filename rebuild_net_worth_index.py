@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Rebuild the net worth index from monthly balances
+
+Usage:
+    python rebuild_net_worth_index.py
+
+Write routes update the index incrementally; run this once after the table is first created,
+after backfills done outside the app, or if an account's type (debt or not) has changed.
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import app, db, rebuild_net_worth_index
+
+def main():
+    """Rebuild every per-account and household row"""
+    print("🔄 Rebuilding net worth index")
+    print("=" * 50)
+
+    with app.app_context():
+        try:
+            rebuilt = rebuild_net_worth_index()
+            db.session.commit()
+            print(f"✅ Rebuilt {rebuilt} net worth index rows")
+            return True
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ Rebuild failed: {str(e)}")
+            return False
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
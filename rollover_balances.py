@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Month rollover job: carry closing balances forward as next month's opening balances
+
+Usage:
+    python rollover_balances.py            # up to the current month
+    python rollover_balances.py 2025-06    # up to June 2025
+
+Missing months between an account's last balance and the target month are backfilled.
+Safe to run repeatedly (e.g. from cron on the 1st of each month).
+"""
+
+import sys
+import os
+from datetime import datetime
+
+# Add the current directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import app, db, rollover_balances
+
+def main():
+    """Run the rollover up to the requested month"""
+    if len(sys.argv) > 1:
+        target = datetime.strptime(sys.argv[1], '%Y-%m')
+    else:
+        target = datetime.now()
+
+    print(f"🔄 Rolling balances forward to {target.year}-{target.month:02d}")
+    print("=" * 50)
+
+    with app.app_context():
+        try:
+            created = rollover_balances(target.year, target.month)
+            db.session.commit()
+            print(f"✅ Created {created} monthly balance records")
+            return True
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ Rollover failed: {str(e)}")
+            return False
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Test script for cached debt payoff scenarios"""
+
+import sys
+import os
+import tempfile
+
+# Add the current directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Run against a throwaway database rather than instance/personal_finance.db
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'test_debt_scenarios.db')
+
+from app import cached_debt_scenario, debt_scenario_key
+
+DEBTS = [
+    {'name': 'Scenario Card', 'balance': 1500.0, 'min_payment': 60.0, 'annual_rate': 0.19, 'account_type': 'credit'},
+    {'name': 'Scenario Loan', 'balance': 5000.0, 'min_payment': 150.0, 'annual_rate': 0.06, 'account_type': 'loan'},
+]
+
+def test_cached_scenario_is_a_copy():
+    """Test that changing a returned scenario doesn't change the next call's result"""
+    print("🧪 Testing cached debt scenarios are independent copies...")
+
+    debts_key = debt_scenario_key(DEBTS)
+    for extra_payment in (0, 100.0):
+        first = cached_debt_scenario(debts_key, extra_payment)
+        months = first['months']
+        first_payment = first['monthly_plan'][0]['payments'][0]['amount']
+
+        # What the debt acceleration route does, plus a careless nested change
+        first['scenario_name'] = 'Changed'
+        first['monthly_plan'][0]['payments'][0]['amount'] = -1
+        first['monthly_plan'].clear()
+
+        second = cached_debt_scenario(debts_key, extra_payment)
+        assert 'scenario_name' not in second, second.keys()
+        assert second['months'] == months and len(second['monthly_plan']) > 0
+        assert second['monthly_plan'][0]['payments'][0]['amount'] == first_payment
+
+    print("✅ Second call returns the original plan")
+    return True
+
+def test_extra_payment_pays_off_sooner():
+    """Test that an extra payment shortens the payoff"""
+    print("🧪 Testing extra payments shorten the payoff...")
+
+    debts_key = debt_scenario_key(DEBTS)
+    minimum = cached_debt_scenario(debts_key, 0)
+    extra = cached_debt_scenario(debts_key, 200.0)
+    assert extra['months'] < minimum['months'], (extra['months'], minimum['months'])
+
+    print(f"✅ {minimum['months']} months with minimum payments, {extra['months']} with €200 extra")
+    return True
+
+if __name__ == "__main__":
+    print("🚀 Testing Debt Scenarios")
+    print("=" * 50)
+
+    tests = [test_cached_scenario_is_a_copy, test_extra_payment_pays_off_sooner]
+    passed = 0
+    for test in tests:
+        try:
+            passed += bool(test())
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+
+    print("=" * 50)
+    print(f"🎉 {passed}/{len(tests)} debt scenario tests passed" if passed == len(tests)
+          else f"❌ {passed}/{len(tests)} debt scenario tests passed")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Test script for Money columns (euro amounts stored as integer cents)"""
+
+import sys
+import os
+import tempfile
+from decimal import Decimal
+
+# Add the current directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Run against a throwaway database rather than instance/personal_finance.db
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'test_money.db')
+
+from app import app, db, BankAccount, MonthlyBalance, MonthlyTransaction, to_cents, from_cents, cents
+
+def test_cent_conversion():
+    """Test euro <-> cent conversion and half-up rounding"""
+    print("🧪 Testing to_cents/from_cents...")
+
+    assert to_cents(0.1 + 0.2) == 30
+    assert to_cents(2.675) == 268  # Half up on the decimal value, not the binary float
+    assert to_cents('19.99') == 1999
+    assert to_cents(Decimal('-0.005')) == -1
+    assert to_cents(1234567.89) == 123456789
+    assert from_cents(1999) == 19.99
+    assert from_cents(1999.6) == 20.0  # Fractional cents (e.g. from SQL scaling) are rounded off
+    assert from_cents(-1) == -0.01
+
+    print("✅ Amounts convert to whole cents and back")
+    return True
+
+def test_money_round_trip():
+    """Test that Money columns store integer cents and read back euros"""
+    print("🧪 Testing Money column round-tripping...")
+
+    with app.app_context():
+        account = BankAccount(name='Money Checking', account_type='checking', bank_name='Test Bank')
+        db.session.add(account)
+        db.session.flush()
+
+        amounts = [0.1, 0.2, 19.99, 1234567.89, 0.005]
+        db.session.add_all([MonthlyTransaction(account_id=account.id, month=7, year=2023, transaction_type='expense',
+                                               amount=amount, description=f'Money {amount}', category='Test')
+                            for amount in amounts])
+        db.session.add(MonthlyBalance(account_id=account.id, month=7, year=2023, opening_balance=10.10,
+                                      closing_balance=None))
+        db.session.commit()
+        db.session.expire_all()
+
+        rows = MonthlyTransaction.query.filter_by(account_id=account.id).order_by(MonthlyTransaction.id).all()
+        assert [row.amount for row in rows] == [0.1, 0.2, 19.99, 1234567.89, 0.01], [row.amount for row in rows]
+
+        # The column itself holds integers
+        stored = db.session.execute(db.text('SELECT amount FROM monthly_transaction WHERE account_id = :id ORDER BY id'),
+                                    {'id': account.id}).scalars().all()
+        assert stored == [10, 20, 1999, 123456789, 1], stored
+
+        balance = MonthlyBalance.query.filter_by(account_id=account.id).one()
+        assert balance.opening_balance == 10.1 and balance.closing_balance is None
+
+    print("✅ Amounts stored as cents and read back unchanged")
+    return True
+
+def test_money_aggregates():
+    """Test that SQL sums and scaling over Money columns stay exact and in euros"""
+    print("🧪 Testing Money aggregates...")
+
+    with app.app_context():
+        account = BankAccount(name='Money Aggregates', account_type='checking', bank_name='Test Bank')
+        db.session.add(account)
+        db.session.flush()
+        db.session.add_all([MonthlyTransaction(account_id=account.id, month=8, year=2023, transaction_type='expense',
+                                               amount=0.1, description='Ten cents', category='Test')
+                            for _ in range(10)])
+        db.session.commit()
+
+        in_account = MonthlyTransaction.account_id == account.id
+        total = db.session.query(db.func.sum(MonthlyTransaction.amount)).filter(in_account).scalar()
+        doubled = db.session.query(db.func.sum(MonthlyTransaction.amount * 2)).filter(in_account).scalar()
+        raw = db.session.query(db.func.sum(cents(MonthlyTransaction.amount))).filter(in_account).scalar()
+        over_five_cents = MonthlyTransaction.query.filter(in_account, MonthlyTransaction.amount > 0.05).count()
+
+        assert total == 1.0, total
+        assert doubled == 2.0, doubled
+        assert raw == 100, raw
+        assert over_five_cents == 10, over_five_cents
+
+    print("✅ Ten × €0.10 sums to exactly €1.00")
+    return True
+
+if __name__ == "__main__":
+    print("🚀 Testing Money Columns")
+    print("=" * 50)
+
+    tests = [test_cent_conversion, test_money_round_trip, test_money_aggregates]
+    passed = 0
+    for test in tests:
+        try:
+            passed += bool(test())
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+
+    print("=" * 50)
+    print(f"🎉 {passed}/{len(tests)} money tests passed" if passed == len(tests)
+          else f"❌ {passed}/{len(tests)} money tests passed")
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Test script for the whole-month /api/monthly_data endpoint"""
+
+import sys
+import os
+import tempfile
+
+# Add the current directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Run against a throwaway database rather than instance/personal_finance.db
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'test_monthly_data_api.db')
+
+from app import app, db, BankAccount, MonthlyBalance, MonthlyTransaction
+
+def make_account(name, account_type='checking'):
+    """Create a test account and return its id"""
+    with app.app_context():
+        account = BankAccount(name=name, account_type=account_type,
+                              is_debt=account_type in ('credit', 'loan'), bank_name='Test Bank')
+        db.session.add(account)
+        db.session.commit()
+        return account.id
+
+def post_month(month, year, accounts):
+    """POST a month to /api/monthly_data and return (status, json)"""
+    response = app.test_client().post('/api/monthly_data', json={'month': month, 'year': year, 'accounts': accounts})
+    return response.status_code, response.get_json()
+
+def test_submit_month():
+    """Test saving a regular and a debt account in one request"""
+    print("🧪 Testing /api/monthly_data with two accounts...")
+
+    checking_id = make_account('Monthly API Checking')
+    card_id = make_account('Monthly API Card', account_type='credit')
+    status, result = post_month(4, 2023, [
+        {'account_id': checking_id, 'opening_balance': 1000, 'closing_balance': 1100, 'income': 400},
+        {'account_id': card_id, 'opening_balance': 300, 'closing_balance': 250, 'paid_amount': 300},
+    ])
+    assert status == 200 and result['success'], result
+    assert result['transactions']['inserted'] == 4, result
+
+    with app.app_context():
+        checking = MonthlyBalance.query.filter_by(account_id=checking_id, month=4, year=2023).one()
+        card = MonthlyBalance.query.filter_by(account_id=card_id, month=4, year=2023).one()
+        assert (checking.closing_balance, checking.expenses) == (1100.0, 300.0)
+        assert (card.closing_balance, card.expenses) == (250.0, 250.0)
+
+    # Re-submitting the same month changes nothing
+    status, result = post_month(4, 2023, [
+        {'account_id': checking_id, 'opening_balance': 1000, 'closing_balance': 1100, 'income': 400},
+    ])
+    assert status == 200 and result['transactions'] == {'inserted': 0, 'updated': 0, 'deleted': 0}, result
+
+    print("✅ Month saved for both accounts; re-submitting is a no-op")
+    return True
+
+def test_rejects_missing_and_non_finite_values():
+    """Test that blank, missing, NaN and infinite closing balances are a 400 and nothing is written"""
+    print("🧪 Testing /api/monthly_data validation...")
+
+    account_id = make_account('Monthly API Validation')
+    for closing_balance in (None, '', 'NaN', 'inf', '-Infinity'):
+        entry = {'account_id': account_id, 'opening_balance': 100}
+        if closing_balance is not None:
+            entry['closing_balance'] = closing_balance
+        status, result = post_month(5, 2023, [entry])
+        assert status == 400 and not result['success'], (closing_balance, status, result)
+        assert 'SELECT' not in str(result) and 'INSERT' not in str(result), result
+
+    status, result = post_month(5, 2023, [{'account_id': account_id, 'opening_balance': 'nan', 'closing_balance': 1}])
+    assert status == 400, result
+
+    with app.app_context():
+        assert MonthlyBalance.query.filter_by(account_id=account_id).count() == 0
+        assert MonthlyTransaction.query.filter_by(account_id=account_id).count() == 0
+
+    print("✅ Invalid entries rejected before anything is written")
+    return True
+
+def test_rejects_unknown_and_duplicate_accounts():
+    """Test that one bad entry fails the whole month"""
+    print("🧪 Testing /api/monthly_data all-or-nothing validation...")
+
+    account_id = make_account('Monthly API Duplicate')
+    status, result = post_month(6, 2023, [
+        {'account_id': account_id, 'opening_balance': 0, 'closing_balance': 10},
+        {'account_id': account_id, 'opening_balance': 0, 'closing_balance': 20},
+        {'account_id': 999999, 'opening_balance': 0, 'closing_balance': 30},
+    ])
+    assert status == 400 and len(result['errors']) == 2, result
+
+    with app.app_context():
+        assert MonthlyBalance.query.filter_by(account_id=account_id).count() == 0
+
+    print("✅ Duplicate and unknown accounts reject the whole month")
+    return True
+
+if __name__ == "__main__":
+    print("🚀 Testing Monthly Data API")
+    print("=" * 50)
+
+    tests = [test_submit_month, test_rejects_missing_and_non_finite_values, test_rejects_unknown_and_duplicate_accounts]
+    passed = 0
+    for test in tests:
+        try:
+            passed += bool(test())
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+
+    print("=" * 50)
+    print(f"🎉 {passed}/{len(tests)} monthly data API tests passed" if passed == len(tests)
+          else f"❌ {passed}/{len(tests)} monthly data API tests passed")
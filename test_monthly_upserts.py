@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""Test script for monthly balance upserts and summary transaction syncing"""
+
+import sys
+import os
+import tempfile
+
+# Add the current directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Run against a throwaway database rather than instance/personal_finance.db
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'test_monthly_upserts.db')
+
+from app import app, db, BankAccount, MonthlyBalance, MonthlyTransaction, upsert_monthly_balances
+
+def make_account(name, account_type='checking'):
+    """Create a test account and return its id"""
+    with app.app_context():
+        account = BankAccount(name=name, account_type=account_type,
+                              is_debt=account_type in ('credit', 'loan'), bank_name='Test Bank')
+        db.session.add(account)
+        db.session.commit()
+        return account.id
+
+def month_transactions(account_id, month, year):
+    """(transaction_type, category, amount) of an account-month's transactions, sorted"""
+    return sorted((t.transaction_type, t.category, t.amount) for t in
+                  MonthlyTransaction.query.filter_by(account_id=account_id, month=month, year=year))
+
+def test_upsert_monthly_balances():
+    """Test that upserts insert once, update in place and skip unchanged rows"""
+    print("🧪 Testing MonthlyBalance upserts...")
+
+    account_id = make_account('Upsert Checking')
+    key = dict(account_id=account_id, month=1, year=2023)
+    with app.app_context():
+        written = upsert_monthly_balances([dict(key, opening_balance=100.0, closing_balance=80.0)],
+                                          update_columns=['opening_balance', 'closing_balance'])
+        db.session.commit()
+        assert len(written) == 1 and written[0].closing_balance == 80.0
+
+        unchanged = upsert_monthly_balances([dict(key, opening_balance=100.0, closing_balance=80.0)],
+                                            update_columns=['opening_balance', 'closing_balance'],
+                                            only_if_changed=True)
+        assert unchanged == [], unchanged
+
+        upsert_monthly_balances([dict(key, opening_balance=100.0, closing_balance=75.5)],
+                                update_columns=['closing_balance'], only_if_changed=True)
+        db.session.commit()
+
+        balances = MonthlyBalance.query.filter_by(**key).all()
+        assert len(balances) == 1 and balances[0].closing_balance == 75.5
+
+    print("✅ One row per account-month, updated only when values change")
+    return True
+
+def test_sync_keeps_other_transactions():
+    """Test that saving an account's month only rewrites its summary rows"""
+    print("🧪 Testing summary sync leaves imported and manual transactions alone...")
+
+    account_id = make_account('Sync Checking')
+    month, year = 2, 2023
+    client = app.test_client()
+    with app.app_context():
+        db.session.add_all([
+            MonthlyTransaction(account_id=account_id, month=month, year=year, transaction_type='expense',
+                               amount=3.5, description='Coffee', category='Food'),
+            MonthlyTransaction(account_id=account_id, month=month, year=year, transaction_type='expense',
+                               amount=42.0, description='CARD PAYMENT SUPERMARKET', category=''),
+        ])
+        db.session.commit()
+
+    form = {'account_id': account_id, 'month': month, 'year': year, 'opening_balance': 1000, 'income': 500}
+    client.post('/set_regular_account_data', data=dict(form, closing_balance=1200))
+    with app.app_context():
+        assert month_transactions(account_id, month, year) == [
+            ('expense', '', 42.0), ('expense', 'Food', 3.5),
+            ('expense', 'Total Expenses', 300.0), ('income', 'Income', 500.0),
+        ], month_transactions(account_id, month, year)
+
+    # Saving again updates the summary rows in place; a net gain replaces 'Total Expenses'
+    client.post('/set_regular_account_data', data=dict(form, closing_balance=1250))
+    client.post('/set_regular_account_data', data=dict(form, closing_balance=1600))
+    with app.app_context():
+        assert month_transactions(account_id, month, year) == [
+            ('expense', '', 42.0), ('expense', 'Food', 3.5),
+            ('income', 'Income', 500.0), ('misc_income', 'Miscellaneous', 100.0),
+        ], month_transactions(account_id, month, year)
+
+    print("✅ Summary rows synced; 'Coffee' and the imported row kept")
+    return True
+
+def test_sync_keeps_manual_income():
+    """Test that a manual 'Income' row and an imported 'Miscellaneous' row are not taken for summary rows"""
+    print("🧪 Testing summary sync with manual rows in summary categories...")
+
+    account_id = make_account('Sync Income Checking')
+    month, year = 4, 2023
+    client = app.test_client()
+    client.post('/add_monthly_income', data={'account_id': account_id, 'month': month, 'year': year,
+                                             'amount': 75, 'description': 'Sold old bike'})
+    with app.app_context():
+        db.session.add(MonthlyTransaction(account_id=account_id, month=month, year=year, transaction_type='misc_income',
+                                          amount=9.99, description='Cashback', category='Miscellaneous'))
+        db.session.commit()
+
+    form = {'account_id': account_id, 'month': month, 'year': year, 'opening_balance': 1000, 'income': 500}
+    client.post('/set_regular_account_data', data=dict(form, closing_balance=1200))
+    client.post('/set_regular_account_data', data=dict(form, closing_balance=1600))
+    with app.app_context():
+        assert month_transactions(account_id, month, year) == [
+            ('income', 'Income', 75.0), ('income', 'Income', 500.0),
+            ('misc_income', 'Miscellaneous', 9.99), ('misc_income', 'Miscellaneous', 100.0),
+        ], month_transactions(account_id, month, year)
+        manual = MonthlyTransaction.query.filter_by(account_id=account_id, is_summary=False).count()
+        assert manual == 2, manual
+
+    # Only the manual row counts towards category figures
+    result = client.get('/api/analytics/categories', query_string={
+        'start': '2023-04', 'end': '2023-04', 'transaction_type': 'income', 'account_id': account_id}).get_json()
+    assert [(c['category'], c['total']) for c in result['categories']] == [('Income', 75.0)], result
+
+    print("✅ 'Sold old bike' and 'Cashback' kept next to the summary rows")
+    return True
+
+def test_debt_sync_keeps_tracked_payments():
+    """Test that saving a debt account's month keeps tracked payments from other accounts"""
+    print("🧪 Testing debt summary sync leaves payment tracking alone...")
+
+    checking_id = make_account('Sync Payer Checking')
+    card_id = make_account('Sync Card', account_type='credit')
+    month, year = 3, 2023
+    with app.app_context():
+        db.session.add(MonthlyTransaction(account_id=card_id, month=month, year=year, transaction_type='income',
+                                          amount=200.0, description='Payment (Tracking Only)',
+                                          category='Debt Payment', source_account_id=checking_id))
+        db.session.commit()
+
+    app.test_client().post('/set_debt_account_data', data={
+        'account_id': card_id, 'month': month, 'year': year,
+        'opening_balance': 500, 'paid_amount': 200, 'closing_balance': 450,
+    })
+    with app.app_context():
+        assert month_transactions(card_id, month, year) == [
+            ('expense', 'Credit Card Spending', 150.0),
+            ('income', 'Debt Payment', 200.0), ('income', 'Debt Payment', 200.0),
+        ], month_transactions(card_id, month, year)
+        tracked = MonthlyTransaction.query.filter_by(account_id=card_id, source_account_id=checking_id).count()
+        assert tracked == 1
+
+    print("✅ Debt summary written next to the tracked payment")
+    return True
+
+if __name__ == "__main__":
+    print("🚀 Testing Monthly Upserts and Summary Sync")
+    print("=" * 50)
+
+    tests = [test_upsert_monthly_balances, test_sync_keeps_other_transactions, test_sync_keeps_manual_income,
+             test_debt_sync_keeps_tracked_payments]
+    passed = 0
+    for test in tests:
+        try:
+            passed += bool(test())
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+
+    print("=" * 50)
+    print(f"🎉 {passed}/{len(tests)} upsert tests passed" if passed == len(tests)
+          else f"❌ {passed}/{len(tests)} upsert tests passed")
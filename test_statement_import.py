@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Test script for bank statement import (amount parsing, header maps, /upload_csv)"""
+
+import sys
+import os
+import io
+import tempfile
+
+# Add the current directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Run against a throwaway database rather than instance/personal_finance.db
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'test_statement_import.db')
+
+from app import app, db, BankAccount, MonthlyTransaction, parse_statement_amount
+
+def make_account(name, is_debt=False):
+    """Create a test account and return its id"""
+    with app.app_context():
+        account = BankAccount(name=name, account_type='credit' if is_debt else 'checking',
+                              is_debt=is_debt, bank_name='Test Bank')
+        db.session.add(account)
+        db.session.commit()
+        return account.id
+
+def test_parse_statement_amount():
+    """Test decimal separator detection and rejection of ambiguous amounts"""
+    print("🧪 Testing statement amount parsing...")
+
+    cases = {
+        '1.234,50': 1234.5,
+        '1,234.50': 1234.5,
+        '€1,234.50': 1234.5,
+        '1234,50': 1234.5,
+        '12,50': 12.5,
+        '(12.00)': -12.0,
+        '12.50-': -12.5,
+        '-1.234.567,89': -1234567.89,
+        '1.234.567': 1234567.0,
+        '0,125': 0.125,
+        42: 42.0,
+        '': None,
+    }
+    for text, expected in cases.items():
+        assert parse_statement_amount(text) == expected, f"{text!r} parsed as {parse_statement_amount(text)!r}"
+
+    for text in ('1,234', '1.234', '1,23,4', 'abc', 'nan', float('inf')):
+        try:
+            parse_statement_amount(text)
+        except ValueError:
+            continue
+        raise AssertionError(f"{text!r} should be rejected")
+
+    print("✅ Amounts parse with either decimal separator; ambiguous values are rejected")
+    return True
+
+def test_import_skips_ambiguous_rows():
+    """Test that ambiguous amounts and bad dates are skipped with a reason instead of failing the import"""
+    print("🧪 Testing statement import with European amounts...")
+
+    account_id = make_account('Statement Import Checking')
+    statement = (
+        'Date,Description,Amount\n'
+        '05/03/2024,Salary,"2.500,00"\n'
+        '06/03/2024,Groceries,"-45,90"\n'
+        '07/03/2024,Rent,"1.234"\n'
+        'not a date,Refund,"10,00"\n'
+        ',,\n'
+    )
+    client = app.test_client()
+    response = client.post('/import_statement', data={
+        'account_id': str(account_id),
+        'file': (io.BytesIO(statement.encode('utf-8')), 'statement.csv'),
+        'auto_categorize': '0',
+    }, content_type='multipart/form-data')
+
+    assert response.status_code == 200, response.get_json()
+    result = response.get_json()
+    assert result['inserted'] == 2 and result['skipped'] == 2, result
+    reasons = {row['row']: row['reason'] for row in result['skipped_rows']}
+    assert sorted(reasons) == [4, 5] and reasons[4].startswith('Ambiguous amount') \
+        and reasons[5].startswith('Unreadable date'), reasons
+
+    with app.app_context():
+        amounts = sorted((t.transaction_type, t.amount) for t in
+                         MonthlyTransaction.query.filter(MonthlyTransaction.description.in_(['Salary', 'Groceries'])))
+        assert amounts == [('expense', 45.9), ('income', 2500.0)], amounts
+
+    print("✅ '2.500,00' stored as 2500.00; '1.234' and 'not a date' skipped with reasons")
+    return True
+
+def test_header_map_must_be_object():
+    """Test that a JSON header_map that isn't an object is a 400, not a 500"""
+    print("🧪 Testing header_map validation...")
+
+    account_id = make_account('Statement Header Map Checking')
+    client = app.test_client()
+    for header_map in ('[1]', '{"amount": 5}', '{"amount": ["Betrag", 3]}'):
+        response = client.post('/import_statement', data={
+            'account_id': str(account_id),
+            'header_map': header_map,
+            'file': (io.BytesIO(b'Date,Description,Amount\n01/01/2024,Test,1.00\n'), 'statement.csv'),
+        }, content_type='multipart/form-data')
+        assert response.status_code == 400, (header_map, response.status_code)
+
+    print("✅ Malformed header maps rejected with 400")
+    return True
+
+def test_upload_csv_without_account():
+    """Test that older /upload_csv clients that post no account still import"""
+    print("🧪 Testing /upload_csv without an account_id...")
+
+    with app.app_context():
+        default_account = (BankAccount.query.filter_by(is_active=True, is_debt=False)
+                           .order_by(BankAccount.id).first())
+        default_id = default_account.id if default_account else make_account('Statement Default Checking')
+
+    client = app.test_client()
+    response = client.post('/upload_csv', data={
+        'file': (io.BytesIO(b'Date,Description,Amount\n02/01/2024,Legacy upload,-7.25\n'), 'legacy.csv'),
+        'auto_categorize': '0',
+    }, content_type='multipart/form-data')
+    assert response.status_code == 200, response.get_json()
+
+    with app.app_context():
+        row = MonthlyTransaction.query.filter_by(description='Legacy upload').one()
+        assert row.account_id == default_id
+
+    print("✅ Rows from /upload_csv go to the first active account")
+    return True
+
+if __name__ == "__main__":
+    print("🚀 Testing Bank Statement Import")
+    print("=" * 50)
+
+    tests = [test_parse_statement_amount, test_import_skips_ambiguous_rows,
+             test_header_map_must_be_object, test_upload_csv_without_account]
+    passed = 0
+    for test in tests:
+        try:
+            passed += bool(test())
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+
+    print("=" * 50)
+    print(f"🎉 {passed}/{len(tests)} statement import tests passed" if passed == len(tests)
+          else f"❌ {passed}/{len(tests)} statement import tests passed")